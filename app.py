@@ -2,10 +2,13 @@
 from app import create_app, db
 from flask_session import Session
 
-app = create_app()
+# La aplicación se crea solo al ejecutar `python app.py`: los procesos spawn
+# (gráficos en segundo plano, `flask worker`) importan este archivo como
+# __mp_main__ y no deben repetir create_app
+if __name__ == '__main__':
+    app = create_app()
 
-# Configurar Flask-Session
-Session(app)
+    # Configurar Flask-Session
+    Session(app)
 
-if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
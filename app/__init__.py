@@ -13,6 +13,13 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # Pool de conexiones desde DB_POOL_* (las opciones explícitas tienen prioridad)
+    from app.utils.db_pool import engine_options
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **engine_options(app.config),
+        **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    }
+    
     # Inicializar extensiones
     db.init_app(app)
     migrate.init_app(app, db)
@@ -40,11 +47,83 @@ def create_app(config_class=Config):
     except Exception as e:
         print(f"✗ Error registrando blueprint test: {e}")
     
+    try:
+        from app.routes import admin
+        app.register_blueprint(admin.bp)
+        print("✓ Blueprint admin registrado")
+    except Exception as e:
+        print(f"✗ Error registrando blueprint admin: {e}")
+    
     # Importar modelos para que SQLAlchemy los reconozca
     try:
-        from app.models import user, student, faculty, career, test_answer, recommendation
+        from app.models import user, student, faculty, career, test_answer, recommendation, test_progress, recommendation_job
         print("✓ Modelos importados correctamente")
     except Exception as e:
         print(f"✗ Error importando modelos: {e}")
     
+    # Caché del catálogo de carreras (se invalida con eventos de SQLAlchemy)
+    try:
+        from app.utils.career_catalog import career_catalog
+        career_catalog.init_app(app)
+    except Exception as e:
+        print(f"✗ Error configurando catálogo de carreras: {e}")
+    
+    # Recomendaciones memorizadas por vector de características
+    try:
+        from app.utils.recommendation_cache import recommendation_cache
+        recommendation_cache.init_app(app)
+    except Exception as e:
+        print(f"✗ Error configurando caché de recomendaciones: {e}")
+    
+    # Usuario y estudiante en caché (por petición y por proceso)
+    try:
+        from app.utils.identity_cache import identity_cache
+        identity_cache.init_app(app)
+    except Exception as e:
+        print(f"✗ Error configurando caché de identidad: {e}")
+    
+    # Contenido renderizado de las páginas del catálogo
+    try:
+        from app.utils.page_cache import page_cache
+        page_cache.init_app(app)
+    except Exception as e:
+        print(f"✗ Error configurando caché de páginas: {e}")
+    
+    # Avance del test en curso guardado en el servidor
+    try:
+        from app.utils.progress_store import progress_store
+        progress_store.init_app(app)
+    except Exception as e:
+        print(f"✗ Error configurando almacenamiento de avance: {e}")
+    
+    # Gráficos de resultados (backend y caché)
+    try:
+        from app.utils.chart_cache import chart_cache
+        from app.utils.chart_generator import ChartGenerator
+        chart_cache.init_app(app)
+        ChartGenerator.init_app(app)
+    except Exception as e:
+        print(f"✗ Error configurando gráficos: {e}")
+    
+    # Dibujo de gráficos en segundo plano
+    try:
+        from app.utils.chart_prerender import chart_prerenderer
+        chart_prerenderer.init_app(app)
+    except Exception as e:
+        print(f"✗ Error configurando gráficos en segundo plano: {e}")
+    
+    # Precargar modelos ML una sola vez por proceso
+    try:
+        from app.ml_models.model_registry import model_registry
+        model_registry.init_app(app)
+    except Exception as e:
+        print(f"✗ Error precargando modelos ML: {e}")
+
+    # Comandos CLI (flask rescore, ...)
+    try:
+        from app.commands import register_commands
+        register_commands(app)
+    except Exception as e:
+        print(f"✗ Error registrando comandos CLI: {e}")
+
     return app
\ No newline at end of file
@@ -0,0 +1,556 @@
+import json
+import multiprocessing
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+
+
+def register_commands(app):
+    """Registra los comandos CLI de la aplicación (flask <comando>)"""
+    app.cli.add_command(rescore_command)
+    app.cli.add_command(progress_gc_command)
+    app.cli.add_command(startup_report_command)
+    app.cli.add_command(worker_command)
+
+
+# ----------------------------------------------------------------------
+# flask progress-gc
+# ----------------------------------------------------------------------
+
+@click.command('progress-gc')
+@with_appcontext
+def progress_gc_command():
+    """Elimina el avance de tests en curso que superó PROGRESS_TTL."""
+    from app.utils.progress_store import progress_store
+
+    removed = progress_store.gc()
+    print(f"🧹 {removed} avances vencidos eliminados")
+
+
+# ----------------------------------------------------------------------
+# flask worker
+# ----------------------------------------------------------------------
+
+# Segundos entre barridos de trabajos vencidos sin intentos restantes
+_WORKER_SWEEP_INTERVAL = 60
+
+
+@click.command('worker')
+@click.option('--concurrency', default=1, show_default=True,
+              help='Procesos que atienden la cola en paralelo.')
+@click.option('--poll-interval', type=float, default=None,
+              help='Segundos entre consultas cuando no hay trabajos (por defecto, WORKER_POLL_INTERVAL).')
+@click.option('--burst', is_flag=True,
+              help='Procesar los trabajos pendientes y terminar.')
+@with_appcontext
+def worker_command(concurrency, poll_interval, burst):
+    """Genera las recomendaciones encoladas (RECOMMENDATION_MODE = 'async')."""
+    from flask import current_app
+
+    if poll_interval is None:
+        poll_interval = current_app.config.get('WORKER_POLL_INTERVAL', 1.0)
+    print(f"👷 Worker de recomendaciones: {concurrency} proceso(s)"
+          f"{' hasta vaciar la cola' if burst else ''}")
+
+    if concurrency <= 1:
+        stop = threading.Event()
+        _handle_stop_signals(stop, (signal.SIGINT, signal.SIGTERM))
+        processed = _work_loop(0, poll_interval, burst, stop)
+        print(f"✅ {processed} trabajos procesados")
+        return
+
+    # Un proceso por unidad de concurrencia, cada uno con su app y su pool de conexiones
+    context = multiprocessing.get_context('spawn')
+    stop = context.Event()
+    processes = [
+        context.Process(target=_worker_process, args=(index, poll_interval, burst, stop),
+                        name=f'recommendation-worker-{index}')
+        for index in range(concurrency)
+    ]
+    for process in processes:
+        process.start()
+
+    _handle_stop_signals(stop, (signal.SIGINT, signal.SIGTERM))
+    for process in processes:
+        while process.is_alive():
+            process.join(timeout=1)
+    print("✅ Worker detenido")
+
+
+def _handle_stop_signals(stop, signals):
+    """Al recibir la señal, terminar después del trabajo en curso"""
+    def handler(signum, frame):
+        if not stop.is_set():
+            print("🛑 Deteniendo al terminar los trabajos en curso...")
+        stop.set()
+
+    for signum in signals:
+        signal.signal(signum, handler)
+
+
+def _worker_process(index, poll_interval, burst, stop):
+    """Proceso hijo de `flask worker --concurrency N`"""
+    from app import create_app
+
+    # Ctrl+C lo coordina el proceso principal (activa stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _handle_stop_signals(stop, (signal.SIGTERM,))
+
+    app = create_app()
+    with app.app_context():
+        _work_loop(index, poll_interval, burst, stop)
+
+
+def _work_loop(index, poll_interval, burst, stop):
+    """
+    Reclama y procesa trabajos hasta que se active stop (o la cola quede vacía con burst)
+
+    Returns:
+        int: Trabajos procesados
+    """
+    from app import db
+    from app.utils import job_queue
+
+    worker_id = job_queue.make_worker_id(index)
+    processed = 0
+    next_sweep = 0.0
+
+    while not stop.is_set():
+        try:
+            if time.monotonic() >= next_sweep:
+                job_queue.fail_exhausted()
+                next_sweep = time.monotonic() + _WORKER_SWEEP_INTERVAL
+
+            job_id = job_queue.claim(worker_id)
+            if job_id is None:
+                if burst:
+                    break
+                stop.wait(poll_interval)
+                continue
+
+            started = time.monotonic()
+            status = job_queue.run(job_id, worker_id)
+            processed += 1
+            icon = '✅' if status == job_queue.DONE else '⚠️'
+            print(f"   {icon} Trabajo {job_id}: {status} en {time.monotonic() - started:.2f}s ({worker_id})")
+
+        except Exception as e:
+            # Error de conexión u otro fallo fuera de un trabajo: esperar y reintentar
+            db.session.rollback()
+            print(f"❌ Error en el worker {worker_id}: {e}")
+            stop.wait(poll_interval)
+        finally:
+            db.session.remove()
+
+    return processed
+
+
+# ----------------------------------------------------------------------
+# flask startup-report
+# ----------------------------------------------------------------------
+
+# Paquetes cuyo costo de importación interesa vigilar al iniciar
+HEAVY_MODULES = ('numpy', 'pandas', 'scipy', 'sklearn', 'joblib', 'matplotlib')
+
+# Script que se ejecuta en un intérprete nuevo con -X importtime
+_STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+done = time.perf_counter()
+print('__startup__' + json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (done - imported) * 1000,
+    'total_ms': (done - start) * 1000,
+}))
+"""
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+@click.command('startup-report')
+@click.option('--top', default=15, show_default=True,
+              help='Importaciones a mostrar, ordenadas por tiempo acumulado.')
+@click.option('--preload', type=click.Choice(['1', '0', 'background']), default=None,
+              help='Valor de ML_PRELOAD_MODELS para la medición (por defecto, el del entorno).')
+def startup_report_command(top, preload):
+    """Mide el arranque en frío: tiempo de create_app() e importaciones por módulo."""
+    env = dict(os.environ)
+    if preload is not None:
+        env['ML_PRELOAD_MODELS'] = preload
+
+    # Proceso nuevo: en este ya están importados los módulos de la aplicación
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _STARTUP_PROBE],
+        cwd=project_dir, env=env, capture_output=True, text=True
+    )
+
+    timings = None
+    for line in result.stdout.splitlines():
+        if line.startswith('__startup__'):
+            timings = json.loads(line[len('__startup__'):])
+    if result.returncode != 0 or timings is None:
+        print(f"❌ No se pudo iniciar la aplicación (código {result.returncode})")
+        print(result.stderr[-2000:])
+        return
+
+    imports = _parse_importtime(result.stderr)
+
+    print(f"🚀 Arranque en frío: {timings['total_ms']:.0f} ms "
+          f"(importar app: {timings['import_ms']:.0f} ms, create_app(): {timings['create_app_ms']:.0f} ms)")
+    print(f"   ML_PRELOAD_MODELS={env.get('ML_PRELOAD_MODELS', '1')}")
+
+    print("\n📦 Paquetes pesados:")
+    for name in HEAVY_MODULES:
+        entry = _package_entry(imports, name)
+        if entry is None:
+            print(f"   {name:<12} no se importó")
+        else:
+            print(f"   {name:<12} {entry['cumulative_us'] / 1000:8.1f} ms  (importado por {entry['importer'] or '-'})")
+
+    # Importaciones de primer nivel: muestran qué módulo arrastró cada costo
+    print("\n⏱️  Importaciones más costosas (acumulado):")
+    top_level = sorted((e for e in imports if e['depth'] == 0), key=lambda e: e['cumulative_us'], reverse=True)
+    for entry in top_level[:top]:
+        print(f"   {entry['cumulative_us'] / 1000:8.1f} ms  {entry['name']}")
+
+
+def _parse_importtime(stderr):
+    """
+    Interpreta la salida de python -X importtime
+
+    Returns:
+        list: Diccionarios con name, self_us, cumulative_us, depth y parent
+              (entrada del módulo que lo importó), en el orden en que
+              terminaron de importarse
+    """
+    imports = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            imports.append({
+                'name': match.group(4),
+                'self_us': int(match.group(1)),
+                'cumulative_us': int(match.group(2)),
+                'depth': len(match.group(3)) // 2,
+                'parent': None
+            })
+
+    # Cada módulo aparece antes que quien lo importó: el padre es la siguiente
+    # línea con menor profundidad
+    pending = []
+    for entry in imports:
+        while pending and pending[-1]['depth'] > entry['depth']:
+            pending.pop()['parent'] = entry
+        pending.append(entry)
+
+    return imports
+
+
+def _package_entry(imports, package):
+    """
+    Importación de más alto nivel de un paquete y el módulo externo que la provocó
+
+    Returns:
+        dict: name, cumulative_us e importer, o None si el paquete no se importó
+    """
+    in_package = lambda name: name == package or name.startswith(package + '.')
+    entries = [entry for entry in imports if in_package(entry['name'])]
+    if not entries:
+        return None
+
+    entry = min(entries, key=lambda e: (e['depth'], -e['cumulative_us']))
+    parent = entry['parent']
+    while parent is not None and in_package(parent['name']):
+        parent = parent['parent']
+
+    return {
+        'name': entry['name'],
+        'cumulative_us': entry['cumulative_us'],
+        'importer': parent['name'] if parent else None
+    }
+
+
+# ----------------------------------------------------------------------
+# flask rescore
+# ----------------------------------------------------------------------
+
+@click.command('rescore')
+@click.option('--chunk-size', default=500, show_default=True,
+              help='Estudiantes por bloque (una transacción por bloque).')
+@click.option('--workers', default=max(1, (os.cpu_count() or 2) - 1), show_default=True,
+              help='Procesos de trabajo; 0 procesa en el proceso actual.')
+@click.option('--top-n', default=5, show_default=True,
+              help='Recomendaciones por estudiante.')
+@click.option('--checkpoint', default='rescore_checkpoint.json', show_default=True,
+              help='Archivo donde se guarda el avance.')
+@click.option('--resume', is_flag=True,
+              help='Continuar desde el último estudiante confirmado en el checkpoint.')
+@with_appcontext
+def rescore_command(chunk_size, workers, top_n, checkpoint, resume):
+    """Recalcula las recomendaciones de todos los estudiantes con los modelos actuales."""
+    from app import db
+    from app.models.student import Student
+    from app.models.test_answer import TestAnswer
+
+    start_after = 0
+    processed = 0
+    if resume and os.path.exists(checkpoint):
+        with open(checkpoint, 'r') as f:
+            state = json.load(f)
+        start_after = state.get('last_student_id', 0)
+        processed = state.get('processed', 0)
+        print(f"↩️ Reanudando después del estudiante {start_after} ({processed} ya procesados)")
+
+    has_test = db.session.query(TestAnswer.id).filter(TestAnswer.student_id == Student.id).exists()
+    total = db.session.query(Student.id).filter(Student.id > start_after, has_test).count()
+    print(f"🔄 Recalculando recomendaciones de {total} estudiantes "
+          f"(bloques de {chunk_size}, {workers or 'sin'} procesos)")
+
+    chunks = _iter_student_id_chunks(
+        db.select(Student.id).where(Student.id > start_after, has_test), chunk_size
+    )
+    progress = _RescoreProgress(checkpoint, total, processed, start_after)
+
+    if workers == 0:
+        for seq, chunk in enumerate(chunks):
+            progress.submitted(seq, chunk)
+            progress.completed(seq, _rescore_chunk(chunk, top_n))
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker) as executor:
+            pending = {}
+            max_pending = workers * 2
+
+            for seq, chunk in enumerate(chunks):
+                progress.submitted(seq, chunk)
+                pending[executor.submit(_rescore_chunk, chunk, top_n)] = seq
+
+                # Limitar bloques en vuelo para no acumular memoria
+                if len(pending) >= max_pending:
+                    _collect(pending, progress, wait(pending, return_when=FIRST_COMPLETED).done)
+
+            while pending:
+                _collect(pending, progress, wait(pending, return_when=FIRST_COMPLETED).done)
+
+    progress.finish()
+
+
+def _iter_student_id_chunks(query, chunk_size):
+    """
+    Recorre los IDs de estudiantes en orden, en bloques de chunk_size
+
+    Usa un cursor del lado del servidor para que los IDs nunca estén todos en
+    memoria. El cursor va en una conexión propia, no en db.session: con
+    --workers 0 cada bloque hace commit y remove() de la sesión, lo que
+    cerraría el cursor después del primer bloque. SQLite no tiene cursores
+    del lado del servidor y su lectura abierta bloquearía las escrituras de
+    los bloques, así que ahí se pagina por clave (id > último) con una
+    consulta corta por bloque.
+    """
+    from app import db
+    from app.models.student import Student
+
+    if db.engine.dialect.name != 'sqlite':
+        with db.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(
+                query.order_by(Student.id)
+            ).scalars()
+            try:
+                yield from result.partitions(chunk_size)
+            finally:
+                result.close()
+        return
+
+    last_id = 0
+    while True:
+        chunk = db.session.execute(
+            query.where(Student.id > last_id).order_by(Student.id).limit(chunk_size)
+        ).scalars().all()
+        db.session.commit()
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def _collect(pending, progress, done):
+    for future in done:
+        seq = pending.pop(future)
+        try:
+            progress.completed(seq, future.result())
+        except Exception as e:
+            progress.failed(seq, e)
+
+
+class _RescoreProgress:
+    """
+    Avance y checkpoint del recálculo.
+
+    Los bloques pueden terminar en desorden; el checkpoint solo avanza hasta
+    el último bloque tal que todos los anteriores terminaron bien.
+    """
+
+    def __init__(self, checkpoint, total, processed, start_after):
+        self.checkpoint = checkpoint
+        self.total = total
+        self.processed = processed
+        self.initial_processed = processed
+        self.recommendations = 0
+        self.watermark = start_after
+        self.watermark_processed = processed
+        self.chunks = {}
+        self.finished = set()
+        self.next_seq = 0
+        self.failures = []
+        self.started = time.monotonic()
+
+    def submitted(self, seq, student_ids):
+        self.chunks[seq] = (student_ids[-1], len(student_ids))
+
+    def completed(self, seq, result):
+        students, recommendations = result
+        self.processed += students
+        self.recommendations += recommendations
+        self.finished.add(seq)
+        self._advance()
+        self._report()
+
+    def failed(self, seq, error):
+        self.failures.append((seq, error))
+        print(f"❌ Error en el bloque {seq}: {error}")
+
+    def finish(self):
+        elapsed = time.monotonic() - self.started
+        print(f"✅ {self.processed - self.initial_processed} estudiantes recalculados, "
+              f"{self.recommendations} recomendaciones en {elapsed:.1f}s")
+        if self.failures:
+            print(f"⚠️ {len(self.failures)} bloques fallaron; "
+                  f"ejecuta de nuevo con --resume para reintentarlos")
+
+    def _advance(self):
+        # No avanzar el checkpoint más allá de un bloque fallido o pendiente
+        while self.next_seq in self.finished:
+            self.finished.discard(self.next_seq)
+            self.watermark, chunk_length = self.chunks.pop(self.next_seq)
+            self.watermark_processed += chunk_length
+            self.next_seq += 1
+        self._save()
+
+    def _save(self):
+        state = {
+            'last_student_id': self.watermark,
+            'processed': self.watermark_processed,
+            'updated_at': datetime.utcnow().isoformat()
+        }
+        tmp_path = f"{self.checkpoint}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint)
+
+    def _report(self):
+        elapsed = time.monotonic() - self.started
+        done = self.processed - self.initial_processed
+        rate = done / elapsed if elapsed > 0 else 0
+        remaining = max(self.total - done, 0)
+        eta = remaining / rate if rate > 0 else 0
+        percent = 100.0 * done / self.total if self.total else 100.0
+        print(f"   📈 {done}/{self.total} ({percent:.1f}%) - {rate:.0f} est/s - "
+              f"ETA {eta / 60:.1f} min - checkpoint: estudiante {self.watermark}")
+
+
+# Estado de cada proceso de trabajo
+_worker_app = None
+
+
+def _init_worker():
+    """Crea una app por proceso de trabajo (con su propio pool de conexiones)"""
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app()
+
+
+def _rescore_chunk(student_ids, top_n):
+    """
+    Recalcula un bloque de estudiantes y reescribe sus recomendaciones
+
+    Todo el bloque se escribe en una sola transacción con un INSERT masivo.
+
+    Returns:
+        tuple: (estudiantes procesados, recomendaciones escritas)
+    """
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        return _rescore_chunk_in_context(student_ids, top_n)
+
+    with (_worker_app or current_app).app_context():
+        return _rescore_chunk_in_context(student_ids, top_n)
+
+
+def _rescore_chunk_in_context(student_ids, top_n):
+    from app import db
+    from app.models.student import Student
+    from app.models.test_answer import TestAnswer
+    from app.models.recommendation import Recommendation
+    from app.utils.career_matcher import CareerMatcher
+
+    try:
+        students = Student.query.filter(Student.id.in_(student_ids)).all()
+
+        # Último test de cada estudiante del bloque
+        latest_tests = {}
+        for test_answer in TestAnswer.query.filter(
+            TestAnswer.student_id.in_(student_ids)
+        ).order_by(TestAnswer.student_id, TestAnswer.test_date.desc()):
+            latest_tests.setdefault(test_answer.student_id, test_answer)
+
+        pairs = [
+            (student, latest_tests[student.id])
+            for student in students if student.id in latest_tests
+        ]
+        results = CareerMatcher().generate_recommendations_batch(pairs, top_n=top_n)
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                'student_id': recommendation.student_id,
+                'career_id': recommendation.career_id,
+                'score': recommendation.score,
+                'rank': recommendation.rank,
+                'explanation': recommendation.explanation,
+                'model_used': recommendation.model_used,
+                'created_at': now
+            }
+            for recommendations in results for recommendation in recommendations
+        ]
+
+        # Solo reemplazar a quienes obtuvieron nuevas recomendaciones
+        rescored_ids = sorted({row['student_id'] for row in rows})
+        if rescored_ids:
+            Recommendation.query.filter(
+                Recommendation.student_id.in_(rescored_ids)
+            ).delete(synchronize_session=False)
+            db.session.execute(db.insert(Recommendation), rows)
+
+        db.session.commit()
+        return len(pairs), len(rows)
+
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        db.session.remove()
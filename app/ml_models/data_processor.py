@@ -1,9 +1,11 @@
 # REEMPLAZA COMPLETAMENTE: app/ml_models/data_processor.py
 
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-import json
+from app.utils.lazy import lazy_import
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+StandardScaler = lazy_import('sklearn.preprocessing', 'StandardScaler')
+OneHotEncoder = lazy_import('sklearn.preprocessing', 'OneHotEncoder')
 
 class DataProcessor:
     """
@@ -104,12 +106,8 @@ class DataProcessor:
     
     # Mantener métodos originales para compatibilidad
     def get_detailed_responses(self, test_answers):
-        if not test_answers.answers_json:
-            return {}
-        try:
-            return json.loads(test_answers.answers_json)
-        except json.JSONDecodeError:
-            return {}
+        # Mismo formato que el JSON original: claves str
+        return {str(question_id): is_yes for question_id, is_yes in test_answers.get_answers().items()}
     
     def get_feature_importance(self, student_data, model):
         if not hasattr(model, 'feature_importances_'):
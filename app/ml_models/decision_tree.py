@@ -1,11 +1,13 @@
-import numpy as np
-import pandas as pd
-from sklearn.tree import DecisionTreeClassifier, plot_tree
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import matplotlib.pyplot as plt
-import joblib
 import os
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+joblib = lazy_import('joblib')
+DecisionTreeClassifier = lazy_import('sklearn.tree', 'DecisionTreeClassifier')
+plot_tree = lazy_import('sklearn.tree', 'plot_tree')
+StandardScaler = lazy_import('sklearn.preprocessing', 'StandardScaler')
+train_test_split = lazy_import('sklearn.model_selection', 'train_test_split')
 
 class CareerDecisionTree:
     """
@@ -99,6 +101,40 @@ class CareerDecisionTree:
         
         return career_probas[:top_n]
     
+    def predict_proba_matrix(self, student_data, career_data):
+        """
+        Probabilidades de varios estudiantes para todas las carreras en una sola llamada
+        
+        Usa el mismo mapeo posicional que predict_best_careers (clase i → fila i
+        de career_data).
+        
+        Args:
+            student_data: DataFrame con una fila por estudiante
+            career_data: DataFrame con los datos de las carreras
+            
+        Returns:
+            numpy.ndarray: Matriz (n_estudiantes × n_carreras); NaN donde el
+            modelo no asigna probabilidad a la carrera
+        """
+        n_students, n_careers = len(student_data), len(career_data)
+        scores = np.full((n_students, n_careers), np.nan)
+        if n_students == 0 or n_careers == 0:
+            return scores
+        
+        if self.model is None:
+            positions = {int(career_id): col for col, career_id in enumerate(career_data['id'])}
+            for row in range(n_students):
+                for career_id, score in self._rule_based_prediction(student_data.iloc[[row]], career_data, n_careers):
+                    scores[row, positions[career_id]] = score
+            return scores
+        
+        X_scaled = self.scaler.transform(student_data.values)
+        probas = self.model.predict_proba(X_scaled)
+        
+        n_mapped = min(probas.shape[1], n_careers)
+        scores[:, :n_mapped] = probas[:, :n_mapped]
+        return scores
+    
     def _rule_based_prediction(self, student_data, career_data, top_n=5):
         """
         Implementa un enfoque basado en reglas cuando no hay modelo entrenado
@@ -179,6 +215,9 @@ class CareerDecisionTree:
             print("No hay modelo entrenado para visualizar")
             return
         
+        # Import diferido: la app no necesita matplotlib para predecir
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=(20, 10))
         plot_tree(
             self.model, 
@@ -187,6 +226,7 @@ class CareerDecisionTree:
             rounded=True
         )
         plt.savefig(path)
+        plt.close()
         print(f"Árbol guardado en {path}")
     
     def get_feature_importance(self):
@@ -1,10 +1,10 @@
-import numpy as np
-import pandas as pd
 import os
 import warnings
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
 
-# Configurar para evitar errores en Windows
-os.environ['LOKY_MAX_CPU_COUNT'] = '2'
 warnings.filterwarnings('ignore', category=UserWarning)
 
 class EnsembleRecommender:
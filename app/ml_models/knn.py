@@ -1,10 +1,12 @@
-import numpy as np
-import pandas as pd
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import joblib
 import os
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+joblib = lazy_import('joblib')
+KNeighborsClassifier = lazy_import('sklearn.neighbors', 'KNeighborsClassifier')
+StandardScaler = lazy_import('sklearn.preprocessing', 'StandardScaler')
+train_test_split = lazy_import('sklearn.model_selection', 'train_test_split')
 
 class CareerKNN:
     """
@@ -180,6 +182,123 @@ class CareerKNN:
         
         return career_recommendations
     
+    def predict_career_compatibility_matrix(self, student_data, career_data):
+        """
+        Versión por lotes de predict_career_compatibility
+        
+        Busca los vecinos de todos los estudiantes con una sola llamada a
+        kneighbors y calcula las reglas de respaldo de forma vectorizada.
+        
+        Args:
+            student_data: DataFrame con una fila por estudiante
+            career_data: DataFrame con los datos de las carreras
+            
+        Returns:
+            numpy.ndarray: Matriz (n_estudiantes × n_carreras); NaN donde el
+            modelo no propone la carrera
+        """
+        n_students, n_careers = len(student_data), len(career_data)
+        if n_students == 0 or n_careers == 0:
+            return np.full((n_students, n_careers), np.nan)
+        
+        # Si no hay suficientes datos para KNN, usar enfoque basado en reglas
+        if self.model is None or self.student_profiles is None or len(self.student_profiles) < 5:
+            return self._rule_based_compatibility_matrix(student_data, career_data)
+        
+        career_ids = [int(career_id) for career_id in career_data['id']]
+        positions = {career_id: col for col, career_id in enumerate(career_ids)}
+        scores = np.full((n_students, n_careers), np.nan)
+        rule_scores = None
+        
+        neighbor_recommendations = self._recommend_careers_by_similar_profiles_batch(student_data, top_n=5)
+        
+        for row, career_recommendations in enumerate(neighbor_recommendations):
+            # Complementar con reglas si no hay suficientes recomendaciones
+            if len(career_recommendations) < 3:
+                if rule_scores is None:
+                    rule_scores = self._rule_based_compatibility_matrix(student_data, career_data)
+                
+                recommended_ids = [c[0] for c in career_recommendations]
+                for col in np.argsort(-rule_scores[row], kind='stable'):
+                    career_id = career_ids[col]
+                    if career_id not in recommended_ids:
+                        career_recommendations.append((career_id, rule_scores[row, col] * 0.8))
+                        recommended_ids.append(career_id)
+                        
+                        if len(career_recommendations) >= 5:
+                            break
+            
+            for career_id, score in career_recommendations:
+                col = positions.get(int(career_id))
+                if col is not None:
+                    scores[row, col] = score
+        
+        return scores
+    
+    def _recommend_careers_by_similar_profiles_batch(self, student_data, top_n=3):
+        """
+        Igual que recommend_careers_by_similar_profiles, para varios estudiantes
+        con una sola búsqueda de vecinos
+        
+        Returns:
+            list: Una lista de tuplas (id_carrera, puntuación) por estudiante
+        """
+        n_students = len(student_data)
+        if self.model is None or self.career_recommendations is None or self.student_profiles is None:
+            return [[] for _ in range(n_students)]
+        
+        X_scaled = self.scaler.transform(student_data.values)
+        distances, indices = self.model.kneighbors(
+            X_scaled, n_neighbors=min(10, len(self.student_profiles))
+        )
+        profile_ids = self.student_profiles['student_id'].tolist() \
+            if 'student_id' in self.student_profiles.columns else [None] * len(self.student_profiles)
+        
+        results = []
+        for row in range(n_students):
+            # Convertir distancias a similitud (1 - distancia normalizada)
+            max_distance = distances[row].max()
+            similarities = 1 - (distances[row] / max_distance if max_distance > 0 else distances[row])
+            
+            career_counts = {}
+            for i, idx in enumerate(indices[row]):
+                if idx >= len(profile_ids):
+                    continue
+                student_id = profile_ids[idx]
+                if student_id and student_id in self.career_recommendations:
+                    career_id = self.career_recommendations[student_id]
+                    career_counts[career_id] = career_counts.get(career_id, 0) + float(similarities[i])
+            
+            recommended_careers = sorted(career_counts.items(), key=lambda x: x[1], reverse=True)
+            results.append(recommended_careers[:top_n])
+        
+        return results
+    
+    def _rule_based_compatibility_matrix(self, student_data, career_data):
+        """
+        Versión vectorizada de _rule_based_compatibility para varios estudiantes
+        
+        Returns:
+            numpy.ndarray: Matriz (n_estudiantes × n_carreras) de compatibilidad
+        """
+        chaside_areas = ['c', 'h', 'a', 's', 'i', 'd', 'e']
+        student_scores = student_data[[f'score_{area}' for area in chaside_areas]].to_numpy(dtype=np.float64)
+        career_areas = career_data[[f'area_{area}' for area in chaside_areas]].to_numpy(dtype=np.float64)
+        
+        # Tres áreas más fuertes por estudiante (empates en el orden C, H, A, S, I, D, E)
+        top_areas = np.argsort(-student_scores, axis=1, kind='stable')[:, :3]
+        rows = np.arange(len(student_scores))[:, None]
+        top_scores = student_scores[rows, top_areas]                 # (n_estudiantes, 3)
+        top_weights = career_areas.T[top_areas]                        # (n_estudiantes, 3, n_carreras)
+        
+        compatibility = np.zeros((len(student_scores), len(career_areas)))
+        for k in range(top_areas.shape[1]):
+            compatibility = compatibility + top_weights[:, k, :] * top_scores[:, k:k + 1]
+        
+        # Normalizar (0-1)
+        max_possible = top_scores.sum(axis=1, keepdims=True)
+        return np.where(max_possible > 0, compatibility / np.where(max_possible > 0, max_possible, 1), compatibility)
+    
     def _rule_based_compatibility(self, student_data, career_data):
         """
         Calcula compatibilidad usando reglas cuando no hay suficientes datos para KNN
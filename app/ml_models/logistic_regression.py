@@ -1,10 +1,12 @@
-import numpy as np
-import pandas as pd
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import joblib
 import os
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+joblib = lazy_import('joblib')
+LogisticRegression = lazy_import('sklearn.linear_model', 'LogisticRegression')
+StandardScaler = lazy_import('sklearn.preprocessing', 'StandardScaler')
+train_test_split = lazy_import('sklearn.model_selection', 'train_test_split')
 
 class CareerLogisticRegression:
     """
@@ -66,29 +68,97 @@ class CareerLogisticRegression:
             # Si no hay modelo entrenado, usamos un enfoque basado en reglas
             return self._rule_based_prediction(student_data, career_data)
         
-        # Preparar datos para predicción
-        results = []
+        if len(career_data) == 0:
+            return []
         
-        # Para cada carrera, crear un vector de características combinando estudiante y carrera
-        for _, career_row in career_data.iterrows():
-            career_id = int(career_row['id'])
-            
-            # Combinar características de estudiante y carrera
-            features = self._combine_features(student_data, career_row)
-            
-            # Aplicar el escalador
-            features_scaled = self.scaler.transform(features)
-            
-            # Predecir probabilidad
-            proba = self.model.predict_proba(features_scaled)[0, 1]  # Probabilidad de clase positiva
-            
-            results.append((career_id, float(proba)))
+        # Construir la matriz estudiante × carrera completa en un solo paso
+        features = self._combine_features_batch(student_data, career_data)
+        
+        # Una sola transformación y una sola llamada a predict_proba para todas las carreras
+        features_scaled = self.scaler.transform(features)
+        probas = self.model.predict_proba(features_scaled)[:, 1]  # Probabilidad de clase positiva
+        
+        career_ids = career_data['id'].astype(int).tolist()
+        results = [(career_id, float(proba)) for career_id, proba in zip(career_ids, probas)]
         
         # Ordenar por probabilidad (descendente)
         results.sort(key=lambda x: x[1], reverse=True)
         
         return results
     
+    def predict_compatibility_matrix(self, student_data, career_data):
+        """
+        Predice la compatibilidad de varios estudiantes con todas las carreras
+        
+        Args:
+            student_data: DataFrame con una fila por estudiante
+            career_data: DataFrame con los datos de las carreras
+            
+        Returns:
+            numpy.ndarray: Matriz (n_estudiantes × n_carreras) de probabilidades,
+            con las carreras en el orden de career_data
+        """
+        n_students, n_careers = len(student_data), len(career_data)
+        if n_students == 0 or n_careers == 0:
+            return np.zeros((n_students, n_careers))
+        
+        if self.model is None:
+            # Enfoque basado en reglas, estudiante por estudiante
+            scores = np.zeros((n_students, n_careers))
+            positions = {int(career_id): col for col, career_id in enumerate(career_data['id'])}
+            for row in range(n_students):
+                for career_id, score in self._rule_based_prediction(student_data.iloc[[row]], career_data):
+                    scores[row, positions[career_id]] = score
+            return scores
+        
+        # Matriz (estudiante, carrera) completa: una transformación y un predict_proba
+        features = self._combine_features_matrix(student_data, career_data)
+        features_scaled = self.scaler.transform(features)
+        probas = self.model.predict_proba(features_scaled)[:, 1]
+        
+        return probas.reshape(n_students, n_careers)
+    
+    def _combine_features_batch(self, student_data, career_data):
+        """
+        Combina las características del estudiante con las de todas las carreras
+        
+        Produce las mismas columnas (y en el mismo orden) que _combine_features,
+        con una fila por carrera.
+        
+        Args:
+            student_data: DataFrame con los datos del estudiante (se usa la primera fila)
+            career_data: DataFrame con los datos de las carreras
+            
+        Returns:
+            pandas.DataFrame: Matriz de características (n_carreras × n_características)
+        """
+        return self._combine_features_matrix(student_data.iloc[:1], career_data)
+    
+    def _combine_features_matrix(self, student_data, career_data):
+        """
+        Combina cada estudiante con cada carrera
+        
+        Las filas quedan agrupadas por estudiante: la fila i * n_carreras + j
+        corresponde al estudiante i con la carrera j.
+        
+        Returns:
+            pandas.DataFrame: Matriz ((n_estudiantes * n_carreras) × n_características)
+        """
+        n_students, n_careers = len(student_data), len(career_data)
+        columns = {}
+        
+        # Repetir los datos de cada estudiante para cada carrera
+        for col in student_data.columns:
+            columns[col] = np.repeat(student_data[col].values, n_careers)
+        
+        # Agregar características de la carrera (excluyendo el ID), como en iterrows()
+        for col in career_data.columns:
+            if col == 'id':
+                continue
+            columns[f'career_{col}'] = np.tile(career_data[col].to_numpy(dtype=np.float64), n_students)
+        
+        return pd.DataFrame(columns)
+    
     def _combine_features(self, student_data, career_row):
         """Combina las características del estudiante y la carrera"""
         # Excluir el ID de carrera para la predicción
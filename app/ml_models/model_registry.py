@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class _RegistrySnapshot:
+    """
+    Conjunto inmutable de modelos cargados junto con su estado de entrenamiento
+    """
+
+    def __init__(self, models, status, signature, version):
+        self.models = models
+        self.status = status
+        self.signature = signature
+        self.version = version
+
+
+class ModelRegistry:
+    """
+    Registro de modelos ML compartido por todo el proceso.
+
+    Carga los modelos una sola vez (al iniciar la aplicación) y entrega
+    siempre las mismas instancias de solo lectura. Solo vuelve a cargar
+    cuando cambian los archivos guardados (mtime/tamaño) o la versión
+    registrada en training_status.json; la recarga reemplaza el conjunto
+    completo de forma atómica.
+    """
+
+    STATUS_FILE = 'training_status.json'
+    MODEL_FILES = {
+        'logistic': 'logistic_model.pkl',
+        'tree': 'tree_model.pkl',
+        'knn': 'knn_model.pkl'
+    }
+
+    def __init__(self, models_path=None, check_interval=5.0):
+        """
+        Inicializa el registro (sin cargar modelos todavía)
+
+        Args:
+            models_path: Carpeta con los modelos guardados
+            check_interval: Segundos mínimos entre revisiones de los archivos
+        """
+        self.models_path = models_path or os.path.join('app', 'ml_models', 'saved_models')
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = _RegistrySnapshot({}, {}, None, None)
+        self._last_check = 0.0
+
+    def init_app(self, app):
+        """
+        Configura el registro desde la app y precarga los modelos
+
+        ML_PRELOAD_MODELS: '1' carga al iniciar (bloquea create_app), 'background'
+        carga en un hilo aparte y '0' espera al primer uso. Cargar los modelos
+        importa sklearn y pandas, que es la mayor parte del arranque.
+        """
+        self.models_path = app.config.get('ML_MODELS_DIR') or self.models_path
+        self.check_interval = app.config.get('ML_MODELS_CHECK_INTERVAL', self.check_interval)
+
+        preload = str(app.config.get('ML_PRELOAD_MODELS', '1')).lower()
+        if preload == 'background':
+            # Las peticiones que lleguen antes esperan el lock de refresh() en vez de cargar dos veces
+            threading.Thread(target=self.refresh, kwargs={'force': True}, name='ml-preload', daemon=True).start()
+        elif preload not in ('0', 'false'):
+            self.refresh(force=True)
+
+    # ------------------------------------------------------------------
+    # Acceso a los modelos
+    # ------------------------------------------------------------------
+
+    def get_models(self):
+        """
+        Devuelve los modelos compartidos (no modificar)
+
+        Returns:
+            dict: {'logistic': ..., 'tree': ..., 'knn': ...} con los modelos disponibles
+        """
+        return self._current().models
+
+    def get_status(self):
+        """Devuelve el contenido de training_status.json de la versión cargada"""
+        return self._current().status
+
+    def is_trained(self):
+        """Indica si hay modelos entrenados disponibles"""
+        return bool(self._current().status.get('trained', False))
+
+    @property
+    def version(self):
+        """Identificador de la versión de modelos cargada"""
+        return self._current().version
+
+    def _current(self):
+        now = time.monotonic()
+        if self._snapshot.signature is None or now - self._last_check >= self.check_interval:
+            self._last_check = now
+            self.refresh()
+        return self._snapshot
+
+    # ------------------------------------------------------------------
+    # Carga y recarga
+    # ------------------------------------------------------------------
+
+    def refresh(self, force=False):
+        """
+        Recarga los modelos si los archivos cambiaron
+
+        Args:
+            force: Recargar aunque la firma de los archivos no haya cambiado
+
+        Returns:
+            bool: True si se cargó una nueva versión
+        """
+        signature = self._compute_signature()
+        if not force and signature == self._snapshot.signature:
+            return False
+
+        # Si otro hilo ya está recargando, seguir usando la versión actual
+        blocking = self._snapshot.signature is None or force
+        if not self._lock.acquire(blocking=blocking):
+            return False
+
+        try:
+            if not force and signature == self._snapshot.signature:
+                return False
+
+            status = self._read_status()
+            models = self._load_models(self._snapshot.models)
+            digest = hashlib.sha1(repr(signature).encode('utf-8')).hexdigest()[:8]
+            version = f"{status.get('date', 'sin_fecha')}:{digest}"
+
+            # Reemplazo atómico: los lectores ven la versión anterior o la nueva, nunca una mezcla
+            self._snapshot = _RegistrySnapshot(models, status, signature, version)
+
+            if status.get('trained', False) and models:
+                print(f"✅ Modelos ML cargados ({', '.join(sorted(models))}) - versión {version}")
+            else:
+                print("💡 Modelos no encontrados - Usando reglas mejoradas")
+            return True
+        finally:
+            self._lock.release()
+
+    def _compute_signature(self):
+        """Firma de los archivos de modelos: (nombre, mtime, tamaño)"""
+        signature = []
+        for filename in (self.STATUS_FILE, *self.MODEL_FILES.values()):
+            try:
+                stat = os.stat(os.path.join(self.models_path, filename))
+                signature.append((filename, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((filename, None, None))
+        return tuple(signature)
+
+    def _read_status(self):
+        status_file = os.path.join(self.models_path, self.STATUS_FILE)
+        if not os.path.exists(status_file):
+            return {}
+        try:
+            with open(status_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ No se pudo leer {status_file}: {e}")
+            return {}
+
+    def _load_models(self, previous_models):
+        """Carga cada modelo; si uno falla se conserva la instancia anterior"""
+        from app.ml_models.logistic_regression import CareerLogisticRegression
+        from app.ml_models.decision_tree import CareerDecisionTree
+        from app.ml_models.knn import CareerKNN
+
+        loaders = {
+            'logistic': lambda path: CareerLogisticRegression(path),
+            'tree': lambda path: CareerDecisionTree(path),
+            'knn': lambda path: CareerKNN(model_path=path)
+        }
+
+        models = {}
+        for name, filename in self.MODEL_FILES.items():
+            path = os.path.join(self.models_path, filename)
+            if not os.path.exists(path):
+                continue
+            try:
+                models[name] = loaders[name](path)
+            except Exception as e:
+                print(f"⚠️ Error cargando modelo {name}: {e}")
+                if name in previous_models:
+                    models[name] = previous_models[name]
+
+        return models
+
+
+# Instancia única por proceso
+model_registry = ModelRegistry()
@@ -1,10 +1,12 @@
-import numpy as np
-import pandas as pd
-from sklearn.neural_network import MLPClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import joblib
 import os
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+joblib = lazy_import('joblib')
+MLPClassifier = lazy_import('sklearn.neural_network', 'MLPClassifier')
+StandardScaler = lazy_import('sklearn.preprocessing', 'StandardScaler')
+train_test_split = lazy_import('sklearn.model_selection', 'train_test_split')
 
 class CareerNeuralNetwork:
     """
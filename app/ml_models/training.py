@@ -0,0 +1,258 @@
+"""
+Entrenamiento en paralelo de los modelos ML.
+
+    results = train_models(X, y, student_profiles, models_dir, n_jobs=2)
+
+- Cada modelo se entrena en un proceso propio (spawn, un modelo por
+  proceso). El pico de memoria se mide dentro de ese proceso mientras
+  entrena (ver _PeakRssSampler); ru_maxrss no sirve porque en Linux el
+  proceso hijo hereda el máximo del proceso principal.
+- n_jobs es el presupuesto total de núcleos: se reparte entre los procesos y
+  cada uno limita sus hilos de BLAS/OpenMP con threadpoolctl (y los de
+  joblib/loky). No se cambian variables de entorno del proceso principal.
+- Los datos se pasan a los procesos en archivos .npy temporales (mmap), no
+  por la tubería de multiprocessing.
+- El avance se informa al empezar (desde el proceso) y al terminar cada
+  modelo, con su tiempo y su pico de memoria.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+TrainingResult = namedtuple('TrainingResult', ['name', 'accuracy', 'wall_time', 'peak_rss_mb', 'error'])
+
+# Modelos entrenables: nombre -> (módulo, clase, argumentos, archivo, usa perfiles)
+MODEL_SPECS = {
+    'logistic': ('app.ml_models.logistic_regression', 'CareerLogisticRegression', {}, 'logistic_model.pkl', False),
+    'tree': ('app.ml_models.decision_tree', 'CareerDecisionTree', {}, 'tree_model.pkl', False),
+    'knn': ('app.ml_models.knn', 'CareerKNN', {'n_neighbors': 3}, 'knn_model.pkl', True),
+}
+
+MODEL_LABELS = {
+    'logistic': '📈 Regresión Logística',
+    'tree': '🌳 Árbol de Decisión',
+    'knn': '🔍 KNN',
+}
+
+
+def resolve_n_jobs(n_jobs=None):
+    """
+    Presupuesto de núcleos para el entrenamiento
+
+    Args:
+        n_jobs: Núcleos a usar; None toma ML_TRAINING_JOBS de la app (o 1 sin
+                app) y los negativos cuentan desde el total, como en joblib
+                (-1 = todos)
+
+    Returns:
+        int: Entre 1 y el número de núcleos del equipo
+    """
+    if n_jobs is None:
+        try:
+            from flask import current_app
+            n_jobs = current_app.config.get('ML_TRAINING_JOBS', 1)
+        except RuntimeError:
+            n_jobs = 1
+
+    cpu_count = os.cpu_count() or 1
+    n_jobs = int(n_jobs)
+    if n_jobs < 0:
+        n_jobs = cpu_count + 1 + n_jobs
+    return max(1, min(n_jobs, cpu_count))
+
+
+def resolve_models_dir():
+    """Carpeta de los modelos: ML_MODELS_DIR de la app, o la carpeta por defecto sin app"""
+    try:
+        from flask import current_app
+        models_dir = current_app.config.get('ML_MODELS_DIR')
+    except RuntimeError:
+        models_dir = None
+    return models_dir or os.path.join('app', 'ml_models', 'saved_models')
+
+
+def train_models(X, y, student_profiles=None, models_dir=None, n_jobs=None, models=None):
+    """
+    Entrena y guarda los modelos en paralelo
+
+    Args:
+        X: Características (n, 16)
+        y: Carrera de cada muestra (n,)
+        student_profiles: DataFrame de perfiles (para KNN)
+        models_dir: Carpeta donde se guardan los modelos (None = ML_MODELS_DIR
+                    de la app, la misma que carga ModelRegistry)
+        n_jobs: Presupuesto de núcleos (ver resolve_n_jobs)
+        models: Nombres de MODEL_SPECS a entrenar (None = todos)
+
+    Returns:
+        dict: nombre -> TrainingResult, en el orden de `models`
+    """
+    models = list(models or MODEL_SPECS)
+    models_dir = models_dir or resolve_models_dir()
+    os.makedirs(models_dir, exist_ok=True)
+
+    n_jobs = resolve_n_jobs(n_jobs)
+    processes = min(n_jobs, len(models))
+    threads = max(1, n_jobs // processes)
+    print(f"🧠 Entrenando {len(models)} modelos: {n_jobs} núcleo(s), "
+          f"{processes} proceso(s) con {threads} hilo(s) cada uno")
+
+    data_dir = tempfile.mkdtemp(prefix='training_')
+    try:
+        np.save(os.path.join(data_dir, 'X.npy'), np.asarray(X))
+        np.save(os.path.join(data_dir, 'y.npy'), np.asarray(y))
+        if student_profiles is not None:
+            student_profiles.to_pickle(os.path.join(data_dir, 'profiles.pkl'))
+
+        results = {}
+        started = time.perf_counter()
+        context = multiprocessing.get_context('spawn')
+        # maxtasksperchild=1: un proceso nuevo por modelo (memoria medida por modelo)
+        with context.Pool(processes, initializer=_init_worker, initargs=(threads,),
+                          maxtasksperchild=1) as pool:
+            tasks = [(name, data_dir, models_dir, threads) for name in models]
+            for result in pool.imap_unordered(_train_model, tasks):
+                results[result.name] = result
+                _report(result, len(results), len(models))
+
+        print(f"⏱️ Entrenamiento total: {time.perf_counter() - started:.1f}s")
+        return {name: results[name] for name in models}
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def _report(result, done, total):
+    """Línea de avance de un modelo terminado"""
+    label = MODEL_LABELS.get(result.name, result.name)
+    memory = f"{result.peak_rss_mb:.0f} MB" if result.peak_rss_mb is not None else "memoria no disponible"
+    if result.error:
+        print(f"   ⚠️ [{done}/{total}] {label}: {result.error} ({result.wall_time:.1f}s)")
+    else:
+        print(f"   ✅ [{done}/{total}] {label}: {result.accuracy:.2%} "
+              f"({result.wall_time:.1f}s, pico {memory})")
+
+
+def _init_worker(threads):
+    """
+    Límite de hilos del proceso de entrenamiento (solo en ese proceso, antes de
+    importar sklearn): joblib/loky y OpenMP usan `threads` núcleos
+    """
+    os.environ['LOKY_MAX_CPU_COUNT'] = str(threads)
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+
+
+def _train_model(task):
+    """
+    Entrena y guarda un modelo (se ejecuta en un proceso aparte)
+
+    Returns:
+        TrainingResult: Precisión, tiempo y pico de memoria del proceso
+    """
+    import importlib
+    from threadpoolctl import threadpool_limits
+
+    name, data_dir, models_dir, threads = task
+    print(f"   ▶️ {MODEL_LABELS.get(name, name)} (proceso {os.getpid()})...", flush=True)
+    started = time.perf_counter()
+    accuracy, error = None, None
+    sampler = _PeakRssSampler()
+    try:
+        module_name, class_name, kwargs, filename, uses_profiles = MODEL_SPECS[name]
+        X = np.load(os.path.join(data_dir, 'X.npy'), mmap_mode='r')
+        y = np.load(os.path.join(data_dir, 'y.npy'), mmap_mode='r')
+
+        with threadpool_limits(limits=threads), sampler:
+            model = getattr(importlib.import_module(module_name), class_name)(**kwargs)
+            profiles_path = os.path.join(data_dir, 'profiles.pkl')
+            if uses_profiles and os.path.exists(profiles_path):
+                accuracy = model.train(X, y, pd.read_pickle(profiles_path))
+            else:
+                accuracy = model.train(X, y)
+            model.save_model(os.path.join(models_dir, filename))
+    except Exception as e:
+        error = str(e)
+
+    return TrainingResult(name, accuracy, time.perf_counter() - started, sampler.peak_mb, error)
+
+
+class _PeakRssSampler:
+    """
+    Pico de memoria residente del proceso mientras dura el bloque `with`
+
+    En Linux se reinicia el máximo del proceso (VmHWM, escribiendo 5 en
+    /proc/self/clear_refs) y se lee al salir; además, un hilo consulta VmRSS
+    cada `interval` segundos por si el reinicio no está permitido. En otros
+    sistemas se usa psutil si está instalado; si no, peak_mb queda en None.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_mb = None
+        self._hwm_reset = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        try:
+            with open('/proc/self/clear_refs', 'w') as f:
+                f.write('5')
+            self._hwm_reset = True
+        except OSError:
+            pass
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        if self._hwm_reset:
+            hwm = _read_proc_status_mb('VmHWM')
+            if hwm is not None:
+                self.peak_mb = max(self.peak_mb or 0.0, hwm)
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        rss = _current_rss_mb()
+        if rss is not None:
+            self.peak_mb = max(self.peak_mb or 0.0, rss)
+
+
+def _current_rss_mb():
+    """Memoria residente actual del proceso en MB (None si no se puede medir)"""
+    rss = _read_proc_status_mb('VmRSS')
+    if rss is not None:
+        return rss
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def _read_proc_status_mb(field):
+    """Campo de /proc/self/status (en kB) convertido a MB; None fuera de Linux"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
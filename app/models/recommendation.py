@@ -3,6 +3,10 @@ from datetime import datetime
 
 class Recommendation(db.Model):
     __tablename__ = 'recommendations'
+    __table_args__ = (
+        # Mejores recomendaciones de un estudiante: WHERE student_id = ? ORDER BY score DESC
+        db.Index('ix_recommendations_student_id_score', 'student_id', db.text('score DESC')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
@@ -0,0 +1,27 @@
+from app import db
+from datetime import datetime
+
+class RecommendationJob(db.Model):
+    """Trabajo pendiente de generar recomendaciones (modo asíncrono, ver app/utils/job_queue.py)"""
+    __tablename__ = 'recommendation_jobs'
+    __table_args__ = (
+        # Siguiente trabajo a reclamar: WHERE status = ? ORDER BY id
+        db.Index('ix_recommendation_jobs_status_id', 'status', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, index=True)
+    test_answer_id = db.Column(db.Integer, db.ForeignKey('test_answers.id', ondelete='CASCADE'), nullable=False)
+    
+    # 'pending' → 'running' → 'done' | 'failed' ('cancelled' si llegó un test más nuevo)
+    status = db.Column(db.String(16), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    worker_id = db.Column(db.String(64))  # Proceso que lo reclamó
+    error = db.Column(db.Text)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<RecommendationJob {self.id} - Student {self.student_id} - {self.status}>'
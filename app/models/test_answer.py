@@ -1,13 +1,19 @@
 from app import db
+from app.utils.answer_bits import ANSWER_BYTES, encode_answers, decode_answers, answers_to_int, bits_to_int
 from datetime import datetime
+import json
 
 class TestAnswer(db.Model):
     __tablename__ = 'test_answers'
     
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    # Un test vigente por estudiante (el índice único permite el upsert de result_writer)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, unique=True, index=True)
     test_date = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Clave del envío que produjo este resultado (reintentos y envíos dobles)
+    idempotency_key = db.Column(db.String(64))
+    
     # Resultados del test CHASIDE
     score_c = db.Column(db.Integer, default=0)  # Administrativas y contables
     score_h = db.Column(db.Integer, default=0)  # Humanísticas y sociales
@@ -17,8 +23,38 @@ class TestAnswer(db.Model):
     score_d = db.Column(db.Integer, default=0)  # Defensa y seguridad
     score_e = db.Column(db.Integer, default=0)  # Ciencias exactas y agrarias
     
-    # Almacenar respuestas detalladas (formato JSON)
+    # Respuestas detalladas: 98 bits (bit q-1 = "Sí" en la pregunta q)
+    answers_bits = db.Column(db.LargeBinary(ANSWER_BYTES))
+    
+    # Formato anterior (JSON); solo se lee en filas antiguas
     answers_json = db.Column(db.Text)
     
+    def set_answers(self, answers):
+        """Guarda las respuestas {pregunta: bool} en formato de bits"""
+        self.answers_bits = encode_answers(answers)
+        self.answers_json = None
+    
+    def get_answers(self):
+        """
+        Devuelve las respuestas como {pregunta (int): bool}
+        
+        Usa los bits si existen; en filas antiguas lee el JSON.
+        """
+        if self.answers_bits is not None:
+            return decode_answers(self.answers_bits)
+        if not self.answers_json:
+            return {}
+        try:
+            return {int(question_id): bool(is_yes) for question_id, is_yes in json.loads(self.answers_json).items()}
+        except (ValueError, AttributeError):
+            return {}
+    
+    def get_answers_int(self):
+        """Respuestas como entero de 98 bits (para puntuar con máscaras)"""
+        if self.answers_bits is not None:
+            return bits_to_int(self.answers_bits)
+        return answers_to_int(self.get_answers())
+    
+
     def __repr__(self):
         return f'<TestAnswer {self.id} - Student {self.student_id}>'
\ No newline at end of file
@@ -0,0 +1,18 @@
+from app import db
+from app.utils.answer_bits import ANSWER_BYTES
+from datetime import datetime
+
+class TestProgress(db.Model):
+    __tablename__ = 'test_progress'
+
+    # Un test en curso por estudiante
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), primary_key=True)
+
+    # Respuestas parciales en bits (bit q-1 = pregunta q)
+    answered_bits = db.Column(db.LargeBinary(ANSWER_BYTES), nullable=False)  # Preguntas respondidas
+    yes_bits = db.Column(db.LargeBinary(ANSWER_BYTES), nullable=False)       # Respondidas "Sí"
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<TestProgress Student {self.student_id}>'
@@ -26,4 +26,6 @@ class User(UserMixin, db.Model):
 
 @login_manager.user_loader
 def load_user(id):
-    return User.query.get(int(id))
\ No newline at end of file
+    # Usuario + estudiante en una consulta, o desde la caché del proceso
+    from app.utils.identity_cache import identity_cache
+    return identity_cache.load_user(int(id))
\ No newline at end of file
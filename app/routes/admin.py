@@ -0,0 +1,33 @@
+from functools import wraps
+
+from flask import Blueprint, jsonify, abort
+from flask_login import login_required, current_user
+from app import db
+from app.utils.db_pool import pool_metrics
+
+bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+
+def admin_required(view):
+    """Solo administradores (los demás usuarios reciben 403)"""
+    @wraps(view)
+    @login_required
+    def wrapper(*args, **kwargs):
+        if not current_user.is_admin:
+            abort(403)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@bp.route('/metrics')
+@admin_required
+def metrics():
+    """Métricas del proceso en JSON: pool de conexiones y cachés"""
+    from app.utils.chart_cache import chart_cache
+    from app.utils.recommendation_cache import recommendation_cache
+
+    return jsonify({
+        'db_pool': pool_metrics.snapshot(db.engine.pool),
+        'chart_cache': {'hits': chart_cache.hits, 'misses': chart_cache.misses},
+        'recommendation_cache': recommendation_cache.stats(),
+    })
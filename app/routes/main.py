@@ -1,7 +1,12 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, session, current_app
 from flask_login import current_user, login_required
+from sqlalchemy.orm import joinedload
+from werkzeug.http import is_resource_modified
 from app import db
-from app.models.student import Student
+from app.utils.page_cache import page_cache
+from app.utils.identity_cache import identity_cache, get_current_student
+from datetime import datetime, timezone
+import hashlib
 
 bp = Blueprint('main', __name__)
 
@@ -17,7 +22,7 @@ def index():
 @login_required
 def profile():
     """Perfil del estudiante con información académica boliviana"""
-    student = Student.query.filter_by(user_id=current_user.id).first()
+    student = get_current_student()
     
     if request.method == 'POST':
         # Actualizar información personal
@@ -54,6 +59,7 @@ def profile():
         
         try:
             db.session.commit()
+            identity_cache.invalidate(current_user.id)
             flash('Perfil actualizado correctamente', 'success')
         except Exception as e:
             db.session.rollback()
@@ -71,19 +77,57 @@ def about():
 @bp.route('/careers')
 def careers():
     """Lista de todas las carreras en el sistema"""
-    from app.models.career import Career, Aptitude
-    from app.models.faculty import Faculty
-    
-    careers = Career.query.all()
-    faculties = Faculty.query.all()
-    
-    return render_template('careers.html', careers=careers, faculties=faculties)
+    return render_catalog_page('careers')
 
 @bp.route('/faculties')
 def faculties():
     """Lista de todas las facultades en el sistema"""
+    return render_catalog_page('faculties')
+
+def catalog_context():
+    """Carreras (con su facultad) y facultades con sus carreras, en 2 consultas"""
+    from app.models.career import Career
     from app.models.faculty import Faculty
     
-    faculties = Faculty.query.all()
+    careers = Career.query.options(joinedload(Career.faculty)).order_by(Career.name).all()
+    faculties = Faculty.query.order_by(Faculty.name).all()
+    
+    # Faculty.careers es lazy='dynamic' (una consulta por facultad): agrupar aquí
+    careers_by_faculty = {faculty.id: [] for faculty in faculties}
+    for career in careers:
+        careers_by_faculty.setdefault(career.faculty_id, []).append(career)
+    
+    return {'careers': careers, 'faculties': faculties, 'careers_by_faculty': careers_by_faculty}
+
+def render_catalog_page(page):
+    """
+    Página del catálogo con el contenido desde page_cache y GET condicional
+    
+    El contenido solo cambia con el catálogo y con si hay sesión iniciada; el
+    ETag incluye además al usuario, porque la barra de navegación muestra su nombre.
+    """
+    variant = 'auth' if current_user.is_authenticated else 'anon'
+    fragment = page_cache.get_or_render(
+        f'{page}:{variant}',
+        lambda: render_template(f'catalog/{page}.html', **catalog_context())
+    )
+    
+    user_tag = f'{current_user.id}:{current_user.username}' if current_user.is_authenticated else 'anon'
+    etag = hashlib.sha1(f'{fragment.etag}:{user_tag}'.encode('utf-8')).hexdigest()[:20]
+    last_modified = datetime.fromtimestamp(int(fragment.last_modified), timezone.utc)
+    
+    # Con mensajes flash pendientes siempre se renderiza (se consumen al mostrarse)
+    has_flashes = bool(session.get('_flashes'))
+    if not has_flashes and not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(render_template(f'{page}.html', content=fragment.html))
     
-    return render_template('faculties.html', faculties=faculties)
\ No newline at end of file
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.vary.add('Cookie')
+    if current_user.is_authenticated:
+        response.headers['Cache-Control'] = 'private, no-cache'
+    else:
+        response.headers['Cache-Control'] = f"public, max-age={current_app.config.get('CATALOG_PAGE_MAX_AGE', 300)}"
+    return response
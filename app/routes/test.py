@@ -1,24 +1,42 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, session
-from flask_login import current_user, login_required
+from flask import Blueprint, render_template, redirect, url_for, flash, request, session, jsonify, abort, current_app
+from flask_login import login_required
 from app import db
-from app.models.student import Student
 from app.models.test_answer import TestAnswer
 from app.models.recommendation import Recommendation
 from app.models.career import Career
-from app.utils.test_chaside import TestChaside
+from app.utils.test_chaside import chaside, AREA_EXPLANATIONS, QUESTIONS
+from app.utils.career_catalog import career_catalog
+from app.utils.progress_store import progress_store
+from app.utils.results_repository import get_latest_results, get_top_recommendations
+from app.utils.result_writer import (write_results, upsert_test_answer, replace_recommendations, find_completed,
+                                     clear_results, normalize_idempotency_key)
+from app.utils import job_queue
+from app.models.recommendation_job import RecommendationJob
+from app.utils.identity_cache import get_current_student, get_current_student_id
+from app.utils.chart_generator import ChartGenerator
+from app.utils.chart_prerender import chart_prerenderer
+from app.utils.lazy import lazy_import
 import json
-import numpy as np
+import uuid
 from datetime import datetime
 
+np = lazy_import('numpy')
+
 # Crear el blueprint
 bp = Blueprint('test', __name__, url_prefix='/test')
 
+# Respuestas mínimas para procesar resultados
+MIN_ANSWERS = 50
+
+# Gráficos disponibles en /results/<id>/charts/<tipo>/<hash>
+CHART_KINDS = ('radar', 'bar')
+
 @bp.route('/start')
 @login_required
 def start_test():
     """Página de inicio del test vocacional"""
     # Verificar si el estudiante ya ha realizado el test
-    student = Student.query.filter_by(user_id=current_user.id).first()
+    student = get_current_student()
     if not student:
         flash('Debes completar tu perfil antes de realizar el test.', 'warning')
         return redirect(url_for('main.profile'))
@@ -29,8 +47,9 @@ def start_test():
         flash('Ya has realizado el test vocacional. Puedes ver tus resultados o volver a realizar el test.', 'info')
         return redirect(url_for('test.test_results'))
     
-    # Mostrar página inicial con instrucciones
-    return render_template('test/start.html')
+    # Mostrar página inicial con instrucciones (y el avance guardado, si existe)
+    answered = len(progress_store.get(student.id))
+    return render_template('test/start.html', answered=answered, total_questions=len(QUESTIONS))
 
 @bp.route('/question/<int:question_number>', methods=['GET', 'POST'])
 @login_required
@@ -41,32 +60,30 @@ def question(question_number=1):
         flash('Número de pregunta inválido.', 'danger')
         return redirect(url_for('test.start_test'))
     
-    # Inicializar el test
-    test_chaside = TestChaside()
-    questions = test_chaside.get_questions()
+    questions = chaside.get_questions()
     
     # Obtener la pregunta actual
     current_question_text = questions.get(question_number, "Pregunta no disponible")
     
-    # Inicializar o recuperar las respuestas
-    if 'answers' not in session:
-        session['answers'] = {}
-    
-    answers = session.get('answers', {})
-    
     # Si se ha enviado una respuesta
     if request.method == 'POST':
+        student_id = get_current_student_id()
+        if student_id is None:
+            flash('Debes completar tu perfil antes de realizar el test.', 'warning')
+            return redirect(url_for('main.profile'))
+        
+        # El avance se guarda en el servidor (la cookie de sesión no crece)
         answer = request.form.get('answer') == 'yes'
-        answers[str(question_number)] = answer
-        session['answers'] = answers
-        session.modified = True
+        progress_store.record(student_id, question_number, answer)
         
         # Avanzar a la siguiente pregunta
         next_question = question_number + 1
         
-        # Verificar si es la última pregunta
+        # Verificar si es la última pregunta (la clave del formulario evita
+        # procesar dos veces el mismo envío)
         if next_question > 98:
-            return redirect(url_for('test.process_results'))
+            idempotency_key = normalize_idempotency_key(request.form.get('idempotency_key'))
+            return redirect(url_for('test.process_results', idempotency_key=idempotency_key))
         
         # Redirigir a la siguiente pregunta
         return redirect(url_for('test.question', question_number=next_question))
@@ -74,19 +91,37 @@ def question(question_number=1):
     return render_template('test/question.html', 
                           question_number=question_number,
                           question=current_question_text,
-                          total_questions=98)
+                          total_questions=98,
+                          idempotency_key=uuid.uuid4().hex if question_number == 98 else None)
 
 @bp.route('/comenzar')
 @login_required
 def comenzar_test():
     """Ruta para comenzar el test - redirige a la primera pregunta"""
-    # Limpiar respuestas anteriores en la sesión
-    session['answers'] = {}
-    session.modified = True
+    # Limpiar respuestas anteriores
+    student_id = get_current_student_id()
+    if student_id is not None:
+        progress_store.clear(student_id)
+    session.pop('answers', None)  # Formato anterior (cookie)
     
     # Redirigir a la primera pregunta
     return redirect(url_for('test.question', question_number=1))
 
+@bp.route('/continuar')
+@login_required
+def resume_test():
+    """Retomar el test en la primera pregunta sin responder (desde cualquier dispositivo)"""
+    student_id = get_current_student_id()
+    if student_id is None:
+        flash('Debes completar tu perfil antes de realizar el test.', 'warning')
+        return redirect(url_for('main.profile'))
+    
+    answers = progress_store.get(student_id)
+    missing = [q for q in QUESTIONS if str(q) not in answers]
+    if not missing:
+        return redirect(url_for('test.process_results'))
+    return redirect(url_for('test.question', question_number=missing[0]))
+
 # REEMPLAZA LA FUNCIÓN process_results EN: app/routes/test.py
 
 @bp.route('/process-results')
@@ -94,88 +129,294 @@ def comenzar_test():
 def process_results():
     """Procesar resultados con INTEGRACIÓN ML MEJORADA"""
     
+    # Obtener estudiante
+    student = get_current_student()
+    if not student:
+        flash('Error: No se encontró el perfil del estudiante.', 'danger')
+        return redirect(url_for('main.profile'))
+    
+    # Envío repetido (doble clic o reintento del navegador): ya está procesado
+    idempotency_key = normalize_idempotency_key(request.args.get('idempotency_key'))
+    if find_completed(student.id, idempotency_key):
+        return redirect(url_for('test.test_results'))
+    
     # Verificar respuestas
-    if 'answers' not in session or not session['answers']:
+    answers = progress_store.get(student.id)
+    if not answers:
         flash('No hay respuestas para procesar. Por favor, realiza el test.', 'warning')
         return redirect(url_for('test.start_test'))
     
-    answers = session.get('answers', {})
-    
-    if len(answers) < 50:
+    if len(answers) < MIN_ANSWERS:
         flash('Por favor, completa más preguntas antes de procesar los resultados.', 'warning')
-        return redirect(url_for('test.question', question_number=len(answers)+1))
+        return redirect(url_for('test.resume_test'))
     
     try:
-        print(f"🔄 Procesando {len(answers)} respuestas con IA...")
+        # Modo asíncrono: las recomendaciones las genera `flask worker`
+        if job_queue.is_async_enabled():
+            job = enqueue_test_results(student, answers, idempotency_key)
+            progress_store.clear(student.id)
+            return redirect(url_for('test.job_status', job_id=job.id))
         
-        # Procesar test CHASIDE
-        test_chaside = TestChaside()
-        scores = test_chaside.calculate_scores(answers)
-        
-        # Obtener estudiante
-        student = Student.query.filter_by(user_id=current_user.id).first()
-        if not student:
-            flash('Error: No se encontró el perfil del estudiante.', 'danger')
-            return redirect(url_for('main.profile'))
-        
-        # Limpiar datos anteriores
-        existing_test = TestAnswer.query.filter_by(student_id=student.id).first()
-        if existing_test:
-            db.session.delete(existing_test)
-        Recommendation.query.filter_by(student_id=student.id).delete()
-        
-        # Crear respuesta del test
-        test_answer = TestAnswer(
-            student_id=student.id,
-            score_c=scores['C']['total'],
-            score_h=scores['H']['total'],
-            score_a=scores['A']['total'],
-            score_s=scores['S']['total'],
-            score_i=scores['I']['total'],
-            score_d=scores['D']['total'],
-            score_e=scores['E']['total'],
-            answers_json=json.dumps(answers)
-        )
-        db.session.add(test_answer)
-        db.session.flush()
+        save_test_results(student, answers, idempotency_key)
+        progress_store.clear(student.id)
         
-        print(f"✅ Test guardado: C={scores['C']['total']}, I={scores['I']['total']}, S={scores['S']['total']}")
+        flash('¡Test completado! Recomendaciones generadas con Inteligencia Artificial.', 'success')
+        return redirect(url_for('test.test_results'))
         
-        # 🤖 GENERAR RECOMENDACIONES CON IA MEJORADA
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        flash('Error procesando resultados. Inténtalo de nuevo.', 'danger')
+        return redirect(url_for('test.start_test'))
+
+
+@bp.route('/answers', methods=['POST'])
+@login_required
+def submit_answers():
+    """
+    Recibe respuestas en JSON en una sola petición
+    
+    Cuerpo: {"answers": {"1": true, "2": false, ...}, "final": true}
+    
+    Se pueden enviar todas las respuestas juntas o por páginas; las páginas se
+    acumulan en el avance guardado. Con "final": true se procesan los resultados igual
+    que en /process-results. El flujo de una pregunta por página sigue
+    funcionando.
+    
+    El envío final acepta una clave de idempotencia ("idempotency_key" o el
+    encabezado Idempotency-Key): si se repite, se devuelven los resultados ya
+    guardados sin volver a procesarlos. Una clave que no cumple el formato
+    responde 400.
+    
+    En modo asíncrono (RECOMMENDATION_MODE = 'async') el envío final responde
+    202 con el trabajo encolado y la URL para consultar su estado.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get('answers'), dict):
+        return jsonify({'error': 'Se esperaba un objeto JSON con "answers": {pregunta: true/false}'}), 400
+    
+    page, invalid = validate_answers(payload['answers'])
+    if invalid:
+        return jsonify({'error': 'Respuestas inválidas', 'invalid': invalid}), 400
+    
+    # Una clave enviada pero inválida no se ignora: el reintento se procesaría dos veces
+    raw_idempotency_key = payload.get('idempotency_key') or request.headers.get('Idempotency-Key')
+    idempotency_key = normalize_idempotency_key(raw_idempotency_key)
+    if raw_idempotency_key is not None and idempotency_key is None:
+        return jsonify({
+            'error': 'Clave de idempotencia inválida: de 8 a 64 caracteres (letras, números, "_", ".", ":" o "-")'
+        }), 400
+    
+    student = get_current_student()
+    if not student:
+        return jsonify({'error': 'No se encontró el perfil del estudiante'}), 400
+    
+    if not payload.get('final'):
+        answers = progress_store.update(student.id, page)
+        return jsonify({
+            'answered': len(answers),
+            'missing': [q for q in QUESTIONS if str(q) not in answers]
+        })
+    
+    completed = find_completed(student.id, idempotency_key)
+    if completed is not None:
+        job = job_queue.get_latest_job(student.id, job_queue.ACTIVE_STATUSES)
+        if job is not None:
+            return jsonify(job_payload(job)), 202
+        return jsonify(results_payload(completed, get_top_recommendations(student.id, limit=None)))
+    
+    answers = progress_store.get(student.id)
+    answers.update(page)
+    
+    if len(answers) < MIN_ANSWERS:
+        progress_store.update(student.id, page)
+        return jsonify({
+            'error': f'Se necesitan al menos {MIN_ANSWERS} respuestas para procesar los resultados',
+            'answered': len(answers)
+        }), 400
+    
+    if job_queue.is_async_enabled():
         try:
-            print("🤖 Generando recomendaciones con ML...")
-            from app.utils.career_matcher import CareerMatcher
-            
-            career_matcher = CareerMatcher()
-            recommendations = career_matcher.generate_recommendations(
-                student, test_answer, top_n=5
-            )
-            
-            if recommendations:
-                print(f"✅ {len(recommendations)} recomendaciones con IA generadas")
-            else:
-                print("⚠️ Usando método de respaldo...")
-                recommendations = generate_fallback_recommendations(student, test_answer, scores)
-                
+            job = enqueue_test_results(student, answers, idempotency_key)
         except Exception as e:
-            print(f"⚠️ Error en IA, usando respaldo: {e}")
-            recommendations = generate_fallback_recommendations(student, test_answer, scores)
+            print(f"❌ Error: {e}")
+            return jsonify({'error': 'Error procesando resultados'}), 500
+        progress_store.clear(student.id)
+        return jsonify(job_payload(job)), 202
+    
+    try:
+        test_answer, scores, recommendations = save_test_results(student, answers, idempotency_key)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return jsonify({'error': 'Error procesando resultados'}), 500
+    
+    progress_store.clear(student.id)
+    
+    return jsonify(results_payload(test_answer, recommendations))
+
+
+def results_payload(test_answer, recommendations):
+    """Respuesta JSON con el test guardado y sus recomendaciones"""
+    return {
+        'test_answer_id': test_answer.id,
+        'scores': get_test_scores(test_answer),
+        'recommendations': [
+            {
+                'career_id': recommendation.career_id,
+                'rank': recommendation.rank,
+                'score': recommendation.score,
+                'model_used': recommendation.model_used
+            }
+            for recommendation in recommendations
+        ],
+        'results_url': url_for('test.test_results')
+    }
+
+
+def validate_answers(raw_answers):
+    """
+    Valida respuestas contra el banco de preguntas
+    
+    Args:
+        raw_answers: Diccionario {pregunta: bool} recibido del cliente
+    
+    Returns:
+        tuple: (respuestas válidas con claves str, lista de claves inválidas)
+    """
+    answers = {}
+    invalid = []
+    for question_id, is_yes in raw_answers.items():
+        try:
+            number = int(question_id)
+        except (TypeError, ValueError):
+            invalid.append(question_id)
+            continue
+        if number not in QUESTIONS or not isinstance(is_yes, bool):
+            invalid.append(question_id)
+            continue
+        answers[str(number)] = is_yes
+    return answers, invalid
+
+
+def save_test_results(student, answers, idempotency_key=None):
+    """
+    Puntúa el test, guarda el resultado y genera las recomendaciones
+    
+    Las recomendaciones se calculan antes de escribir; luego el test y las
+    recomendaciones anteriores del estudiante se reemplazan en una sola
+    transacción corta (ver app/utils/result_writer.py).
+    
+    Args:
+        student: Objeto Student
+        answers: Diccionario {pregunta: bool}
+        idempotency_key: Clave del envío; si ya se guardó, se devuelven los
+                         resultados existentes
+    
+    Returns:
+        tuple: (TestAnswer, puntajes por área, lista de Recommendation)
+    """
+    try:
+        print(f"🔄 Procesando {len(answers)} respuestas con IA...")
         
-        # Guardar recomendaciones
-        for recommendation in recommendations:
-            db.session.add(recommendation)
+        # Procesar test CHASIDE (se guarda después de generar las recomendaciones)
+        scores = chaside.calculate_scores(answers)
+        test_answer = build_test_answer(student, answers, scores)
         
+        recommendations = generate_test_recommendations(student, test_answer, scores)
+        
+        # Guardar test y recomendaciones (upsert + INSERT de varias filas)
+        written = write_results(test_answer, recommendations, idempotency_key)
         db.session.commit()
-        session.pop('answers', None)
         
-        flash('¡Test completado! Recomendaciones generadas con Inteligencia Artificial.', 'success')
-        return redirect(url_for('test.test_results'))
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    if written.duplicate:
+        print("↩️ Envío repetido: se devuelven los resultados ya guardados")
+    else:
+        prerender_result_charts(written.test_answer)
+    return written.test_answer, scores, written.recommendations
+
+def enqueue_test_results(student, answers, idempotency_key=None):
+    """
+    Modo asíncrono: guarda el test y encola la generación de recomendaciones
+    
+    Las recomendaciones anteriores se eliminan en la misma transacción
+    (corresponden al test reemplazado).
+    
+    Returns:
+        RecommendationJob: Trabajo encolado (el ya existente si el envío se repite)
+    """
+    try:
+        scores = chaside.calculate_scores(answers)
+        test_answer = upsert_test_answer(build_test_answer(student, answers, scores), idempotency_key)
+        if test_answer is None:
+            db.session.rollback()
+            print("↩️ Envío repetido: se devuelve el trabajo ya encolado")
+            return job_queue.get_latest_job(student.id)
+        
+        replace_recommendations(student.id, [])
+        job = job_queue.enqueue(student.id, test_answer.id)
+        db.session.commit()
+        print(f"📨 Trabajo {job.id} encolado: C={scores['C']['total']}, I={scores['I']['total']}, S={scores['S']['total']}")
+        return job
+    except Exception:
+        db.session.rollback()
+        raise
+
+def build_test_answer(student, answers, scores):
+    """TestAnswer sin guardar con los puntajes y las respuestas"""
+    test_answer = TestAnswer(
+        student_id=student.id,
+        score_c=scores['C']['total'],
+        score_h=scores['H']['total'],
+        score_a=scores['A']['total'],
+        score_s=scores['S']['total'],
+        score_i=scores['I']['total'],
+        score_d=scores['D']['total'],
+        score_e=scores['E']['total']
+    )
+    test_answer.set_answers(answers)
+    return test_answer
+
+def generate_test_recommendations(student, test_answer, scores):
+    """
+    Recomendaciones con ML y, si fallan, con el método de respaldo
+    (en la petición o en `flask worker`)
+    """
+    print(f"✅ Test puntuado: C={scores['C']['total']}, I={scores['I']['total']}, S={scores['S']['total']}")
+    
+    # 🤖 GENERAR RECOMENDACIONES CON IA MEJORADA
+    try:
+        print("🤖 Generando recomendaciones con ML...")
+        from app.utils.career_matcher import CareerMatcher
+        
+        career_matcher = CareerMatcher()
+        recommendations = career_matcher.generate_recommendations(
+            student, test_answer, top_n=5
+        )
         
+        if recommendations:
+            print(f"✅ {len(recommendations)} recomendaciones con IA generadas")
+        else:
+            print("⚠️ Usando método de respaldo...")
+            recommendations = generate_fallback_recommendations(student, test_answer, scores)
+            
     except Exception as e:
-        db.session.rollback()
-        print(f"❌ Error: {e}")
-        flash('Error procesando resultados. Inténtalo de nuevo.', 'danger')
-        return redirect(url_for('test.start_test'))
+        print(f"⚠️ Error en IA, usando respaldo: {e}")
+        recommendations = generate_fallback_recommendations(student, test_answer, scores)
+    
+    return recommendations
+
+def prerender_result_charts(test_answer):
+    """
+    Después del commit: encola el dibujo de los gráficos del test para que la
+    primera visita a los resultados no tenga que esperar a matplotlib
+    """
+    try:
+        chart_prerenderer.submit([build_chart_spec(test_answer, kind) for kind in CHART_KINDS])
+    except Exception as e:
+        print(f"⚠️ No se pudieron encolar los gráficos: {e}")
 
 
 # AGREGAR ESTA FUNCIÓN NUEVA AL FINAL DEL ARCHIVO
@@ -184,11 +425,8 @@ def generate_fallback_recommendations(student, test_answer, scores):
     try:
         print("🔄 Generando recomendaciones de respaldo mejoradas...")
         
-        from app.utils.test_chaside import TestChaside
-        test_chaside = TestChaside()
-        
         # Obtener áreas más fuertes
-        recommended_areas = test_chaside.get_recommended_areas(scores, top_n=3)
+        recommended_areas = chaside.get_recommended_areas(scores, top_n=3)
         
         recommendations = []
         rank = 1
@@ -197,9 +435,13 @@ def generate_fallback_recommendations(student, test_answer, scores):
             if rank > 5:
                 break
                 
-            # Buscar carreras para esta área
-            area_field = f'area_{area_code.lower()}'
-            careers = Career.query.filter(getattr(Career, area_field) >= 0.4).limit(2).all()
+            # Buscar carreras para esta área (desde el catálogo en caché)
+            career_ids = career_catalog.get().career_ids_for_area(area_code, 0.4, limit=2)
+            careers_by_id = {
+                career.id: career
+                for career in Career.query.filter(Career.id.in_(career_ids)).all()
+            } if career_ids else {}
+            careers = [careers_by_id[career_id] for career_id in career_ids if career_id in careers_by_id]
             
             for career in careers:
                 if rank > 5:
@@ -210,7 +452,7 @@ def generate_fallback_recommendations(student, test_answer, scores):
                     compatibility = calculate_improved_compatibility(student, career, area_code, scores)
                     
                     # Crear explicación MEJORADA
-                    explanation = create_improved_explanation(student, career, area_code, test_chaside)
+                    explanation = create_improved_explanation(student, career, area_code, chaside)
                     
                     recommendation = Recommendation(
                         student_id=student.id,
@@ -400,70 +642,49 @@ def create_explanation(student, career, area_code, test_chaside):
 @login_required
 def test_results():
     """Mostrar resultados del test y recomendaciones"""
-    student = Student.query.filter_by(user_id=current_user.id).first()
+    student = get_current_student()
     
     if not student:
         flash('Debes completar tu perfil antes de ver los resultados.', 'warning')
         return redirect(url_for('main.profile'))
     
-    # Verificar si ha realizado el test
-    test_answers = TestAnswer.query.filter_by(student_id=student.id).order_by(TestAnswer.test_date.desc()).first()
+    # Verificar si ha realizado el test (test + recomendaciones con carrera y facultad: 2 consultas)
+    test_answers, top_recommendations = get_latest_results(student.id)
     
     if not test_answers:
         flash('Aún no has realizado el test vocacional', 'info')
         return redirect(url_for('test.start_test'))
     
-    # Obtener resultados y recomendaciones
-    scores = {
-        'C': test_answers.score_c,
-        'H': test_answers.score_h,
-        'A': test_answers.score_a,
-        'S': test_answers.score_s,
-        'I': test_answers.score_i,
-        'D': test_answers.score_d,
-        'E': test_answers.score_e
-    }
+    # Modo asíncrono: las recomendaciones todavía se están generando
+    if not top_recommendations:
+        job = job_queue.get_latest_job(student.id, job_queue.ACTIVE_STATUSES)
+        if job is not None:
+            return redirect(url_for('test.job_status', job_id=job.id))
     
-    recommendations = Recommendation.query.filter_by(student_id=student.id).order_by(Recommendation.score.desc()).all()
+    # Obtener resultados y recomendaciones
+    scores = get_test_scores(test_answers)
     
-    # Generar gráfico de radar para visualización
+    # Los gráficos se sirven desde su propia URL (cacheable); aquí solo se calcula la dirección
     radar_chart = None
     bar_chart = None
     try:
-        from app.utils.chart_generator import ChartGenerator
-        radar_chart = ChartGenerator.generate_radar_chart(scores)
-        
-        # Preparar datos para gráfico de barras de carreras
-        career_scores = []
-        for rec in recommendations[:5]:
-            career = Career.query.get(rec.career_id)
-            if career:
-                career_scores.append((career.name, rec.score))
-        
-        bar_chart = ChartGenerator.generate_bar_chart(career_scores)
+        radar_chart = chart_url(test_answers, 'radar', ChartGenerator.radar_spec(scores))
+        bar_chart = chart_url(test_answers, 'bar', ChartGenerator.bar_spec(
+            [(rec.career.name, rec.score) for rec in top_recommendations]
+        ))
     except Exception as e:
         print(f"Error generando gráficos: {e}")
     
-    # Preparar datos para visualización
-    test_chaside = TestChaside()
-    area_explanations = {}
-    for area_code in ['C', 'H', 'A', 'S', 'I', 'D', 'E']:
-        area_explanations[area_code] = test_chaside.get_area_characteristics(area_code)
-    
     # Obtener carreras recomendadas con detalles
     recommended_careers = []
-    for rec in recommendations[:5]:  # Top 5 recomendaciones
-        career = Career.query.get(rec.career_id)
-        if not career:
-            continue
-            
+    for rec in top_recommendations:  # Top 5 recomendaciones
         try:
             explanation = json.loads(rec.explanation) if rec.explanation else {}
         except:
             explanation = {}
         
         recommended_careers.append({
-            'career': career,
+            'career': rec.career,
             'score': rec.score * 100,  # Convertir a porcentaje
             'rank': rec.rank,
             'explanation': explanation
@@ -473,23 +694,132 @@ def test_results():
                           test_date=test_answers.test_date,
                           scores=scores,
                           recommended_careers=recommended_careers,
-                          area_explanations=area_explanations,
+                          area_explanations=AREA_EXPLANATIONS,
                           radar_chart=radar_chart,
                           bar_chart=bar_chart)
 
+@bp.route('/results/<int:test_answer_id>/charts/<kind>/<digest>')
+@login_required
+def result_chart(test_answer_id, kind, digest):
+    """
+    Imagen de un gráfico de resultados
+    
+    La URL incluye el hash del contenido, así que la respuesta nunca cambia:
+    se envía con ETag fuerte y Cache-Control de larga duración, y se responde
+    304 a las peticiones condicionales sin dibujar nada.
+    """
+    if kind not in CHART_KINDS:
+        abort(404)
+    
+    student_id = get_current_student_id()
+    test_answer = TestAnswer.query.filter_by(id=test_answer_id, student_id=student_id).first()
+    if student_id is None or test_answer is None:
+        abort(404)
+    
+    spec = build_chart_spec(test_answer, kind)
+    if spec.key != digest:
+        # Los datos (o el backend) cambiaron: redirigir a la versión vigente
+        return redirect(chart_url(test_answer, kind, spec))
+    
+    if request.if_none_match.contains(spec.key):
+        response = current_app.response_class(status=304)
+    else:
+        # Si se está dibujando en segundo plano, usar ese resultado (la caché
+        # puede llenarse un instante después); si no, caché o dibujo en línea
+        image = chart_prerenderer.wait(spec.key)
+        if image is not None:
+            mimetype = spec.mimetype
+        else:
+            image, mimetype = ChartGenerator.get_image(spec)
+        response = current_app.response_class(image, mimetype=mimetype)
+    
+    response.set_etag(spec.key)
+    response.headers['Cache-Control'] = current_app.config.get(
+        'CHART_HTTP_CACHE_CONTROL', 'private, max-age=31536000, immutable'
+    )
+    return response
+
+@bp.route('/jobs/<int:job_id>')
+@login_required
+def job_status(job_id):
+    """Página de espera mientras `flask worker` genera las recomendaciones"""
+    job = get_student_job(job_id)
+    
+    if job.status == job_queue.DONE:
+        flash('¡Test completado! Recomendaciones generadas con Inteligencia Artificial.', 'success')
+        return redirect(url_for('test.test_results'))
+    
+    if job.status == job_queue.CANCELLED:
+        # Un envío más nuevo reemplazó a este trabajo
+        latest = job_queue.get_latest_job(job.student_id)
+        if latest is not None and latest.id != job.id:
+            return redirect(url_for('test.job_status', job_id=latest.id))
+        return redirect(url_for('test.test_results'))
+    
+    return render_template('test/job_status.html', job=job)
+
+@bp.route('/jobs/<int:job_id>/status')
+@login_required
+def job_status_json(job_id):
+    """Estado del trabajo en JSON (la página de espera lo consulta)"""
+    response = jsonify(job_payload(get_student_job(job_id)))
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+def get_student_job(job_id):
+    """Trabajo del estudiante actual (404 si no existe o es de otro estudiante)"""
+    job = db.session.get(RecommendationJob, job_id)
+    if job is None or job.student_id != get_current_student_id():
+        abort(404)
+    return job
+
+def job_payload(job):
+    """Estado de un trabajo para la API (sin detalles internos del error)"""
+    payload = {
+        'job_id': job.id,
+        'status': job.status,
+        'attempts': job.attempts,
+        'status_url': url_for('test.job_status_json', job_id=job.id)
+    }
+    if job.status == job_queue.DONE:
+        payload['results_url'] = url_for('test.test_results')
+    return payload
+
+def get_test_scores(test_answer):
+    """Puntajes CHASIDE de un test como diccionario {área: puntaje}"""
+    return {
+        'C': test_answer.score_c,
+        'H': test_answer.score_h,
+        'A': test_answer.score_a,
+        'S': test_answer.score_s,
+        'I': test_answer.score_i,
+        'D': test_answer.score_d,
+        'E': test_answer.score_e
+    }
+
+def build_chart_spec(test_answer, kind):
+    """Describe el gráfico 'radar' o 'bar' de un test (sin dibujarlo)"""
+    if kind == 'radar':
+        return ChartGenerator.radar_spec(get_test_scores(test_answer))
+    return ChartGenerator.bar_spec(
+        [(rec.career.name, rec.score) for rec in get_top_recommendations(test_answer.student_id)]
+    )
+
+def chart_url(test_answer, kind, spec):
+    return url_for('test.result_chart', test_answer_id=test_answer.id, kind=kind, digest=spec.key)
+
 @bp.route('/retake')
 @login_required
 def retake_test():
     """Volver a realizar el test vocacional"""
-    student = Student.query.filter_by(user_id=current_user.id).first()
+    student = get_current_student()
     
     if not student:
         flash('Debes completar tu perfil primero.', 'warning')
         return redirect(url_for('main.profile'))
     
     # Eliminar test y recomendaciones anteriores
-    TestAnswer.query.filter_by(student_id=student.id).delete()
-    Recommendation.query.filter_by(student_id=student.id).delete()
+    clear_results(student.id)
     db.session.commit()
     
     flash('Puedes volver a realizar el test vocacional', 'info')
@@ -0,0 +1,91 @@
+"""
+Codificación compacta de las respuestas del test CHASIDE.
+
+Las 98 respuestas Sí/No se guardan como un entero de 98 bits (13 bytes,
+little-endian): el bit q-1 vale 1 si la pregunta q se respondió "Sí".
+Las preguntas sin responder o respondidas "No" quedan en 0, que para el
+puntaje es equivalente.
+"""
+
+NUM_QUESTIONS = 98
+ANSWER_BYTES = (NUM_QUESTIONS + 7) // 8  # 13
+
+
+def encode_answers(answers):
+    """
+    Convierte un diccionario de respuestas en su representación de bits
+
+    Args:
+        answers: Diccionario {pregunta: bool}; las claves pueden ser int o str
+                 (como llegan de la sesión o del JSON)
+
+    Returns:
+        bytes: 13 bytes con un bit por pregunta respondida "Sí"
+    """
+    return answers_to_int(answers).to_bytes(ANSWER_BYTES, 'little')
+
+
+def answers_to_int(answers):
+    """Igual que encode_answers pero devuelve el entero de 98 bits"""
+    value = 0
+    for question_id, is_yes in answers.items():
+        if not is_yes:
+            continue
+        question_id = int(question_id)
+        if 1 <= question_id <= NUM_QUESTIONS:
+            value |= 1 << (question_id - 1)
+    return value
+
+
+def bits_to_int(data):
+    """Convierte los 13 bytes guardados en el entero de 98 bits"""
+    return int.from_bytes(data or b'', 'little')
+
+
+def decode_answers(data):
+    """
+    Reconstruye el diccionario de respuestas a partir de los bits
+
+    Args:
+        data: bytes producidos por encode_answers
+
+    Returns:
+        dict: {pregunta (int): bool} para las 98 preguntas
+    """
+    value = bits_to_int(data)
+    return {
+        question_id: bool(value >> (question_id - 1) & 1)
+        for question_id in range(1, NUM_QUESTIONS + 1)
+    }
+
+
+def build_area_masks(question_map):
+    """
+    Construye una máscara de bits por área a partir de un mapa pregunta → área
+
+    Args:
+        question_map: Diccionario {pregunta (int): código de área}
+
+    Returns:
+        dict: {código de área: máscara (int)}
+    """
+    masks = {}
+    for question_id, area in question_map.items():
+        masks[area] = masks.get(area, 0) | 1 << (question_id - 1)
+    return masks
+
+
+def unpack_answer_rows(rows):
+    """
+    Convierte varias respuestas codificadas en una matriz booleana N×98
+
+    Args:
+        rows: Secuencia de bytes (TestAnswer.answers_bits), todas de 13 bytes
+
+    Returns:
+        numpy.ndarray: Matriz bool N×98 para calculate_scores_bulk
+    """
+    import numpy as np
+
+    packed = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), ANSWER_BYTES)
+    return np.unpackbits(packed, axis=1, bitorder='little')[:, :NUM_QUESTIONS].astype(bool)
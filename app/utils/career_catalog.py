@@ -0,0 +1,187 @@
+import hashlib
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.career import Career
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+# Orden de las columnas de pesos CHASIDE en la matriz del catálogo
+AREA_CODES = ('C', 'H', 'A', 'S', 'I', 'D', 'E')
+AREA_COLUMNS = tuple(f'area_{code.lower()}' for code in AREA_CODES)
+
+
+class CareerCatalogSnapshot:
+    """
+    Copia inmutable del catálogo de carreras en arreglos NumPy contiguos.
+
+    - ids: int64 (n,)
+    - faculty_ids: int64 (n,)
+    - weights: float64 (n, 7) en el orden C, H, A, S, I, D, E
+    - names: tupla con los nombres de las carreras
+    - index: diccionario id de carrera → fila
+    """
+
+    def __init__(self, ids, faculty_ids, weights, names):
+        self.ids = np.ascontiguousarray(ids, dtype=np.int64)
+        self.faculty_ids = np.ascontiguousarray(faculty_ids, dtype=np.int64)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64).reshape(len(self.ids), len(AREA_CODES))
+        self.names = tuple(names)
+
+        # Los arreglos se comparten entre hilos: marcarlos como solo lectura
+        for array in (self.ids, self.faculty_ids, self.weights):
+            array.setflags(write=False)
+
+        self.index = {int(career_id): row for row, career_id in enumerate(self.ids)}
+        self.loaded_at = time.time()
+        self.version = self._fingerprint()
+        self._dataframe = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _fingerprint(self):
+        """Huella del contenido (estable entre procesos)"""
+        digest = hashlib.sha1()
+        digest.update(self.ids.tobytes())
+        digest.update(self.faculty_ids.tobytes())
+        digest.update(self.weights.tobytes())
+        digest.update('\x1f'.join(self.names).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def row(self, career_id):
+        """Devuelve la fila de una carrera (o None si no existe)"""
+        return self.index.get(int(career_id))
+
+    def area_weights(self, area_code):
+        """Columna de pesos de un área CHASIDE (C, H, A, S, I, D, E)"""
+        return self.weights[:, AREA_CODES.index(area_code.upper())]
+
+    def career_ids_for_area(self, area_code, min_weight, limit=None):
+        """
+        IDs de carreras (ordenadas por id) cuyo peso en el área es >= min_weight
+
+        Args:
+            area_code: Código del área CHASIDE
+            min_weight: Peso mínimo en el área
+            limit: Máximo de carreras a devolver
+        """
+        rows = np.flatnonzero(self.area_weights(area_code) >= min_weight)
+        if limit is not None:
+            rows = rows[:limit]
+        return [int(career_id) for career_id in self.ids[rows]]
+
+    def to_dataframe(self):
+        """
+        DataFrame con el formato que esperan los modelos ML
+        (id, faculty_id, area_c ... area_e). Se construye una sola vez por versión.
+        """
+        if self._dataframe is None:
+            import pandas as pd
+
+            data = {'id': self.ids, 'faculty_id': self.faculty_ids}
+            for col, column_name in enumerate(AREA_COLUMNS):
+                data[column_name] = self.weights[:, col]
+            self._dataframe = pd.DataFrame(data)
+
+        return self._dataframe
+
+
+class CareerCatalog:
+    """
+    Caché del catálogo de carreras compartida por el proceso.
+
+    Se invalida mediante eventos de SQLAlchemy cuando se inserta, actualiza o
+    elimina una Career a través del ORM (al confirmar la transacción). Las
+    actualizaciones masivas (query.update/delete) no disparan estos eventos;
+    max_age limita además la antigüedad del catálogo para que otros procesos
+    (workers) también vean los cambios.
+    """
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def init_app(self, app):
+        """Configura la caché desde la app"""
+        self.max_age = app.config.get('CAREER_CATALOG_MAX_AGE', self.max_age)
+
+    def get(self):
+        """
+        Devuelve el catálogo actual, cargándolo de la base de datos si es necesario
+
+        Returns:
+            CareerCatalogSnapshot: Catálogo de carreras (solo lectura)
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and not self._is_expired(snapshot):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or self._is_expired(snapshot):
+                snapshot = self._load()
+                self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self):
+        """Descarta el catálogo en memoria; se recargará en el próximo acceso"""
+        self._snapshot = None
+
+    def _is_expired(self, snapshot):
+        return bool(self.max_age) and time.time() - snapshot.loaded_at > self.max_age
+
+    def _load(self):
+        rows = db.session.query(
+            Career.id,
+            Career.faculty_id,
+            Career.name,
+            *[getattr(Career, column_name) for column_name in AREA_COLUMNS]
+        ).order_by(Career.id).all()
+
+        ids = [row[0] for row in rows]
+        faculty_ids = [row[1] for row in rows]
+        names = [row[2] for row in rows]
+        weights = [[value or 0.0 for value in row[3:]] for row in rows]
+
+        snapshot = CareerCatalogSnapshot(ids, faculty_ids, weights, names)
+        print(f"📚 Catálogo de carreras cargado: {len(snapshot)} carreras (versión {snapshot.version})")
+        return snapshot
+
+
+# Instancia única por proceso
+career_catalog = CareerCatalog()
+
+
+# ----------------------------------------------------------------------
+# Invalidación por eventos de SQLAlchemy
+# ----------------------------------------------------------------------
+
+_DIRTY_KEY = 'career_catalog_dirty'
+
+
+def _mark_catalog_dirty(mapper, connection, target):
+    career_catalog.invalidate()
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+def _invalidate_if_dirty(session):
+    # Invalidar de nuevo al terminar la transacción: otro hilo pudo recargar
+    # el catálogo entre el flush y el commit/rollback
+    if session.info.pop(_DIRTY_KEY, False):
+        career_catalog.invalidate()
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Career, _event_name, _mark_catalog_dirty)
+
+event.listen(Session, 'after_commit', _invalidate_if_dirty)
+event.listen(Session, 'after_soft_rollback', lambda session, previous_transaction: _invalidate_if_dirty(session))
@@ -1,12 +1,16 @@
 # REEMPLAZA COMPLETAMENTE: app/utils/career_matcher.py
 
-import numpy as np
-import pandas as pd
 import json
-import os
 from app.models.career import Career
 from app.models.recommendation import Recommendation
-from app import db
+from app.ml_models.model_registry import model_registry
+from app.utils.career_catalog import career_catalog
+from app.utils.recommendation_cache import recommendation_cache
+from app.utils.lazy import lazy_import
+from sqlalchemy.orm import joinedload
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
 
 class CareerMatcher:
     """
@@ -14,105 +18,235 @@ class CareerMatcher:
     """
     
     def __init__(self):
-        """Inicializa el sistema"""
-        self.models_loaded = False
-        
-        # Verificar si hay estado de entrenamiento
-        models_path = os.path.join('app', 'ml_models', 'saved_models')
-        status_file = os.path.join(models_path, 'training_status.json')
-        
-        if os.path.exists(status_file):
-            try:
-                with open(status_file, 'r') as f:
-                    status = json.load(f)
-                    if status.get('trained', False):
-                        self.models_loaded = True
-                        print("✅ Modelos ML disponibles - Usando IA avanzada")
-                    else:
-                        print("📋 Usando reglas mejoradas")
-            except:
-                print("📋 Usando reglas mejoradas")
-        else:
-            print("💡 Modelos no encontrados - Usando reglas mejoradas")
+        """Inicializa el sistema usando el registro de modelos compartido"""
+        # El estado de entrenamiento se lee una sola vez por proceso (ver ModelRegistry)
+        self.models_loaded = model_registry.is_trained()
     
     def generate_recommendations(self, student, test_answers, top_n=5):
         """
         Genera recomendaciones MEJORADAS (ML + reglas inteligentes)
+        
+        El resultado se memoriza por vector de características, versión del
+        catálogo y versión de los modelos (ver RecommendationCache).
         """
         try:
             print(f"🎯 Generando {top_n} recomendaciones para {student.first_name}...")
             
-            # Obtener todas las carreras
-            all_careers = Career.query.all()
-            if len(all_careers) == 0:
+            # Catálogo de carreras en caché (sin consultar la base de datos)
+            catalog = career_catalog.get()
+            if len(catalog) == 0:
                 print("⚠️ No hay carreras en la base de datos")
                 return []
             
-            # USAR ML SI ESTÁ DISPONIBLE
-            if self.models_loaded:
-                try:
-                    recommendations = self._generate_ml_recommendations(
-                        student, test_answers, all_careers, top_n
-                    )
-                    if recommendations:
-                        print("🤖 Recomendaciones generadas con ML")
-                        return recommendations
-                except Exception as e:
-                    print(f"⚠️ Error en ML: {e}")
-            
-            # USAR REGLAS MEJORADAS COMO RESPALDO
-            print("📋 Usando reglas mejoradas...")
-            return self._generate_improved_rules_recommendations(
-                student, test_answers, all_careers, top_n
-            )
+            key = self._cache_key(student, test_answers, catalog, top_n)
+            rows = recommendation_cache.get_or_compute(key, lambda: _to_rows(
+                self._compute_recommendations(student, test_answers, catalog, top_n)
+            ))
+            return _from_rows(rows, student)
             
         except Exception as e:
             print(f"❌ Error en CareerMatcher: {e}")
             return []
     
-    def _generate_ml_recommendations(self, student, test_answers, careers, top_n):
-        """Genera recomendaciones usando ML"""
-        try:
-            # Intentar cargar modelos individuales
-            from app.ml_models.logistic_regression import CareerLogisticRegression
-            from app.ml_models.decision_tree import CareerDecisionTree
-            from app.ml_models.knn import CareerKNN
-            
-            models_path = os.path.join('app', 'ml_models', 'saved_models')
-            
-            # Preparar datos del estudiante
-            student_data = self._prepare_student_features(student, test_answers)
-            career_data = self._prepare_career_data(careers)
-            
-            # Cargar modelos disponibles
-            models = {}
-            
-            # Regresión Logística
+    def _cache_key(self, student, test_answers, catalog, top_n):
+        """
+        Clave de RecommendationCache para un estudiante
+        
+        La versión individual y la versión por lotes dan el mismo resultado,
+        así que comparten las entradas.
+        """
+        return recommendation_cache.make_key(
+            self._student_feature_row(student, test_answers),
+            catalog.version,
+            model_registry.version if self.models_loaded else None,
+            top_n
+        )
+    
+    def _compute_recommendations(self, student, test_answers, catalog, top_n):
+        """Calcula las recomendaciones de un estudiante (sin caché)"""
+        # USAR ML SI ESTÁ DISPONIBLE
+        if self.models_loaded:
             try:
-                logistic_model = CareerLogisticRegression(
-                    os.path.join(models_path, 'logistic_model.pkl')
+                recommendations = self._generate_ml_recommendations(
+                    student, test_answers, catalog, top_n
                 )
-                models['logistic'] = logistic_model
-            except:
-                pass
+                if recommendations:
+                    print("🤖 Recomendaciones generadas con ML")
+                    return recommendations
+            except Exception as e:
+                print(f"⚠️ Error en ML: {e}")
+        
+        # USAR REGLAS MEJORADAS COMO RESPALDO
+        print("📋 Usando reglas mejoradas...")
+        return self._generate_improved_rules_recommendations(
+            student, test_answers, catalog, top_n
+        )
+    
+    def generate_recommendations_batch(self, pairs, top_n=5):
+        """
+        Genera recomendaciones para muchos estudiantes en una sola pasada
+        
+        Las características de todos los estudiantes se apilan en una matriz
+        y cada modelo puntúa la matriz completa contra todas las carreras con
+        una sola llamada. Solo se calculan los vectores distintos que no están
+        en RecommendationCache.
+        
+        Args:
+            pairs: Lista de tuplas (student, test_answers)
+            top_n: Número de recomendaciones por estudiante
             
-            # Árbol de Decisión
+        Returns:
+            list: Una lista de Recommendation por cada par, en el mismo orden
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        
+        try:
+            catalog = career_catalog.get()
+            if len(catalog) == 0:
+                print("⚠️ No hay carreras en la base de datos")
+                return [[] for _ in pairs]
+            
+            keys = [
+                self._cache_key(student, test_answers, catalog, top_n)
+                for student, test_answers in pairs
+            ]
+            rows_by_key = {}
+            for key in dict.fromkeys(keys):
+                rows = recommendation_cache.get(key)
+                if rows is not None:
+                    rows_by_key[key] = rows
+            
+            # Un solo cálculo por vector distinto que no esté en caché
+            missing = {}
+            for i, key in enumerate(keys):
+                if key not in rows_by_key:
+                    missing.setdefault(key, i)
+            if missing:
+                computed = self._compute_recommendations_batch([pairs[i] for i in missing.values()], catalog, top_n)
+                for key, recommendations in zip(missing, computed):
+                    rows_by_key[key] = _to_rows(recommendations)
+                    recommendation_cache.put(key, rows_by_key[key])
+            
+            return [_from_rows(rows_by_key[key], student) for key, (student, _) in zip(keys, pairs)]
+            
+        except Exception as e:
+            print(f"❌ Error en CareerMatcher (lotes): {e}")
+            return [[] for _ in pairs]
+    
+    def _compute_recommendations_batch(self, pairs, catalog, top_n):
+        """Calcula las recomendaciones de varios estudiantes (sin caché)"""
+        results = [[] for _ in pairs]
+        
+        # USAR ML SI ESTÁ DISPONIBLE
+        if self.models_loaded:
             try:
-                tree_model = CareerDecisionTree(
-                    os.path.join(models_path, 'tree_model.pkl')
+                results = self._generate_ml_recommendations_batch(pairs, catalog, top_n)
+            except Exception as e:
+                print(f"⚠️ Error en ML por lotes: {e}")
+                results = [[] for _ in pairs]
+        
+        # USAR REGLAS MEJORADAS COMO RESPALDO para quienes no tengan recomendaciones
+        pending = [i for i, recommendations in enumerate(results) if not recommendations]
+        if pending:
+            careers_by_id = self._load_careers([int(career_id) for career_id in catalog.ids])
+            for i in pending:
+                student, test_answers = pairs[i]
+                results[i] = self._generate_improved_rules_recommendations(
+                    student, test_answers, catalog, top_n, careers_by_id=careers_by_id
                 )
-                models['tree'] = tree_model
-            except:
-                pass
-            
-            # KNN
+        
+        return results
+    
+    def _generate_ml_recommendations_batch(self, pairs, catalog, top_n):
+        """Genera recomendaciones ML para varios estudiantes (una llamada por modelo)"""
+        student_data = self._prepare_student_features_batch(pairs)
+        career_data = self._prepare_career_data(catalog)
+        
+        models = model_registry.get_models()
+        if not models:
+            print("⚠️ No se pudieron cargar modelos ML")
+            return [[] for _ in pairs]
+        
+        # Matrices (n_estudiantes × n_carreras) por modelo, junto con cuántas
+        # carreras aporta cada modelo (igual que en la versión individual)
+        all_predictions = {}
+        for model_name, model in models.items():
             try:
-                knn_model = CareerKNN(
-                    model_path=os.path.join(models_path, 'knn_model.pkl')
+                if model_name == 'logistic':
+                    scores = model.predict_compatibility_matrix(student_data, career_data)
+                    considered = top_n * 2
+                elif model_name == 'tree':
+                    scores = model.predict_proba_matrix(student_data, career_data)
+                    considered = min(10, top_n * 2)
+                elif model_name == 'knn':
+                    scores = model.predict_career_compatibility_matrix(student_data, career_data)
+                    considered = top_n * 2
+                else:
+                    continue
+                
+                all_predictions[model_name] = (scores, considered)
+            except Exception as e:
+                print(f"⚠️ Error con modelo {model_name}: {e}")
+                continue
+        
+        if not all_predictions:
+            return [[] for _ in pairs]
+        
+        # Combinar predicciones: cada modelo suma sus mejores carreras con el mismo peso
+        n_students, n_careers = len(pairs), len(catalog)
+        combined = np.zeros((n_students, n_careers))
+        present = np.zeros((n_students, n_careers), dtype=bool)
+        weight = 1.0 / len(all_predictions)
+        
+        for scores, considered in all_predictions.values():
+            mask = _top_k_mask(scores, considered)
+            combined += np.where(mask, scores, 0.0) * weight
+            present |= mask
+        
+        # Top N por estudiante con ordenamiento parcial
+        top_rows = _top_k_indices(np.where(present, combined, -np.inf), top_n)
+        
+        careers_by_id = self._load_careers(sorted({
+            int(catalog.ids[col]) for row in top_rows for col in row
+        }))
+        
+        results = []
+        for i, (student, test_answers) in enumerate(pairs):
+            recommendations = []
+            for rank, col in enumerate(top_rows[i], 1):
+                career = careers_by_id.get(int(catalog.ids[col]))
+                if not career:
+                    continue
+                
+                score = float(combined[i, col])
+                explanation = self._generate_ml_explanation(
+                    student, test_answers, career, score, 'ensemble'
                 )
-                models['knn'] = knn_model
-            except:
-                pass
+                
+                recommendations.append(Recommendation(
+                    student_id=student.id,
+                    career_id=career.id,
+                    score=score,
+                    rank=rank,
+                    explanation=json.dumps(explanation),
+                    model_used='ml_ensemble'
+                ))
+            
+            results.append(recommendations)
+        
+        return results
+    
+    def _generate_ml_recommendations(self, student, test_answers, catalog, top_n):
+        """Genera recomendaciones usando ML"""
+        try:
+            # Preparar datos del estudiante
+            student_data = self._prepare_student_features(student, test_answers)
+            career_data = self._prepare_career_data(catalog)
+            
+            # Modelos precargados y compartidos por el proceso (solo lectura)
+            models = model_registry.get_models()
             
             if not models:
                 print("⚠️ No se pudieron cargar modelos ML")
@@ -144,6 +278,10 @@ class CareerMatcher:
             
             for model_name, predictions in all_predictions.items():
                 weight = model_weights[model_name]
+                # Solo carreras del catálogo (KNN puede proponer IDs que ya no
+                # existen), igual que en la versión por lotes
+                predictions = [(career_id, score) for career_id, score in predictions
+                               if catalog.row(career_id) is not None]
                 for career_id, score in predictions[:top_n*2]:  # Considerar más carreras
                     if career_id in combined_scores:
                         combined_scores[career_id] += score * weight
@@ -155,9 +293,10 @@ class CareerMatcher:
             top_careers = sorted_careers[:top_n]
             
             # Convertir a objetos Recommendation
+            careers_by_id = self._load_careers([career_id for career_id, _ in top_careers])
             result = []
             for rank, (career_id, score) in enumerate(top_careers, 1):
-                career = db.session.get(Career, career_id)  # CORREGIDO: Usar db.session.get
+                career = careers_by_id.get(career_id)
                 if not career:
                     continue
                 
@@ -185,6 +324,17 @@ class CareerMatcher:
     
     def _prepare_student_features(self, student, test_answers):
         """Prepara características del estudiante para ML"""
+        return pd.DataFrame([self._student_feature_row(student, test_answers)])
+    
+    def _prepare_student_features_batch(self, pairs):
+        """Apila las características de varios estudiantes en una sola matriz (una fila por estudiante)"""
+        return pd.DataFrame([
+            self._student_feature_row(student, test_answers)
+            for student, test_answers in pairs
+        ])
+    
+    def _student_feature_row(self, student, test_answers):
+        """Vector de 16 características de un estudiante (diccionario ordenado)"""
         # Datos académicos por área (sistema boliviano)
         areas_averages = student.get_average_by_area()
         
@@ -213,27 +363,25 @@ class CareerMatcher:
             'chaside_consistency': self._calculate_chaside_consistency(test_answers)
         }
         
-        return pd.DataFrame([student_data])
+        return student_data
     
-    def _prepare_career_data(self, careers):
-        """Prepara datos de carreras"""
-        career_data = []
+    def _prepare_career_data(self, catalog):
+        """Prepara datos de carreras (DataFrame cacheado por versión del catálogo)"""
+        return catalog.to_dataframe()
+    
+    def _load_careers(self, career_ids):
+        """Carga en una sola consulta las carreras (con su facultad) a mostrar"""
+        if not career_ids:
+            return {}
         
-        for career in careers:
-            data = {
-                'id': career.id,
-                'faculty_id': career.faculty_id,
-                'area_c': career.area_c or 0.0,
-                'area_h': career.area_h or 0.0,
-                'area_a': career.area_a or 0.0,
-                'area_s': career.area_s or 0.0,
-                'area_i': career.area_i or 0.0,
-                'area_d': career.area_d or 0.0,
-                'area_e': career.area_e or 0.0
-            }
-            career_data.append(data)
+        # Los modelos pueden devolver enteros de NumPy: convertir antes de consultar
+        career_ids = [int(career_id) for career_id in career_ids]
+        
+        careers = Career.query.options(
+            joinedload(Career.faculty)
+        ).filter(Career.id.in_(career_ids)).all()
         
-        return pd.DataFrame(career_data)
+        return {career.id: career for career in careers}
     
     def _get_dominant_area(self, test_answers):
         """Identifica el área CHASIDE dominante"""
@@ -268,7 +416,7 @@ class CareerMatcher:
         max_variance = np.var([14, 0, 0, 0, 0, 0, 0])
         return 1 - (variance / max_variance) if max_variance > 0 else 1
     
-    def _generate_improved_rules_recommendations(self, student, test_answers, careers, top_n):
+    def _generate_improved_rules_recommendations(self, student, test_answers, catalog, top_n, careers_by_id=None):
         """Genera recomendaciones con reglas MEJORADAS"""
         try:
             # Extraer puntajes CHASIDE
@@ -292,13 +440,13 @@ class CareerMatcher:
             # Calcular compatibilidad con cada carrera
             career_scores = []
             
-            for career in careers:
+            for row, career_id in enumerate(catalog.ids):
                 # Compatibilidad CHASIDE
                 chaside_compatibility = 0.0
                 total_weight = 0.0
                 
                 for area, score in top_areas:
-                    area_weight = getattr(career, f'area_{area}', 0.0) or 0.0
+                    area_weight = float(catalog.area_weights(area)[row])
                     if area_weight > 0:
                         chaside_compatibility += score * area_weight
                         total_weight += area_weight
@@ -309,7 +457,7 @@ class CareerMatcher:
                 
                 # 🇧🇴 BONUS ACADÉMICO BOLIVIANO
                 academic_bonus = self._calculate_academic_bonus(
-                    overall_academic, career, top_areas[0][0] if top_areas else 'c'
+                    overall_academic, catalog.names[row], top_areas[0][0] if top_areas else 'c'
                 )
                 
                 # BONUS POR CONSISTENCIA CHASIDE
@@ -321,15 +469,21 @@ class CareerMatcher:
                     1.0
                 )
                 
-                career_scores.append((career, final_score))
+                career_scores.append((int(career_id), final_score))
             
             # Ordenar por puntuación y tomar top N
             career_scores.sort(key=lambda x: x[1], reverse=True)
             top_careers = career_scores[:top_n]
             
             # Crear objetos Recommendation
+            if careers_by_id is None:
+                careers_by_id = self._load_careers([career_id for career_id, _ in top_careers])
             result = []
-            for rank, (career, score) in enumerate(top_careers, 1):
+            for rank, (career_id, score) in enumerate(top_careers, 1):
+                career = careers_by_id.get(career_id)
+                if not career:
+                    continue
+                
                 explanation = self._generate_rules_explanation(
                     student, test_answers, career, score, overall_academic
                 )
@@ -351,7 +505,7 @@ class CareerMatcher:
             print(f"Error en reglas: {e}")
             return []
     
-    def _calculate_academic_bonus(self, overall_academic, career, dominant_area):
+    def _calculate_academic_bonus(self, overall_academic, career_name, dominant_area):
         """Calcula bonus académico según sistema boliviano"""
         # Bonus base por rendimiento general
         if overall_academic >= 85:
@@ -365,7 +519,7 @@ class CareerMatcher:
         
         # Bonus específico por área
         area_bonus = 0.0
-        career_name = career.name.lower()
+        career_name = career_name.lower()
         
         if dominant_area == 'i' and any(word in career_name for word in ['ingenieria', 'sistemas', 'industrial']):
             area_bonus = 0.05
@@ -470,4 +624,66 @@ class CareerMatcher:
             
         except Exception as e:
             print(f"Error en explicación ML: {e}")
-            return {"error": "No se pudo generar explicación ML"}
\ No newline at end of file
+            return {"error": "No se pudo generar explicación ML"}
+
+
+
+def _to_rows(recommendations):
+    """Recomendaciones como diccionarios sin estudiante (valor de RecommendationCache)"""
+    return [
+        {
+            'career_id': int(recommendation.career_id),
+            'score': float(recommendation.score),
+            'rank': int(recommendation.rank),
+            'explanation': recommendation.explanation,
+            'model_used': recommendation.model_used
+        }
+        for recommendation in recommendations
+    ]
+
+
+def _from_rows(rows, student):
+    """Objetos Recommendation nuevos (sin guardar) para el estudiante"""
+    return [Recommendation(student_id=student.id, **row) for row in rows]
+
+
+def _top_k_indices(scores, k):
+    """
+    Índices de las k mejores puntuaciones finitas de cada fila, de mayor a menor
+    
+    Usa np.partition (O(n)) para hallar el valor de corte de cada fila y solo
+    ordena los candidatos; los empates se resuelven por la columna más baja.
+    
+    Returns:
+        list: Una lista de índices de columna por fila
+    """
+    ranked = np.where(np.isnan(scores), -np.inf, scores)
+    n_rows, n_cols = ranked.shape
+    k = min(k, n_cols)
+    if k <= 0:
+        return [[] for _ in range(n_rows)]
+    
+    # Valor de corte: k-ésima mayor puntuación de cada fila
+    kth = -np.partition(-ranked, k - 1, axis=1)[:, k - 1]
+    
+    result = []
+    for row in range(n_rows):
+        values = ranked[row]
+        candidates = np.flatnonzero((values >= kth[row]) & np.isfinite(values))
+        order = np.argsort(-values[candidates], kind='stable')[:k]
+        result.append([int(col) for col in candidates[order]])
+    
+    return result
+
+
+def _top_k_mask(scores, k):
+    """
+    Marca las k mejores puntuaciones (no NaN) de cada fila
+    
+    Returns:
+        numpy.ndarray: Máscara booleana con la forma de scores
+    """
+    mask = np.zeros(scores.shape, dtype=bool)
+    for row, cols in enumerate(_top_k_indices(scores, k)):
+        mask[row, cols] = True
+    return mask
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class ChartCache:
+    """
+    Caché de imágenes de gráficos direccionada por contenido.
+
+    La clave es el hash SHA-256 de los datos de entrada del gráfico, así que
+    una misma entrada siempre produce la misma clave y nunca hay que invalidar.
+
+    - Nivel 1: LRU en memoria (max_entries imágenes)
+    - Nivel 2 (opcional): archivos en disk_dir, con tamaño total limitado a
+      disk_max_bytes; se eliminan primero los usados hace más tiempo
+    """
+
+    def __init__(self, max_entries=256, disk_dir=None, disk_max_bytes=50 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # Se calcula al primer uso del disco
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        """Configura la caché desde la app (CHART_CACHE_SIZE, CHART_CACHE_DIR, CHART_CACHE_DISK_MAX_BYTES)"""
+        self.max_entries = app.config.get('CHART_CACHE_SIZE', self.max_entries)
+        self.disk_dir = app.config.get('CHART_CACHE_DIR') or None
+        self.disk_max_bytes = app.config.get('CHART_CACHE_DISK_MAX_BYTES', self.disk_max_bytes)
+        self._disk_bytes = None
+        self.clear_memory()
+
+    @staticmethod
+    def make_key(kind, payload):
+        """
+        Clave de caché para un gráfico
+
+        Args:
+            kind: Tipo de gráfico ('radar', 'bar', ...)
+            payload: Datos de entrada serializables en JSON
+
+        Returns:
+            str: Hash SHA-256 en hexadecimal
+        """
+        raw = json.dumps([kind, payload], sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lectura y escritura
+    # ------------------------------------------------------------------
+
+    def get(self, key):
+        """Devuelve la imagen guardada (bytes) o None"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._disk_get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._memory_put(key, data)
+        return data
+
+    def put(self, key, data):
+        """Guarda una imagen en memoria y, si está configurado, en disco"""
+        with self._lock:
+            self._memory_put(key, data)
+        self._disk_put(key, data)
+
+    def get_or_create(self, key, factory):
+        """
+        Devuelve la imagen de la caché o la genera con factory() y la guarda
+
+        Args:
+            key: Clave de make_key
+            factory: Función sin argumentos que devuelve los bytes de la imagen
+        """
+        data = self.get(key)
+        if data is None:
+            data = factory()
+            self.put(key, data)
+        return data
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def _memory_put(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Nivel en disco
+    # ------------------------------------------------------------------
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f'{key}.bin')
+
+    def _disk_get(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # Marcar como usado recientemente
+            return data
+        except OSError:
+            return None
+
+    def _disk_put(self, key, data):
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            # Si la clave ya estaba en disco, solo cuenta la diferencia de tamaño
+            try:
+                replaced_size = os.path.getsize(path)
+            except OSError:
+                replaced_size = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el gráfico en disco: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._disk_usage()[0]
+            else:
+                self._disk_bytes += len(data) - replaced_size
+            over_limit = self._disk_bytes > self.disk_max_bytes
+        if over_limit:
+            self._evict_disk()
+
+    def _disk_usage(self):
+        """(bytes totales, [(último uso, tamaño, ruta), ...]) de los archivos en disco"""
+        entries = []
+        total = 0
+        try:
+            for entry in os.scandir(self.disk_dir):
+                if not entry.name.endswith('.bin'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        except OSError:
+            pass
+        return total, entries
+
+    def _evict_disk(self):
+        """Elimina los archivos usados hace más tiempo hasta bajar al 90% del límite"""
+        total, entries = self._disk_usage()
+        target = int(self.disk_max_bytes * 0.9)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        with self._lock:
+            self._disk_bytes = total
+
+
+# Instancia única por proceso
+chart_cache = ChartCache()
@@ -1,13 +1,48 @@
-import matplotlib.pyplot as plt
-import numpy as np
 import base64
+from collections import namedtuple
 from io import BytesIO
 
+from app.utils.chart_cache import chart_cache
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+# Orden de las áreas en el gráfico de radar
+RADAR_AREAS = ('C', 'H', 'A', 'S', 'I', 'D', 'E')
+
+# Backends disponibles: 'matplotlib' (PNG) o 'svg' (sin matplotlib)
+CHART_BACKENDS = ('matplotlib', 'svg')
+
+MIME_TYPES = {'matplotlib': 'image/png', 'svg': 'image/svg+xml'}
+
+class ChartSpec(namedtuple('ChartSpec', ['key', 'mimetype', 'render', 'args'])):
+    """
+    Descripción de un gráfico sin dibujarlo: clave de contenido, tipo MIME y
+    función de módulo + argumentos para dibujarlo (se puede enviar a otro proceso)
+    """
+    
+    __slots__ = ()
+    
+    def draw(self):
+        """Dibuja el gráfico y devuelve los bytes de la imagen"""
+        return self.render(*self.args)
+
 class ChartGenerator:
     """
     Clase para generar gráficos y visualizaciones para los resultados del test
     """
     
+    backend = 'matplotlib'
+    
+    @classmethod
+    def init_app(cls, app):
+        """Selecciona el backend de gráficos (CHART_BACKEND; 'matplotlib' si no es válido)"""
+        backend = app.config.get('CHART_BACKEND', cls.backend)
+        if backend not in CHART_BACKENDS:
+            print(f"⚠️ CHART_BACKEND inválido: {backend} (opciones: {', '.join(CHART_BACKENDS)}); se usa 'matplotlib'")
+            backend = 'matplotlib'
+        cls.backend = backend
+    
     @staticmethod
     def generate_radar_chart(scores, max_value=10):
         """
@@ -20,6 +55,52 @@ class ChartGenerator:
         Returns:
             str: Imagen en formato base64
         """
+        image, mimetype = ChartGenerator.get_radar_image(scores, max_value)
+        return ChartGenerator.to_data_uri(image, mimetype)
+    
+    @staticmethod
+    def get_radar_image(scores, max_value=10):
+        """
+        Gráfico de radar, desde la caché si ya se generó con los mismos datos
+        
+        Returns:
+            tuple: (bytes de la imagen, tipo MIME)
+        """
+        return ChartGenerator.get_image(ChartGenerator.radar_spec(scores, max_value))
+    
+    @staticmethod
+    def radar_spec(scores, max_value=10):
+        """
+        Describe el gráfico de radar sin dibujarlo (la clave sirve como ETag)
+        
+        Returns:
+            ChartSpec: (clave de contenido, tipo MIME, función que dibuja, argumentos)
+        """
+        backend = ChartGenerator.backend
+        values = [scores.get(area, 0) for area in RADAR_AREAS]
+        key = chart_cache.make_key(f'radar:{backend}', {'values': values, 'max_value': max_value})
+        
+        if backend == 'svg':
+            from app.utils.svg_charts import render_radar_svg as render
+        else:
+            render = ChartGenerator.render_radar_png
+        
+        return ChartSpec(key, MIME_TYPES[backend], render, (values, max_value))
+    
+    @staticmethod
+    def render_radar_png(values, max_value=10):
+        """
+        Dibuja el gráfico de radar con matplotlib
+        
+        Args:
+            values: Puntajes en el orden C, H, A, S, I, D, E
+            max_value: Valor máximo para normalizar
+            
+        Returns:
+            bytes: Imagen PNG
+        """
+        import matplotlib.pyplot as plt
+        
         # Configurar matplotlib
         plt.figure(figsize=(8, 8))
         
@@ -27,17 +108,6 @@ class ChartGenerator:
         categories = ['Administrativas (C)', 'Humanísticas (H)', 'Artísticas (A)', 
                     'Salud (S)', 'Ingenierías (I)', 'Defensa (D)', 'Científicas (E)']
         
-        # Convertir puntuaciones a una lista en el mismo orden
-        values = [
-            scores.get('C', 0),
-            scores.get('H', 0),
-            scores.get('A', 0),
-            scores.get('S', 0),
-            scores.get('I', 0),
-            scores.get('D', 0),
-            scores.get('E', 0)
-        ]
-        
         # Número de variables
         N = len(categories)
         
@@ -70,17 +140,7 @@ class ChartGenerator:
         # Título
         plt.title('Perfil de Intereses y Aptitudes', size=15, y=1.1)
         
-        # Guardar gráfico en memoria
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png', bbox_inches='tight')
-        buffer.seek(0)
-        
-        # Convertir imagen a base64
-        image_png = buffer.getvalue()
-        buffer.close()
-        
-        encoded = base64.b64encode(image_png).decode('utf-8')
-        return f"data:image/png;base64,{encoded}"
+        return ChartGenerator._save_png()
     
     @staticmethod
     def generate_bar_chart(career_scores, top_n=5):
@@ -94,8 +154,65 @@ class ChartGenerator:
         Returns:
             str: Imagen en formato base64
         """
+        image, mimetype = ChartGenerator.get_bar_image(career_scores, top_n)
+        return ChartGenerator.to_data_uri(image, mimetype)
+    
+    @staticmethod
+    def get_bar_image(career_scores, top_n=5):
+        """
+        Gráfico de barras, desde la caché si ya se generó con los mismos datos
+        
+        Returns:
+            tuple: (bytes de la imagen, tipo MIME)
+        """
+        return ChartGenerator.get_image(ChartGenerator.bar_spec(career_scores, top_n))
+    
+    @staticmethod
+    def bar_spec(career_scores, top_n=5):
+        """
+        Describe el gráfico de barras sin dibujarlo (la clave sirve como ETag)
+        
+        Returns:
+            ChartSpec: (clave de contenido, tipo MIME, función que dibuja, argumentos)
+        """
+        backend = ChartGenerator.backend
+        
         # Filtrar top N carreras
-        top_careers = sorted(career_scores, key=lambda x: x[1], reverse=True)[:top_n]
+        top_careers = [
+            (name, float(score))
+            for name, score in sorted(career_scores, key=lambda x: x[1], reverse=True)[:top_n]
+        ]
+        key = chart_cache.make_key(f'bar:{backend}', top_careers)
+        
+        if backend == 'svg':
+            from app.utils.svg_charts import render_bar_svg as render
+        else:
+            render = ChartGenerator.render_bar_png
+        
+        return ChartSpec(key, MIME_TYPES[backend], render, (top_careers,))
+    
+    @staticmethod
+    def get_image(spec):
+        """
+        Devuelve la imagen de un ChartSpec, desde la caché o dibujándola
+        
+        Returns:
+            tuple: (bytes de la imagen, tipo MIME)
+        """
+        return chart_cache.get_or_create(spec.key, spec.draw), spec.mimetype
+    
+    @staticmethod
+    def render_bar_png(top_careers):
+        """
+        Dibuja el gráfico de barras con matplotlib
+        
+        Args:
+            top_careers: Lista ordenada de tuplas (nombre_carrera, puntuación 0-1)
+            
+        Returns:
+            bytes: Imagen PNG
+        """
+        import matplotlib.pyplot as plt
         
         # Extraer nombres y puntuaciones
         names = [career[0] for career in top_careers]
@@ -124,14 +241,23 @@ class ChartGenerator:
         # Ajustar límites
         plt.xlim(0, 105)  # Dar espacio para las etiquetas
         
-        # Guardar gráfico en memoria
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png', bbox_inches='tight')
-        buffer.seek(0)
-        
-        # Convertir imagen a base64
-        image_png = buffer.getvalue()
-        buffer.close()
+        return ChartGenerator._save_png()
+    
+    @staticmethod
+    def _save_png():
+        """Guarda la figura actual de matplotlib como PNG y la cierra"""
+        import matplotlib.pyplot as plt
         
-        encoded = base64.b64encode(image_png).decode('utf-8')
-        return f"data:image/png;base64,{encoded}"
\ No newline at end of file
+        buffer = BytesIO()
+        try:
+            plt.savefig(buffer, format='png', bbox_inches='tight')
+            return buffer.getvalue()
+        finally:
+            buffer.close()
+            plt.close()  # Liberar la figura (si no, se acumulan en el proceso)
+    
+    @staticmethod
+    def to_data_uri(image, mimetype='image/png'):
+        """Convierte una imagen a formato base64 para usar en <img src>"""
+        encoded = base64.b64encode(image).decode('utf-8')
+        return f"data:{mimetype};base64,{encoded}"
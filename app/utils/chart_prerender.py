@@ -0,0 +1,151 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.utils.chart_cache import chart_cache
+
+
+def _init_worker():
+    """Importa matplotlib al iniciar el proceso, no con el primer gráfico"""
+    import matplotlib.pyplot  # noqa: F401
+
+
+def _draw_chart(render, args):
+    """Dibuja un gráfico dentro de un proceso del pool"""
+    return render(*args)
+
+
+class ChartPrerenderer:
+    """
+    Dibuja los gráficos de resultados en segundo plano, justo después de
+    guardar el test, para que la primera visita a /test/results los encuentre
+    listos en chart_cache.
+
+    - matplotlib usa estado global, por eso se dibuja en un pool de procesos
+      (spawn) y no en hilos del servidor web.
+    - Cada proceso del pool importa el módulo principal como __mp_main__
+      (también con forkserver). Los puntos de entrada (run.py, app.py) no
+      deben crear la aplicación al importarse, solo bajo
+      `if __name__ == '__main__'`; si no, cada proceso repetiría create_app
+      (blueprints, base de datos, precarga de modelos) para dibujar un gráfico.
+    - Cada imagen se guarda bajo su clave de contenido, la misma que aparece
+      junto al TestAnswer.id en la URL del gráfico; si se pide mientras todavía
+      se está dibujando, la petición espera ese resultado en lugar de dibujarla
+      de nuevo.
+    - Con el backend 'svg' no se usa: dibujar en línea cuesta menos que
+      enviar el trabajo a otro proceso.
+    """
+
+    def __init__(self, workers=1, max_pending=64, wait_timeout=10.0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.wait_timeout = wait_timeout
+        self._executor = None
+        self._pending = {}  # clave de contenido -> Future
+        self._lock = threading.RLock()
+        atexit.register(self.shutdown)
+
+    def init_app(self, app):
+        """Configura el pool desde la app (CHART_PRERENDER_WORKERS, CHART_PRERENDER_MAX_PENDING)"""
+        self.workers = app.config.get('CHART_PRERENDER_WORKERS', self.workers)
+        self.max_pending = app.config.get('CHART_PRERENDER_MAX_PENDING', self.max_pending)
+        self.wait_timeout = app.config.get('CHART_PRERENDER_WAIT_TIMEOUT', self.wait_timeout)
+
+    @property
+    def enabled(self):
+        from app.utils.chart_generator import ChartGenerator
+        return self.workers > 0 and ChartGenerator.backend != 'svg'
+
+    # ------------------------------------------------------------------
+    # Encolar y esperar
+    # ------------------------------------------------------------------
+
+    def submit(self, specs):
+        """
+        Encola el dibujo de los gráficos de un test
+
+        Args:
+            specs: Lista de ChartSpec
+
+        Returns:
+            int: Gráficos encolados (los que ya están en caché se omiten)
+        """
+        if not self.enabled:
+            return 0
+
+        queued = 0
+        with self._lock:
+            for spec in specs:
+                if spec.key in self._pending or chart_cache.get(spec.key) is not None:
+                    continue
+                if len(self._pending) >= self.max_pending:
+                    # Pool saturado: el gráfico se dibujará al pedirlo
+                    break
+                future = self._get_executor().submit(_draw_chart, spec.render, spec.args)
+                self._pending[spec.key] = future
+                future.add_done_callback(lambda f, key=spec.key: self._finished(key, f))
+                queued += 1
+        return queued
+
+    def wait(self, key, timeout=None):
+        """
+        Espera un gráfico que se está dibujando en segundo plano
+
+        Returns:
+            bytes: La imagen, o None si no estaba en cola o no terminó a tiempo
+        """
+        with self._lock:
+            future = self._pending.get(key)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=self.wait_timeout if timeout is None else timeout)
+        except Exception:
+            return None
+
+    def _finished(self, key, future):
+        try:
+            data = future.result()
+        except BrokenProcessPool as e:
+            print(f"⚠️ Pool de gráficos caído, se reiniciará: {e}")
+            self._reset_executor()
+            data = None
+        except Exception as e:
+            print(f"⚠️ Error dibujando gráfico en segundo plano: {e}")
+            data = None
+
+        if data is not None:
+            chart_cache.put(key, data)
+        with self._lock:
+            self._pending.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Pool de procesos
+    # ------------------------------------------------------------------
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Detiene el pool (al terminar el proceso)"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Instancia única por proceso
+chart_prerenderer = ChartPrerenderer()
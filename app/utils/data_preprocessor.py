@@ -1,7 +1,11 @@
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler
 import json
+from app.utils.answer_bits import answers_to_int, bits_to_int, unpack_answer_rows
+from app.utils.lazy import lazy_import
+from app.utils.test_chaside import AREA_CODES, INTEREST_MASKS, APTITUDE_MASKS, calculate_scores_bulk
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+StandardScaler = lazy_import('sklearn.preprocessing', 'StandardScaler')
 
 class DataPreprocessor:
     """
@@ -14,10 +18,11 @@ class DataPreprocessor:
     
     def process_test_answers(self, answers_json):
         """
-        Procesa las respuestas del test CHASIDE en formato JSON
+        Procesa las respuestas del test CHASIDE
         
         Args:
-            answers_json: String con las respuestas en formato JSON
+            answers_json: String con las respuestas en formato JSON, o los
+                          bytes de TestAnswer.answers_bits
             
         Returns:
             dict: Diccionario con puntajes por área
@@ -28,53 +33,29 @@ class DataPreprocessor:
                 'I': 0, 'D': 0, 'E': 0
             }
         
-        # Parsear JSON
-        answers = json.loads(answers_json)
-        
-        # Mapeo de preguntas a áreas para intereses
-        interest_map = {
-            '1': 'C', '9': 'H', '3': 'A', '8': 'S', '6': 'I', '5': 'D', '17': 'E',
-            '12': 'C', '25': 'H', '11': 'A', '16': 'S', '19': 'I', '14': 'D', '32': 'E',
-            '20': 'C', '34': 'H', '21': 'A', '23': 'S', '27': 'I', '24': 'D', '35': 'E',
-            '53': 'C', '41': 'H', '28': 'A', '33': 'S', '38': 'I', '31': 'D', '42': 'E',
-            '64': 'C', '56': 'H', '36': 'A', '44': 'S', '47': 'I', '37': 'D', '49': 'E',
-            '71': 'C', '67': 'H', '45': 'A', '52': 'S', '54': 'I', '48': 'D', '61': 'E',
-            '78': 'C', '74': 'H', '50': 'A', '62': 'S', '60': 'I', '58': 'D', '68': 'E',
-            '85': 'C', '80': 'H', '57': 'A', '70': 'S', '75': 'I', '65': 'D', '77': 'E',
-            '91': 'C', '89': 'H', '81': 'A', '87': 'S', '83': 'I', '73': 'D', '88': 'E',
-            '98': 'C', '95': 'H', '96': 'A', '92': 'S', '97': 'I', '84': 'D', '93': 'E'
-        }
-        
-        # Mapeo de preguntas a áreas para aptitudes
-        aptitude_map = {
-            '2': 'C', '30': 'H', '22': 'A', '4': 'S', '10': 'I', '13': 'D', '7': 'E',
-            '15': 'C', '63': 'H', '39': 'A', '29': 'S', '26': 'I', '18': 'D', '55': 'E',
-            '46': 'C', '72': 'H', '76': 'A', '40': 'S', '59': 'I', '43': 'D', '79': 'E',
-            '51': 'C', '86': 'H', '82': 'A', '69': 'S', '90': 'I', '66': 'D', '94': 'E'
-        }
+        if isinstance(answers_json, (bytes, bytearray, memoryview)):
+            answers = bits_to_int(bytes(answers_json))
+        else:
+            answers = answers_to_int(json.loads(answers_json))
         
-        # Inicializar contadores
-        area_counts = {
-            'C': 0, 'H': 0, 'A': 0, 'S': 0,
-            'I': 0, 'D': 0, 'E': 0
+        # Contar respuestas "Sí" por área (intereses + aptitudes)
+        return {
+            area: (answers & (INTEREST_MASKS[area] | APTITUDE_MASKS[area])).bit_count()
+            for area in AREA_CODES
         }
+    
+    def process_test_answers_bulk(self, answers_bits_rows):
+        """
+        Procesa muchas respuestas codificadas en bits de una sola vez
         
-        # Contar respuestas positivas por área
-        for question_id, is_yes in answers.items():
-            if not is_yes:  # Solo considerar respuestas "Sí"
-                continue
-                
-            # Verificar si es pregunta de interés
-            if question_id in interest_map:
-                area = interest_map[question_id]
-                area_counts[area] += 1
+        Args:
+            answers_bits_rows: Lista de bytes (TestAnswer.answers_bits)
             
-            # Verificar si es pregunta de aptitud
-            elif question_id in aptitude_map:
-                area = aptitude_map[question_id]
-                area_counts[area] += 1
-        
-        return area_counts
+        Returns:
+            pandas.DataFrame: Una fila por test con columnas score_c ... score_e
+        """
+        totals = calculate_scores_bulk(unpack_answer_rows(answers_bits_rows))['total']
+        return pd.DataFrame(totals, columns=[f'score_{area.lower()}' for area in AREA_CODES])
     
     def normalize_academic_scores(self, scores):
         """
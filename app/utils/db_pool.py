@@ -0,0 +1,172 @@
+"""
+Pool de conexiones de SQLAlchemy: opciones desde la configuración y métricas.
+
+- engine_options(config): SQLALCHEMY_ENGINE_OPTIONS a partir de DB_POOL_* (en
+  SQLite solo pre-ping y recycle; el tamaño del pool no aplica)
+- InstrumentedQueuePool: QueuePool que mide cuánto espera cada petición por
+  una conexión (incluye las que agotan pool_timeout)
+- pool_metrics: contadores del proceso (conexiones en uso, pico, esperas,
+  overflow), alimentados por eventos del pool y expuestos en /admin/metrics
+"""
+
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool, QueuePool
+
+
+def engine_options(config):
+    """
+    Opciones del engine según DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE y DB_POOL_PRE_PING
+
+    Args:
+        config: Configuración de la app (dict)
+
+    Returns:
+        dict: Valor para SQLALCHEMY_ENGINE_OPTIONS
+    """
+    options = {
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+    }
+    if str(config.get('SQLALCHEMY_DATABASE_URI', '')).startswith('sqlite'):
+        return options
+
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+    })
+    return options
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que registra el tiempo de espera de cada checkout"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start, overflow=self.overflow())
+        return connection
+
+
+class PoolMetrics:
+    """Métricas del pool de conexiones de este proceso"""
+
+    def __init__(self, samples=1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=samples)  # Últimas esperas (segundos)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._waits.clear()
+            self.checkouts = 0
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.connections_created = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.peak_overflow = 0
+
+    def record_wait(self, seconds, timed_out=False, overflow=0):
+        """Registra la espera de un checkout (InstrumentedQueuePool)"""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self._waits.append(seconds)
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def _connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connections_created += 1
+
+    def _invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool=None):
+        """
+        Estado actual de las métricas
+
+        Args:
+            pool: Pool del engine, para agregar tamaño y overflow actuales
+
+        Returns:
+            dict: Valores listos para serializar en JSON
+        """
+        with self._lock:
+            waits = sorted(self._waits)
+            data = {
+                'checkouts': self.checkouts,
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'peak_overflow': self.peak_overflow,
+                'connections_created': self.connections_created,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'wait_ms': {
+                    'samples': len(waits),
+                    'avg': round(self.wait_total / len(waits) * 1000, 3) if waits else 0.0,
+                    'p50': round(_percentile(waits, 0.50) * 1000, 3),
+                    'p95': round(_percentile(waits, 0.95) * 1000, 3),
+                    'p99': round(_percentile(waits, 0.99) * 1000, 3),
+                    'max': round(self.wait_max * 1000, 3),
+                },
+            }
+
+        if pool is not None:
+            data['pool'] = {'class': type(pool).__name__, 'status': pool.status()}
+            if isinstance(pool, QueuePool):
+                size, max_overflow = pool.size(), pool._max_overflow
+                capacity = size + max_overflow if max_overflow >= 0 else None
+                data['pool'].update({
+                    'size': size,
+                    'max_overflow': max_overflow,
+                    'checked_out': pool.checkedout(),
+                    'checked_in': pool.checkedin(),
+                    'overflow': pool.overflow(),
+                    'timeout': pool.timeout(),
+                    # Fracción del máximo de conexiones (size + max_overflow) en uso
+                    'utilization': round(pool.checkedout() / capacity, 3) if capacity else None,
+                })
+        return data
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+# Instancia única por proceso
+pool_metrics = PoolMetrics()
+
+# Eventos de todos los pools del proceso (la app usa un solo engine)
+event.listen(Pool, 'checkout', pool_metrics._checkout)
+event.listen(Pool, 'checkin', pool_metrics._checkin)
+event.listen(Pool, 'connect', pool_metrics._connect)
+event.listen(Pool, 'invalidate', pool_metrics._invalidate)
@@ -1,10 +1,12 @@
 import hashlib
-import numpy as np
 import os
 import random
 import string
 from datetime import datetime, timedelta
 import json
+from app.utils.lazy import lazy_import
+
+np = lazy_import('numpy')
 
 def generate_password_hash(password):
     """
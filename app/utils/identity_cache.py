@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import has_request_context, session
+from flask_login import current_user
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import db
+from app.models.user import User
+
+# Clave de sesión con el estudiante del usuario: {'user_id': ..., 'student_id': ...}
+SESSION_KEY = 'identity'
+
+
+class IdentityCache:
+    """
+    Caché del usuario autenticado y su perfil de estudiante.
+
+    - Por petición: Flask-Login ya guarda current_user en g, y el estudiante
+      viene cargado junto con el usuario (User.student), así que las vistas
+      no vuelven a consultar la base de datos.
+    - Por proceso: copias desconectadas (detached) de User + Student durante
+      ttl segundos. En cada petición se asocian a la sesión con
+      merge(load=False), sin ejecutar SQL.
+    - En un fallo de caché, usuario y estudiante se cargan con una sola
+      consulta (JOIN).
+
+    Los cambios de perfil deben llamar a invalidate(); en otros procesos la
+    copia vence sola al cumplirse ttl.
+    """
+
+    def __init__(self, ttl=30, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user_id -> (vence, User desconectado)
+
+    def init_app(self, app):
+        """Configura la caché desde la app (IDENTITY_CACHE_TTL, IDENTITY_CACHE_SIZE)"""
+        self.ttl = app.config.get('IDENTITY_CACHE_TTL', self.ttl)
+        self.max_entries = app.config.get('IDENTITY_CACHE_SIZE', self.max_entries)
+        self.clear()
+
+    def load_user(self, user_id):
+        """
+        Usuario con su estudiante ya cargado, asociado a la sesión actual
+
+        Returns:
+            User o None si no existe
+        """
+        template = self._get(user_id)
+        if template is not None:
+            return db.session.merge(template, load=False)
+
+        user = db.session.scalars(
+            db.select(User).options(joinedload(User.student)).where(User.id == user_id)
+        ).first()
+        if user is not None and self.ttl:
+            self._put(user_id, _detached_user(user))
+        return user
+
+    def invalidate(self, user_id):
+        """Descarta la copia de un usuario (por ejemplo, al editar su perfil)"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, user_id):
+        if not self.ttl:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, template = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return template
+
+    def _put(self, user_id, template):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, template)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _detached_copy(instance, **relationships):
+    """Copia desconectada de una instancia con todas sus columnas cargadas"""
+    mapper = db.inspect(type(instance))
+    copy = mapper.class_manager.new_instance()
+    for column in mapper.column_attrs:
+        set_committed_value(copy, column.key, getattr(instance, column.key))
+    make_transient_to_detached(copy)
+    for key, value in relationships.items():
+        set_committed_value(copy, key, value)
+    return copy
+
+
+def _detached_user(user):
+    student = _detached_copy(user.student) if user.student is not None else None
+    copy = _detached_copy(user, student=student)
+    if student is not None:
+        set_committed_value(student, 'user', copy)
+    return copy
+
+
+# Instancia única por proceso
+identity_cache = IdentityCache()
+
+
+def get_current_student():
+    """
+    Perfil de estudiante del usuario actual (None si no tiene), sin consultas
+    adicionales: se cargó junto con current_user
+    """
+    if not current_user.is_authenticated:
+        return None
+    student = current_user.student
+    if student is not None and has_request_context():
+        remember_student_id(current_user.id, student.id)
+    return student
+
+
+def get_current_student_id():
+    """ID del estudiante del usuario actual, desde la sesión si ya se conoce"""
+    if not current_user.is_authenticated:
+        return None
+    identity = session.get(SESSION_KEY)
+    if identity and identity.get('user_id') == current_user.get_id():
+        return identity.get('student_id')
+    student = get_current_student()
+    return student.id if student is not None else None
+
+
+def remember_student_id(user_id, student_id):
+    """Guarda en la sesión el estudiante del usuario (se comprueba contra el usuario)"""
+    identity = {'user_id': str(user_id), 'student_id': student_id}
+    if session.get(SESSION_KEY) != identity:
+        session[SESSION_KEY] = identity
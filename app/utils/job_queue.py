@@ -0,0 +1,213 @@
+"""
+Cola de trabajos de recomendaciones en la base de datos (modo asíncrono).
+
+Con RECOMMENDATION_MODE = 'async', /test/process-results guarda el test,
+encola un RecommendationJob y muestra una página de estado que consulta
+/test/jobs/<id>/status hasta que el trabajo termina. Los trabajos los procesa
+`flask worker` (uno o varios procesos, ver app/commands.py).
+
+- claim(): SELECT ... FOR UPDATE SKIP LOCKED en PostgreSQL (cada proceso
+  toma un trabajo distinto sin esperar a los demás) y luego un UPDATE
+  condicional (WHERE status = <leído>), que es lo que garantiza en SQLite,
+  sin bloqueos por fila, que un trabajo no lo reclamen dos procesos.
+- Los trabajos en 'running' por más de JOB_STALE_AFTER segundos (proceso
+  caído) vuelven a reclamarse; tras JOB_MAX_ATTEMPTS intentos quedan en 'failed'.
+- Un test nuevo del mismo estudiante cancela sus trabajos pendientes.
+"""
+
+import os
+import socket
+import traceback
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app import db
+from app.models.recommendation_job import RecommendationJob
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# Estados en los que el trabajo aún no terminó (la página de estado sigue consultando)
+ACTIVE_STATUSES = (PENDING, RUNNING)
+
+
+def is_async_enabled():
+    """Indica si las recomendaciones se generan fuera de la petición"""
+    return current_app.config.get('RECOMMENDATION_MODE', 'sync') == 'async'
+
+
+def make_worker_id(index=0):
+    """Identificador del proceso de trabajo (servidor, pid e índice)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"[:64]
+
+
+def enqueue(student_id, test_answer_id):
+    """
+    Encola un trabajo para el test del estudiante (sin commit)
+
+    Cancela los trabajos pendientes anteriores del mismo estudiante.
+
+    Returns:
+        RecommendationJob: Trabajo creado
+    """
+    db.session.execute(
+        db.update(RecommendationJob)
+        .where(RecommendationJob.student_id == student_id, RecommendationJob.status == PENDING)
+        .values(status=CANCELLED, finished_at=datetime.utcnow()),
+        execution_options={'synchronize_session': False}
+    )
+    job = RecommendationJob(student_id=student_id, test_answer_id=test_answer_id, status=PENDING)
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+
+def get_latest_job(student_id, statuses=None):
+    """
+    Trabajo más reciente del estudiante, o None
+
+    Args:
+        student_id: Id del estudiante
+        statuses: Estados aceptados (por ejemplo ACTIVE_STATUSES); None = todos
+    """
+    query = db.select(RecommendationJob).where(RecommendationJob.student_id == student_id)
+    if statuses is not None:
+        query = query.where(RecommendationJob.status.in_(statuses))
+    return db.session.scalars(query.order_by(RecommendationJob.id.desc()).limit(1)).first()
+
+
+def claim(worker_id):
+    """
+    Reclama el siguiente trabajo disponible
+
+    Args:
+        worker_id: Identificador del proceso (make_worker_id)
+
+    Returns:
+        int o None: Id del trabajo reclamado (ya confirmado como 'running')
+    """
+    max_attempts = current_app.config.get('JOB_MAX_ATTEMPTS', 3)
+    available = db.or_(
+        RecommendationJob.status == PENDING,
+        db.and_(_stale(), RecommendationJob.attempts < max_attempts)
+    )
+
+    # Pocos intentos: si otro proceso gana la carrera, se prueba con el siguiente
+    for _ in range(5):
+        row = db.session.execute(
+            db.select(RecommendationJob.id, RecommendationJob.status)
+            .where(available)
+            .order_by(RecommendationJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if row is None:
+            db.session.rollback()
+            return None
+
+        job_id, status = row
+        claimed = db.session.execute(
+            db.update(RecommendationJob)
+            .where(RecommendationJob.id == job_id, RecommendationJob.status == status, available)
+            .values(
+                status=RUNNING,
+                worker_id=worker_id,
+                attempts=RecommendationJob.attempts + 1,
+                started_at=datetime.utcnow()
+            ),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return job_id
+    return None
+
+
+def fail_exhausted():
+    """
+    Marca como 'failed' los trabajos vencidos sin intentos restantes (el
+    proceso cayó en cada intento)
+
+    Returns:
+        int: Trabajos marcados
+    """
+    max_attempts = current_app.config.get('JOB_MAX_ATTEMPTS', 3)
+    failed = db.session.execute(
+        db.update(RecommendationJob)
+        .where(_stale(), RecommendationJob.attempts >= max_attempts)
+        .values(status=FAILED, finished_at=datetime.utcnow(),
+                error='Se agotaron los intentos (proceso interrumpido)'),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    db.session.commit()
+    return failed
+
+
+def _stale():
+    """Condición: trabajo en 'running' por más de JOB_STALE_AFTER segundos"""
+    stale_before = datetime.utcnow() - timedelta(seconds=current_app.config.get('JOB_STALE_AFTER', 300))
+    return db.and_(RecommendationJob.status == RUNNING, RecommendationJob.started_at < stale_before)
+
+
+def run(job_id, worker_id):
+    """
+    Genera y guarda las recomendaciones de un trabajo reclamado
+
+    Las recomendaciones y el estado 'done' se escriben en la misma
+    transacción; si el trabajo ya no pertenece a este proceso (lo reclamó
+    otro por vencido, o se canceló), no se escribe nada.
+
+    Returns:
+        str: Estado final del trabajo
+    """
+    from app.models.test_answer import TestAnswer
+    from app.routes.test import generate_test_recommendations
+    from app.utils.result_writer import replace_recommendations
+    from app.utils.test_chaside import chaside
+
+    job = db.session.get(RecommendationJob, job_id)
+    try:
+        test_answer = db.session.get(TestAnswer, job.test_answer_id)
+        if test_answer is None:
+            raise LookupError(f"El test {job.test_answer_id} ya no existe")
+
+        scores = chaside.calculate_scores(test_answer.get_answers())
+        recommendations = generate_test_recommendations(test_answer.student, test_answer, scores)
+        replace_recommendations(job.student_id, recommendations)
+
+        if not _finish(job_id, worker_id, DONE):
+            db.session.rollback()
+            return CANCELLED
+        db.session.commit()
+        return DONE
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error en el trabajo {job_id}: {e}")
+        max_attempts = current_app.config.get('JOB_MAX_ATTEMPTS', 3)
+        job = db.session.get(RecommendationJob, job_id)
+        status = FAILED if job is None or job.attempts >= max_attempts else PENDING
+        _finish(job_id, worker_id, status, error=traceback.format_exc(limit=5))
+        db.session.commit()
+        return status
+
+
+def _finish(job_id, worker_id, status, error=None):
+    """Cambia el estado solo si el trabajo sigue en manos de este proceso"""
+    values = {'status': status, 'error': error}
+    if status != PENDING:
+        values['finished_at'] = datetime.utcnow()
+    return db.session.execute(
+        db.update(RecommendationJob)
+        .where(
+            RecommendationJob.id == job_id,
+            RecommendationJob.status == RUNNING,
+            RecommendationJob.worker_id == worker_id
+        )
+        .values(**values),
+        execution_options={'synchronize_session': False}
+    ).rowcount == 1
@@ -0,0 +1,89 @@
+"""
+Importación diferida de módulos pesados (numpy, pandas, sklearn, matplotlib).
+
+    np = lazy_import('numpy')
+    StandardScaler = lazy_import('sklearn.preprocessing', 'StandardScaler')
+
+El módulo real se importa la primera vez que se usa un atributo (o se llama
+al objeto), no al importar el archivo que lo declara. Así create_app() no
+paga el costo de la pila científica en procesos que solo sirven páginas
+como /login o /careers.
+"""
+
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Módulo que se importa al acceder a su primer atributo"""
+
+    def __init__(self, name):
+        super().__init__(name)
+
+    def _load(self):
+        return sys.modules.get(self.__name__) or importlib.import_module(self.__name__)
+
+    def __getattr__(self, attr):
+        # Solo se llama para atributos que todavía no están en __dict__
+        value = getattr(self._load(), attr)
+        self.__dict__[attr] = value  # Los siguientes accesos no pasan por aquí
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'cargado' if self.__name__ in sys.modules else 'sin cargar'
+        return f"<LazyModule '{self.__name__}' ({state})>"
+
+
+class LazyAttribute:
+    """Atributo de un módulo (clase o función) que se resuelve al primer uso"""
+
+    def __init__(self, module_name, attr):
+        self._module_name = module_name
+        self._attr = attr
+        self._target = None
+        self._lock = threading.Lock()
+
+    def _resolve(self):
+        target = self._target
+        if target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module_name)
+                    self._target = getattr(module, self._attr)
+                target = self._target
+        return target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __repr__(self):
+        return f"<LazyAttribute {self._module_name}.{self._attr}>"
+
+
+def lazy_import(module_name, attr=None):
+    """
+    Declara una importación diferida
+
+    Args:
+        module_name: Nombre completo del módulo ('numpy', 'sklearn.tree', ...)
+        attr: Nombre a tomar del módulo (equivalente a 'from módulo import attr')
+
+    Returns:
+        LazyModule o LazyAttribute
+    """
+    if attr is not None:
+        return LazyAttribute(module_name, attr)
+    return LazyModule(module_name)
+
+
+def is_loaded(module_name):
+    """Indica si un módulo ya fue importado de verdad en este proceso"""
+    return module_name in sys.modules
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from markupsafe import Markup
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.career import Career
+from app.models.faculty import Faculty
+
+# HTML renderizado, su ETag (hash del contenido) y la fecha en que cambió por última vez
+Fragment = namedtuple('Fragment', ['html', 'etag', 'last_modified', 'rendered_at'])
+
+
+class PageFragmentCache:
+    """
+    Caché de fragmentos HTML de las páginas del catálogo (/careers, /faculties).
+
+    El contenido de esas páginas solo depende del catálogo de carreras y
+    facultades, así que se renderiza una vez y se reutiliza. Se invalida con
+    eventos de SQLAlchemy al confirmar cambios en Career o Faculty; max_age
+    limita la antigüedad para que los demás procesos (workers) también vean
+    los cambios. Si al volver a renderizar el contenido es igual, se conservan
+    el ETag y la fecha de modificación.
+    """
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._fragments = {}
+
+    def init_app(self, app):
+        """Configura la caché desde la app (CATALOG_FRAGMENT_MAX_AGE)"""
+        self.max_age = app.config.get('CATALOG_FRAGMENT_MAX_AGE', self.max_age)
+
+    def get_or_render(self, key, render):
+        """
+        Devuelve el fragmento guardado o lo genera con render()
+
+        Args:
+            key: Nombre del fragmento (página y variante)
+            render: Función sin argumentos que devuelve el HTML
+
+        Returns:
+            Fragment
+        """
+        fragment = self._fragments.get(key)
+        if fragment is not None and not self._is_expired(fragment):
+            return fragment
+
+        html = render()
+        etag = hashlib.sha1(html.encode('utf-8')).hexdigest()[:20]
+        now = time.time()
+
+        with self._lock:
+            previous = self._fragments.get(key)
+            last_modified = previous.last_modified if previous is not None and previous.etag == etag else now
+            fragment = Fragment(Markup(html), etag, last_modified, now)
+            self._fragments[key] = fragment
+        return fragment
+
+    def invalidate(self):
+        """Marca todos los fragmentos como vencidos (conservan su ETag)"""
+        with self._lock:
+            self._fragments = {
+                key: fragment._replace(rendered_at=0.0)
+                for key, fragment in self._fragments.items()
+            }
+
+    def _is_expired(self, fragment):
+        if not fragment.rendered_at:
+            return True
+        return bool(self.max_age) and time.time() - fragment.rendered_at > self.max_age
+
+
+# Instancia única por proceso
+page_cache = PageFragmentCache()
+
+
+# ----------------------------------------------------------------------
+# Invalidación por eventos de SQLAlchemy
+# ----------------------------------------------------------------------
+
+_DIRTY_KEY = 'page_cache_dirty'
+
+
+def _mark_pages_dirty(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+def _invalidate_if_dirty(session):
+    if session.info.pop(_DIRTY_KEY, False):
+        page_cache.invalidate()
+
+
+for _model in (Career, Faculty):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _mark_pages_dirty)
+
+event.listen(Session, 'after_commit', _invalidate_if_dirty)
+event.listen(Session, 'after_soft_rollback', lambda session, previous_transaction: session.info.pop(_DIRTY_KEY, None))
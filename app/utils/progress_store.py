@@ -0,0 +1,275 @@
+import os
+from datetime import datetime, timedelta
+
+from app.utils.answer_bits import ANSWER_BYTES, NUM_QUESTIONS, answers_to_int, bits_to_int
+
+
+def _answered_mask(answers):
+    """Máscara de preguntas respondidas (Sí o No)"""
+    return answers_to_int({question_id: True for question_id in answers})
+
+
+def _to_answers(answered, yes):
+    """Convierte las dos máscaras en {"pregunta": bool} (mismo formato que la sesión)"""
+    return {
+        str(question_id): bool(yes >> (question_id - 1) & 1)
+        for question_id in range(1, NUM_QUESTIONS + 1)
+        if answered >> (question_id - 1) & 1
+    }
+
+
+class DatabaseProgressBackend:
+    """Guarda el avance en la tabla test_progress (SQLite/PostgreSQL)"""
+
+    def load(self, student_id):
+        from app import db
+        from app.models.test_progress import TestProgress
+
+        progress = db.session.get(TestProgress, student_id)
+        if progress is None:
+            return None
+        return (
+            bits_to_int(progress.answered_bits),
+            bits_to_int(progress.yes_bits),
+            progress.updated_at
+        )
+
+    def update(self, student_id, merge, cutoff=None):
+        """
+        Lee, combina y guarda el avance en una sola transacción
+
+        Primero se asegura la fila con INSERT ... ON CONFLICT DO NOTHING (en
+        SQLite eso además toma el bloqueo de escritura antes de leer) y luego
+        se lee con SELECT ... FOR UPDATE: dos respuestas simultáneas del mismo
+        estudiante (doble clic, dos pestañas) se aplican una después de la
+        otra y no se pierde ninguna.
+
+        Args:
+            student_id: ID del estudiante
+            merge: Función (respondidas, sí) -> (respondidas, sí)
+            cutoff: Avance anterior a esta fecha se considera vencido (None = nunca)
+
+        Returns:
+            tuple: (respondidas, sí) guardadas
+        """
+        from sqlalchemy.exc import IntegrityError
+        from app import db
+        from app.models.test_progress import TestProgress
+        from app.utils.result_writer import dialect_insert
+
+        empty = bytes(ANSWER_BYTES)
+        insert = dialect_insert(TestProgress)
+
+        # Motores sin ON CONFLICT: si otro proceso crea la fila primero, se reintenta
+        for _ in range(2):
+            now = datetime.utcnow()
+            if insert is not None:
+                db.session.execute(
+                    insert.values(student_id=student_id, answered_bits=empty, yes_bits=empty, updated_at=now)
+                    .on_conflict_do_nothing(index_elements=[TestProgress.student_id])
+                )
+            progress = db.session.scalars(
+                db.select(TestProgress)
+                .where(TestProgress.student_id == student_id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            ).first()
+            if progress is None:
+                progress = TestProgress(student_id=student_id, answered_bits=empty, yes_bits=empty, updated_at=now)
+                db.session.add(progress)
+
+            if cutoff is not None and progress.updated_at < cutoff:
+                answered, yes = 0, 0
+            else:
+                answered, yes = bits_to_int(progress.answered_bits), bits_to_int(progress.yes_bits)
+            answered, yes = merge(answered, yes)
+
+            progress.answered_bits = answered.to_bytes(ANSWER_BYTES, 'little')
+            progress.yes_bits = yes.to_bytes(ANSWER_BYTES, 'little')
+            progress.updated_at = now
+            try:
+                db.session.commit()
+                return answered, yes
+            except IntegrityError:
+                db.session.rollback()
+        raise RuntimeError(f"No se pudo guardar el avance del estudiante {student_id}")
+
+    def delete(self, student_id):
+        from app import db
+        from app.models.test_progress import TestProgress
+
+        TestProgress.query.filter_by(student_id=student_id).delete()
+        db.session.commit()
+
+    def delete_older_than(self, cutoff):
+        from app import db
+        from app.models.test_progress import TestProgress
+
+        removed = TestProgress.query.filter(TestProgress.updated_at < cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        return removed
+
+
+class FileProgressBackend:
+    """
+    Guarda el avance en archivos locales de 26 bytes (uno por estudiante).
+    Solo sirve cuando todos los procesos comparten el mismo disco.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, student_id):
+        return os.path.join(self.directory, f'{int(student_id)}.bin')
+
+    def load(self, student_id):
+        path = self._path(student_id)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            updated_at = datetime.utcfromtimestamp(os.path.getmtime(path))
+        except OSError:
+            return None
+        if len(data) != 2 * ANSWER_BYTES:
+            return None
+        return bits_to_int(data[:ANSWER_BYTES]), bits_to_int(data[ANSWER_BYTES:]), updated_at
+
+    def update(self, student_id, merge, cutoff=None):
+        """
+        Lee, combina y guarda el avance (ver DatabaseProgressBackend.update)
+
+        Sin bloqueo entre procesos: si dos peticiones del mismo estudiante se
+        cruzan, gana la última en escribir y la otra respuesta se pierde.
+        """
+        stored = self.load(student_id)
+        answered, yes = 0, 0
+        if stored is not None and (cutoff is None or stored[2] >= cutoff):
+            answered, yes = stored[0], stored[1]
+        answered, yes = merge(answered, yes)
+        self._save(student_id, answered, yes)
+        return answered, yes
+
+    def _save(self, student_id, answered, yes):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(student_id)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(answered.to_bytes(ANSWER_BYTES, 'little') + yes.to_bytes(ANSWER_BYTES, 'little'))
+        os.replace(tmp_path, path)
+
+    def delete(self, student_id):
+        try:
+            os.remove(self._path(student_id))
+        except FileNotFoundError:
+            pass
+
+    def delete_older_than(self, cutoff):
+        if not os.path.isdir(self.directory):
+            return 0
+
+        removed = 0
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_file() and datetime.utcfromtimestamp(entry.stat().st_mtime) < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+class ProgressStore:
+    """
+    Avance del test en curso, guardado en el servidor por estudiante.
+
+    Las respuestas parciales se guardan como dos máscaras de 98 bits
+    (respondidas / "Sí"), así la cookie de sesión no crece y el avance se
+    puede retomar desde otro dispositivo. El avance sin cambios durante más
+    de `ttl` segundos se considera vencido; gc() lo elimina.
+    """
+
+    BACKENDS = ('database', 'files')
+
+    def __init__(self, backend='database', directory=None, ttl=7 * 24 * 3600):
+        self.ttl = ttl
+        self.backend = self._create_backend(backend, directory)
+
+    def init_app(self, app):
+        """Configura el backend desde la app (PROGRESS_STORE, PROGRESS_STORE_DIR, PROGRESS_TTL)"""
+        self.ttl = app.config.get('PROGRESS_TTL', self.ttl)
+        self.backend = self._create_backend(
+            app.config.get('PROGRESS_STORE', 'database'),
+            app.config.get('PROGRESS_STORE_DIR')
+        )
+
+    def _create_backend(self, name, directory):
+        if name == 'files':
+            return FileProgressBackend(directory or os.path.join('instance', 'test_progress'))
+        if name != 'database':
+            raise ValueError(f"PROGRESS_STORE inválido: {name} (opciones: {', '.join(self.BACKENDS)})")
+        return DatabaseProgressBackend()
+
+    def _cutoff(self):
+        return datetime.utcnow() - timedelta(seconds=self.ttl)
+
+    def _active_cutoff(self):
+        """Fecha de vencimiento, o None si el avance no vence (ttl = 0)"""
+        return self._cutoff() if self.ttl else None
+
+    def _load_masks(self, student_id):
+        stored = self.backend.load(student_id)
+        if stored is None:
+            return 0, 0
+        answered, yes, updated_at = stored
+        if self.ttl and updated_at < self._cutoff():
+            return 0, 0
+        return answered, yes
+
+    def get(self, student_id):
+        """
+        Devuelve las respuestas guardadas del test en curso
+
+        Returns:
+            dict: {"pregunta": bool}; vacío si no hay avance o está vencido
+        """
+        return _to_answers(*self._load_masks(student_id))
+
+    def update(self, student_id, answers):
+        """
+        Agrega respuestas al avance del estudiante
+
+        Args:
+            student_id: ID del estudiante
+            answers: Diccionario {pregunta: bool}
+
+        Returns:
+            dict: Todas las respuestas acumuladas
+        """
+        new_answered = _answered_mask(answers)
+        new_yes = answers_to_int(answers)
+
+        def merge(answered, yes):
+            return answered | new_answered, (yes & ~new_answered) | new_yes
+
+        return _to_answers(*self.backend.update(student_id, merge, self._active_cutoff()))
+
+    def record(self, student_id, question_id, is_yes):
+        """Guarda la respuesta a una pregunta"""
+        return self.update(student_id, {question_id: is_yes})
+
+    def clear(self, student_id):
+        """Elimina el avance (al comenzar de nuevo o al procesar resultados)"""
+        self.backend.delete(student_id)
+
+    def gc(self):
+        """
+        Elimina el avance vencido
+
+        Returns:
+            int: Número de registros eliminados
+        """
+        return self.backend.delete_older_than(self._cutoff())
+
+
+# Instancia única por proceso
+progress_store = ProgressStore()
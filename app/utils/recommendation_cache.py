@@ -0,0 +1,316 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class RecommendationCache:
+    """
+    Memoización de CareerMatcher.generate_recommendations.
+
+    Las recomendaciones dependen solo del vector de 16 características del
+    estudiante, de la versión del catálogo de carreras y de la versión de los
+    modelos. Como los puntajes CHASIDE van de 0 a 14, muchos estudiantes
+    comparten el mismo vector y, por lo tanto, el mismo resultado.
+
+    - Clave: hash del vector (redondeado a `precision` decimales), versión del
+      catálogo, versión de los modelos y top_n
+    - Valor: lista de recomendaciones sin estudiante (career_id, score, rank,
+      explanation, model_used); al usarlas se crean objetos Recommendation nuevos
+    - Backend 'memory': LRU por proceso con vencimiento (ttl)
+    - Backend 'sqlite': tabla en un archivo SQLite compartido por los procesos
+      del mismo servidor, con el mismo límite de entradas y vencimiento
+    - Singleflight: peticiones simultáneas con la misma clave esperan el
+      resultado de la primera en lugar de volver a calcularlo
+
+    El nombre de la facultad forma parte de la explicación pero no de la
+    versión del catálogo: un cambio de nombre se ve al vencer la entrada.
+    """
+
+    def __init__(self, backend='memory', max_entries=4096, ttl=3600, precision=4,
+                 path=None, wait_timeout=30):
+        self.precision = precision
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._inflight = {}  # clave -> _Call en curso
+        self._configure(backend, max_entries, ttl, path)
+        self.reset_stats()
+
+    def init_app(self, app):
+        """
+        Configura la caché desde la app (RECOMMENDATION_CACHE_BACKEND,
+        RECOMMENDATION_CACHE_SIZE, RECOMMENDATION_CACHE_TTL,
+        RECOMMENDATION_CACHE_PRECISION, RECOMMENDATION_CACHE_PATH)
+        """
+        self.precision = app.config.get('RECOMMENDATION_CACHE_PRECISION', self.precision)
+        self._configure(
+            app.config.get('RECOMMENDATION_CACHE_BACKEND', 'memory'),
+            app.config.get('RECOMMENDATION_CACHE_SIZE', 4096),
+            app.config.get('RECOMMENDATION_CACHE_TTL', 3600),
+            app.config.get('RECOMMENDATION_CACHE_PATH')
+        )
+        self.reset_stats()
+
+    def _configure(self, backend, max_entries, ttl, path):
+        if backend == 'sqlite':
+            self._backend = _SQLiteBackend(path or os.path.join('instance', 'recommendation_cache.sqlite3'),
+                                           max_entries, ttl)
+        elif backend in ('none', '0', '', None) or not max_entries:
+            self._backend = None
+        else:
+            self._backend = _MemoryBackend(max_entries, ttl)
+        self.backend_name = backend if self._backend is not None else 'none'
+
+    @property
+    def enabled(self):
+        return self._backend is not None
+
+    def make_key(self, features, catalog_version, model_version, top_n):
+        """
+        Clave de caché para un vector de características
+
+        Args:
+            features: Diccionario de características (orden de _student_feature_row)
+            catalog_version: Versión del catálogo de carreras
+            model_version: Versión de los modelos (o None si se usan reglas)
+            top_n: Número de recomendaciones pedidas (y cualquier otro dato
+                   que cambie el resultado, serializable en JSON)
+
+        Returns:
+            str: Hash SHA-256 en hexadecimal
+        """
+        vector = [round(float(value), self.precision) for value in features.values()]
+        raw = json.dumps([vector, catalog_version, model_version, top_n], separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_or_compute(self, key, compute):
+        """
+        Resultado guardado para la clave o, si no existe, el de compute()
+
+        Los resultados vacíos no se guardan (indican un error en el cálculo).
+
+        Args:
+            key: Clave de make_key
+            compute: Función sin argumentos que devuelve la lista a guardar
+
+        Returns:
+            list: Recomendaciones serializables (diccionarios)
+        """
+        if self._backend is None:
+            return compute()
+
+        value = self._backend.get(key)
+        if value is not None:
+            self._count('hits')
+            return value
+
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            # Otra petición ya está calculando esta clave: esperar su resultado
+            if call.event.wait(self.wait_timeout) and call.value:
+                self._count('coalesced')
+                return call.value
+            self._count('misses')
+            return compute()
+
+        self._count('misses')
+        try:
+            value = compute()
+            if value:
+                self._backend.put(key, value)
+                self._count('stores')
+            call.value = value
+            return value
+        finally:
+            call.event.set()
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get(self, key):
+        """Resultado guardado para la clave, o None (cuenta acierto o fallo)"""
+        if self._backend is None:
+            return None
+        value = self._backend.get(key)
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def put(self, key, value):
+        """Guarda un resultado calculado fuera de get_or_compute (por ejemplo, por lotes)"""
+        if self._backend is not None and value:
+            self._backend.put(key, value)
+            self._count('stores')
+
+    def clear(self):
+        if self._backend is not None:
+            self._backend.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
+            self.stores = 0
+
+    def stats(self):
+        """Contadores de uso (para /admin/metrics)"""
+        entries = self._backend.size() if self._backend is not None else 0
+        with self._lock:
+            served = self.hits + self.coalesced
+            lookups = served + self.misses
+            return {
+                'backend': self.backend_name,
+                'entries': entries,
+                'hits': self.hits,
+                'coalesced': self.coalesced,
+                'misses': self.misses,
+                'stores': self.stores,
+                'hit_rate': round(served / lookups, 4) if lookups else None,
+            }
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class _Call:
+    """Cálculo en curso de una clave (singleflight)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+
+
+class _MemoryBackend:
+    """LRU en memoria con vencimiento"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # clave -> (vence, valor)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _SQLiteBackend:
+    """
+    Tabla recommendation_cache en un archivo SQLite (una conexión por hilo).
+    Al superar max_entries se eliminan primero las entradas usadas hace más
+    tiempo.
+    """
+
+    def __init__(self, path, max_entries, ttl):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._puts = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS recommendation_cache ('
+                ' key TEXT PRIMARY KEY, value TEXT NOT NULL,'
+                ' expires_at REAL, used_at REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS ix_recommendation_cache_used_at ON recommendation_cache (used_at)'
+            )
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        now = time.time()
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    'SELECT value, expires_at FROM recommendation_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] is not None and row[1] < now:
+                    connection.execute('DELETE FROM recommendation_cache WHERE key = ?', (key,))
+                    return None
+                connection.execute('UPDATE recommendation_cache SET used_at = ? WHERE key = ?', (now, key))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"⚠️ Error leyendo caché de recomendaciones: {e}")
+            return None
+
+    def put(self, key, value):
+        now = time.time()
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO recommendation_cache (key, value, expires_at, used_at)'
+                    ' VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value), now + self.ttl if self.ttl else None, now)
+                )
+                # Recortar cada cierto número de escrituras (no en cada una)
+                self._puts += 1
+                if self._puts % 64 == 0:
+                    self._evict(connection, now)
+        except sqlite3.Error as e:
+            print(f"⚠️ Error guardando caché de recomendaciones: {e}")
+
+    def _evict(self, connection, now):
+        connection.execute('DELETE FROM recommendation_cache WHERE expires_at < ?', (now,))
+        connection.execute(
+            'DELETE FROM recommendation_cache WHERE key IN ('
+            ' SELECT key FROM recommendation_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def size(self):
+        try:
+            return self._connect().execute('SELECT COUNT(*) FROM recommendation_cache').fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM recommendation_cache')
+
+
+# Instancia única por proceso
+recommendation_cache = RecommendationCache()
@@ -0,0 +1,174 @@
+"""
+Escritura de resultados del test: el test vigente del estudiante y sus
+recomendaciones, con pocas sentencias y a prueba de envíos repetidos.
+
+    written = write_results(draft, recommendations, idempotency_key)
+    written.test_answer          # TestAnswer guardado (o el ya existente)
+    written.recommendations      # Recommendation guardadas
+    written.duplicate            # True si el envío ya se había procesado
+
+- El test se guarda con un upsert (INSERT ... ON CONFLICT (student_id) DO
+  UPDATE ... RETURNING): una sentencia, y la fila queda bloqueada hasta el
+  commit, así dos envíos simultáneos del mismo estudiante se serializan.
+- Si el test vigente ya tiene la misma clave de idempotencia, el upsert no
+  modifica nada: el envío es un duplicado y se devuelven los resultados ya
+  guardados (las recomendaciones nuevas se descartan).
+- Las recomendaciones se reemplazan con un DELETE y un solo INSERT de varias
+  filas con RETURNING.
+
+Las funciones no hacen commit; eso queda a cargo de quien las llama.
+"""
+
+import re
+from collections import namedtuple
+from datetime import datetime
+
+from app import db
+from app.models.recommendation import Recommendation
+from app.models.test_answer import TestAnswer
+from app.utils.results_repository import get_latest_results
+
+WrittenResults = namedtuple('WrittenResults', ['test_answer', 'recommendations', 'duplicate'])
+
+# Columnas de Recommendation que vienen del generador de recomendaciones
+RECOMMENDATION_FIELDS = ('career_id', 'score', 'rank', 'explanation', 'model_used')
+
+# Claves aceptadas: las genera el formulario (uuid4) o el cliente de la API
+IDEMPOTENCY_KEY_PATTERN = re.compile(r'^[A-Za-z0-9_.:-]{8,64}$')
+
+
+def normalize_idempotency_key(value):
+    """Clave de idempotencia recibida, o None si falta o no es válida"""
+    if isinstance(value, str) and IDEMPOTENCY_KEY_PATTERN.match(value):
+        return value
+    return None
+
+
+def find_completed(student_id, idempotency_key):
+    """Test vigente del estudiante si ya se guardó con esta clave, o None"""
+    if not idempotency_key:
+        return None
+    return db.session.scalars(
+        db.select(TestAnswer).where(
+            TestAnswer.student_id == student_id,
+            TestAnswer.idempotency_key == idempotency_key
+        )
+    ).first()
+
+
+def write_results(draft, recommendations, idempotency_key=None):
+    """
+    Guarda el test y reemplaza las recomendaciones del estudiante
+
+    Args:
+        draft: TestAnswer sin guardar con el puntaje y las respuestas
+        recommendations: Recommendation sin guardar (del generador)
+        idempotency_key: Clave del envío (None = sin control de duplicados)
+
+    Returns:
+        WrittenResults: (test_answer, recommendations, duplicate)
+    """
+    test_answer = upsert_test_answer(draft, idempotency_key)
+    if test_answer is None:
+        existing = get_latest_results(draft.student_id, limit=None)
+        return WrittenResults(existing.test_answer, existing.recommendations, True)
+
+    saved = replace_recommendations(draft.student_id, recommendations)
+    return WrittenResults(test_answer, saved, False)
+
+
+def upsert_test_answer(draft, idempotency_key=None):
+    """
+    Inserta o actualiza el test vigente del estudiante en una sentencia
+
+    Returns:
+        TestAnswer guardado, o None si el test vigente ya tiene esta clave
+    """
+    values = {
+        column.key: getattr(draft, column.key)
+        for column in TestAnswer.__table__.columns
+        if column.key != 'id'
+    }
+    values['test_date'] = values['test_date'] or datetime.utcnow()
+    values['idempotency_key'] = idempotency_key
+
+    insert = dialect_insert(TestAnswer)
+    if insert is None:
+        return _update_or_insert_test_answer(values)
+
+    statement = insert.values(**values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[TestAnswer.student_id],
+        set_={key: statement.excluded[key] for key in values if key != 'student_id'},
+        # Mismo envío: no se toca la fila y RETURNING no devuelve nada
+        where=TestAnswer.idempotency_key.is_distinct_from(idempotency_key) if idempotency_key else None
+    ).returning(TestAnswer)
+
+    return db.session.scalars(statement, execution_options={'populate_existing': True}).first()
+
+
+def replace_recommendations(student_id, recommendations):
+    """
+    Reemplaza las recomendaciones del estudiante (DELETE + un INSERT de varias filas)
+
+    Returns:
+        list: Recommendation guardadas, ordenadas por rank
+    """
+    db.session.execute(
+        db.delete(Recommendation).where(Recommendation.student_id == student_id),
+        execution_options={'synchronize_session': False}
+    )
+    rows = [
+        {'student_id': student_id, **{field: getattr(recommendation, field) for field in RECOMMENDATION_FIELDS}}
+        for recommendation in recommendations
+    ]
+    if not rows:
+        return []
+
+    # Un solo INSERT ... VALUES (...), (...) RETURNING (executemany haría una
+    # sentencia por fila en SQLite)
+    saved = db.session.scalars(
+        db.insert(Recommendation).values(rows).returning(Recommendation),
+        execution_options={'populate_existing': True}
+    ).all()
+    return sorted(saved, key=lambda recommendation: recommendation.rank)
+
+
+def clear_results(student_id):
+    """Elimina el test y las recomendaciones del estudiante (volver a realizar el test)"""
+    for model in (Recommendation, TestAnswer):
+        db.session.execute(
+            db.delete(model).where(model.student_id == student_id),
+            execution_options={'synchronize_session': False}
+        )
+
+
+def dialect_insert(model):
+    """INSERT con ON CONFLICT del motor actual (PostgreSQL o SQLite), o None"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
+
+
+def _update_or_insert_test_answer(values):
+    """Upsert para motores sin ON CONFLICT: SELECT ... FOR UPDATE y luego UPDATE o INSERT"""
+    test_answer = db.session.scalars(
+        db.select(TestAnswer)
+        .where(TestAnswer.student_id == values['student_id'])
+        .with_for_update()
+    ).first()
+    if test_answer is None:
+        test_answer = TestAnswer(**values)
+        db.session.add(test_answer)
+    elif values['idempotency_key'] and test_answer.idempotency_key == values['idempotency_key']:
+        return None
+    else:
+        for key, value in values.items():
+            setattr(test_answer, key, value)
+    db.session.flush()
+    return test_answer
@@ -0,0 +1,75 @@
+"""
+Consultas de resultados del test (último test, recomendaciones y sus carreras).
+
+Reúne en un solo lugar las consultas que usan las vistas de resultados, para
+que carguen todo lo que la plantilla necesita sin consultas N+1:
+
+    results = get_latest_results(student.id)
+    results.test_answer              # TestAnswer más reciente (o None)
+    results.recommendations          # Recommendation con .career y .career.faculty ya cargados
+
+A lo sumo dos sentencias SQL: una para el test y otra para las
+recomendaciones con su carrera y facultad (JOIN).
+"""
+
+from collections import namedtuple
+
+from sqlalchemy.orm import contains_eager
+
+from app import db
+from app.models.career import Career
+from app.models.recommendation import Recommendation
+from app.models.test_answer import TestAnswer
+
+StudentResults = namedtuple('StudentResults', ['test_answer', 'recommendations'])
+
+
+def get_latest_test_answer(student_id):
+    """Test más reciente del estudiante, o None"""
+    return db.session.scalars(
+        db.select(TestAnswer)
+        .where(TestAnswer.student_id == student_id)
+        .order_by(TestAnswer.test_date.desc(), TestAnswer.id.desc())
+        .limit(1)
+    ).first()
+
+
+def get_top_recommendations(student_id, limit=5):
+    """
+    Mejores recomendaciones del estudiante, con carrera y facultad cargadas
+
+    Se omiten las recomendaciones cuya carrera ya no existe. El orden
+    (puntaje descendente y luego id) es el mismo en todas las vistas, así los
+    gráficos y la lista de carreras coinciden.
+
+    Args:
+        student_id: Id del estudiante
+        limit: Máximo de recomendaciones (None = todas)
+
+    Returns:
+        list: Objetos Recommendation
+    """
+    query = (
+        db.select(Recommendation)
+        .join(Recommendation.career)
+        .options(contains_eager(Recommendation.career).joinedload(Career.faculty))
+        .where(Recommendation.student_id == student_id)
+        .order_by(Recommendation.score.desc(), Recommendation.id)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return list(db.session.scalars(query))
+
+
+def get_latest_results(student_id, limit=5):
+    """
+    Último test del estudiante y sus mejores recomendaciones
+
+    Returns:
+        StudentResults: (test_answer, recommendations); test_answer es None si
+                        el estudiante aún no hizo el test
+    """
+    test_answer = get_latest_test_answer(student_id)
+    if test_answer is None:
+        return StudentResults(None, [])
+    return StudentResults(test_answer, get_top_recommendations(student_id, limit))
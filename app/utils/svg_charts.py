@@ -0,0 +1,180 @@
+"""
+Gráficos de resultados generados directamente como SVG.
+
+Alternativa a matplotlib para ChartGenerator (CHART_BACKEND = 'svg'):
+mismo contenido (radar CHASIDE y barras horizontales de carreras), sin
+estado global y sin importar matplotlib. Se puede usar desde varios hilos.
+"""
+
+import math
+from xml.sax.saxutils import escape
+
+RADAR_CATEGORIES = ('Administrativas (C)', 'Humanísticas (H)', 'Artísticas (A)',
+                    'Salud (S)', 'Ingenierías (I)', 'Defensa (D)', 'Científicas (E)')
+
+PRIMARY_COLOR = '#0d6efd'
+FONT = 'font-family="DejaVu Sans, Arial, sans-serif"'
+
+# Escala Blues de matplotlib entre 0.6 y 1.0 (mismos colores que el gráfico original)
+_BLUES = ((0x4a, 0x98, 0xc9), (0x2e, 0x7e, 0xbc), (0x17, 0x64, 0xab), (0x08, 0x4a, 0x91), (0x08, 0x30, 0x6b))
+
+
+def _fmt(value):
+    """Número con 2 decimales, sin ceros sobrantes"""
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+def _blues(position):
+    """Color de la escala para una posición entre 0 y 1"""
+    scaled = min(max(position, 0.0), 1.0) * (len(_BLUES) - 1)
+    low = int(scaled)
+    high = min(low + 1, len(_BLUES) - 1)
+    fraction = scaled - low
+    rgb = [round(a + (b - a) * fraction) for a, b in zip(_BLUES[low], _BLUES[high])]
+    return '#{:02x}{:02x}{:02x}'.format(*rgb)
+
+
+def _svg(width, height, body):
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}">'
+        f'<rect width="100%" height="100%" fill="#ffffff"/>{"".join(body)}</svg>'
+    ).encode('utf-8')
+
+
+def render_radar_svg(values, max_value=10):
+    """
+    Gráfico de radar de los puntajes CHASIDE
+
+    Args:
+        values: Puntajes en el orden C, H, A, S, I, D, E
+        max_value: Valor máximo para normalizar
+
+    Returns:
+        bytes: Documento SVG
+    """
+    width, height = 640, 600
+    cx, cy, radius = width / 2, 320, 200
+    n = len(RADAR_CATEGORIES)
+
+    # Mismo sistema que el radar polar de matplotlib: el eje 0 apunta a la
+    # derecha y los ángulos crecen en sentido antihorario
+    angles = [2 * math.pi * i / n for i in range(n)]
+
+    def point(angle, fraction):
+        return cx + radius * fraction * math.cos(angle), cy - radius * fraction * math.sin(angle)
+
+    body = [
+        f'<text x="{_fmt(cx)}" y="36" text-anchor="middle" font-size="20" {FONT}>'
+        'Perfil de Intereses y Aptitudes</text>'
+    ]
+
+    # Circunferencias de referencia y sus etiquetas
+    for tick in (0.2, 0.4, 0.6, 0.8, 1.0):
+        body.append(
+            f'<circle cx="{_fmt(cx)}" cy="{_fmt(cy)}" r="{_fmt(radius * tick)}" '
+            'fill="none" stroke="#d0d0d0" stroke-width="1"/>'
+        )
+        body.append(
+            f'<text x="{_fmt(cx + 4)}" y="{_fmt(cy - radius * tick - 3)}" font-size="11" '
+            f'fill="#555555" {FONT}>{int(tick * max_value)}</text>'
+        )
+
+    # Ejes y nombres de las áreas
+    for angle, category in zip(angles, RADAR_CATEGORIES):
+        x, y = point(angle, 1.0)
+        body.append(
+            f'<line x1="{_fmt(cx)}" y1="{_fmt(cy)}" x2="{_fmt(x)}" y2="{_fmt(y)}" '
+            'stroke="#d0d0d0" stroke-width="1"/>'
+        )
+        lx, ly = point(angle, 1.12)
+        cos = math.cos(angle)
+        anchor = 'middle' if abs(cos) < 0.2 else ('start' if cos > 0 else 'end')
+        body.append(
+            f'<text x="{_fmt(lx)}" y="{_fmt(ly + 4)}" text-anchor="{anchor}" font-size="13" '
+            f'{FONT}>{escape(category)}</text>'
+        )
+
+    # Polígono de puntajes (recortado al borde, como set_ylim(0, 1))
+    fractions = [min(max((value or 0) / max_value, 0.0), 1.0) for value in values]
+    points = [point(angle, fraction) for angle, fraction in zip(angles, fractions)]
+    points_attr = ' '.join(f'{_fmt(x)},{_fmt(y)}' for x, y in points)
+    body.append(
+        f'<polygon points="{points_attr}" fill="{PRIMARY_COLOR}" fill-opacity="0.25" '
+        f'stroke="{PRIMARY_COLOR}" stroke-width="2"/>'
+    )
+    for x, y in points:
+        body.append(f'<circle cx="{_fmt(x)}" cy="{_fmt(y)}" r="4" fill="{PRIMARY_COLOR}"/>')
+
+    return _svg(width, height, body)
+
+
+def render_bar_svg(top_careers):
+    """
+    Gráfico de barras horizontales de las carreras recomendadas
+
+    Args:
+        top_careers: Lista ordenada de tuplas (nombre_carrera, puntuación 0-1)
+
+    Returns:
+        bytes: Documento SVG
+    """
+    width = 760
+    left, right, top = 230, 40, 56
+    bar_height, gap = 34, 14
+    count = len(top_careers)
+    plot_height = max(count, 1) * (bar_height + gap)
+    height = top + plot_height + 60
+    plot_width = width - left - right
+
+    def x_of(percent):
+        return left + plot_width * percent / 105.0  # Mismo rango que plt.xlim(0, 105)
+
+    body = [
+        f'<text x="{_fmt(width / 2)}" y="32" text-anchor="middle" font-size="18" {FONT}>'
+        'Carreras Recomendadas</text>'
+    ]
+
+    # Líneas de referencia del eje X
+    for percent in range(0, 101, 20):
+        x = x_of(percent)
+        body.append(
+            f'<line x1="{_fmt(x)}" y1="{top}" x2="{_fmt(x)}" y2="{top + plot_height}" '
+            'stroke="#e5e5e5" stroke-width="1"/>'
+        )
+        body.append(
+            f'<text x="{_fmt(x)}" y="{top + plot_height + 18}" text-anchor="middle" '
+            f'font-size="12" {FONT}>{percent}</text>'
+        )
+
+    # Igual que barh: la primera carrera queda abajo
+    for index, (name, score) in enumerate(top_careers):
+        percent = score * 100
+        y = top + plot_height - (index + 1) * (bar_height + gap) + gap / 2
+        color = _blues(index / (count - 1) if count > 1 else 0.0)
+        bar_width = max(x_of(max(percent, 0)) - left, 0)
+        body.append(
+            f'<rect x="{left}" y="{_fmt(y)}" width="{_fmt(bar_width)}" height="{bar_height}" fill="{color}"/>'
+        )
+        body.append(
+            f'<text x="{left - 8}" y="{_fmt(y + bar_height / 2 + 4)}" text-anchor="end" '
+            f'font-size="13" {FONT}>{escape(str(name))}</text>'
+        )
+        body.append(
+            f'<text x="{_fmt(left + bar_width + 6)}" y="{_fmt(y + bar_height / 2 + 4)}" '
+            f'font-size="12" {FONT}>{percent:.1f}%</text>'
+        )
+
+    body.append(
+        f'<line x1="{left}" y1="{top}" x2="{left}" y2="{top + plot_height}" stroke="#333333" stroke-width="1"/>'
+    )
+    body.append(
+        f'<text x="{_fmt(left + plot_width / 2)}" y="{top + plot_height + 42}" text-anchor="middle" '
+        f'font-size="13" {FONT}>Compatibilidad (%)</text>'
+    )
+    body.append(
+        f'<text x="18" y="{_fmt(top + plot_height / 2)}" text-anchor="middle" font-size="13" {FONT} '
+        f'transform="rotate(-90 18 {_fmt(top + plot_height / 2)})">Carreras</text>'
+    )
+
+    return _svg(width, height, body)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Benchmark de índices: latencia de las consultas frecuentes antes y después
+de la migración a1c3e5f70003 (índices de students, test_answers y recommendations)
+
+Crea una base de datos de prueba, la lleva a la revisión anterior (sin los
+índices), carga datos sintéticos (por defecto 100.000 estudiantes con un test
+y 3 recomendaciones cada uno: 500.000 filas entre las tres tablas), mide las
+consultas que usan las rutas autenticadas, aplica la migración y vuelve a medir.
+
+Uso:
+    python benchmark_indexes.py [--students N] [--recommendations N] [--queries N]
+                                [--database-url URL]
+
+Sin --database-url se usa un archivo SQLite temporal. Si se indica una URL,
+la base de datos debe estar vacía.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import warnings
+from datetime import datetime, timedelta
+
+warnings.filterwarnings('ignore', category=UserWarning)
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(PROJECT_DIR, 'migrations')
+REVISION_WITHOUT_INDEXES = 'a1c3e5f70002'
+BATCH_SIZE = 10000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Latencia de consultas antes y después de los índices')
+    parser.add_argument('--students', type=int, default=100000, help='Estudiantes a generar (cada uno con un test)')
+    parser.add_argument('--recommendations', type=int, default=3, help='Recomendaciones por estudiante')
+    parser.add_argument('--queries', type=int, default=2000, help='Consultas a medir por tipo')
+    parser.add_argument('--database-url', help='Base de datos vacía a usar (por defecto, SQLite temporal)')
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def create_benchmark_app(database_url):
+    from config import Config
+    from app import create_app
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        ML_PRELOAD_MODELS = '0'
+        CHART_PRERENDER_WORKERS = 0
+
+    return create_app(BenchmarkConfig)
+
+
+def seed(students, recommendations_per_student, rng):
+    """Inserta usuarios, estudiantes, tests y recomendaciones en bloques"""
+    from app import db
+    from app.models.user import User
+    from app.models.student import Student
+    from app.models.career import Career
+    from app.models.test_answer import TestAnswer
+    from app.models.recommendation import Recommendation
+    import init_db
+
+    init_db.create_sample_faculties()
+    init_db.create_sample_careers()
+    career_ids = [row[0] for row in db.session.query(Career.id).all()]
+
+    start_date = datetime(2025, 1, 1)
+    inserted = 0
+    for first in range(1, students + 1, BATCH_SIZE):
+        ids = range(first, min(first + BATCH_SIZE, students + 1))
+        # Los id de usuario se desordenan para que user_id no coincida con el orden físico
+        db.session.execute(db.insert(User), [
+            {'id': i, 'username': f'bench{i}', 'email': f'bench{i}@example.invalid', 'password_hash': 'x'}
+            for i in ids
+        ])
+        db.session.execute(db.insert(Student), [
+            {'id': i, 'user_id': i, 'first_name': 'Estudiante', 'last_name': str(i)}
+            for i in rng.sample(list(ids), len(ids))
+        ])
+        db.session.execute(db.insert(TestAnswer), [
+            {
+                'student_id': i,
+                'test_date': start_date + timedelta(minutes=rng.randrange(525600)),
+                **{f'score_{area}': rng.randrange(15) for area in 'chaside'}
+            }
+            for i in rng.sample(list(ids), len(ids))
+        ])
+        db.session.execute(db.insert(Recommendation), [
+            {'student_id': i, 'career_id': rng.choice(career_ids), 'score': rng.random(), 'rank': rank}
+            for rank in range(1, recommendations_per_student + 1)
+            for i in rng.sample(list(ids), len(ids))
+        ])
+        db.session.commit()
+        inserted += len(ids)
+        print(f"   📥 {inserted}/{students} estudiantes", end='\r', flush=True)
+
+    total_rows = students * (2 + recommendations_per_student)
+    print(f"   📥 {students} estudiantes - {total_rows} filas en students, test_answers y recommendations")
+
+
+def add_missing_columns():
+    """
+    Columnas de los modelos que aún no existen en la revisión sin índices
+    (las migraciones posteriores no las vuelven a crear si ya están)
+    """
+    from sqlalchemy import inspect, text
+    from app import db
+
+    with db.engine.begin() as connection:
+        inspector = inspect(connection)
+        tables = set(inspector.get_table_names())
+        for table in db.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=connection.dialect)
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+
+def measure(user_ids):
+    """Latencia (segundos) de cada consulta frecuente para los usuarios dados"""
+    from app import db
+    from app.models.student import Student
+    from app.utils.results_repository import get_latest_test_answer, get_top_recommendations
+
+    timings = {'student': [], 'test_answer': [], 'recommendations': []}
+    for user_id in user_ids:
+        start = time.perf_counter()
+        student = Student.query.filter_by(user_id=user_id).first()
+        timings['student'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        get_latest_test_answer(student.id)
+        timings['test_answer'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        get_top_recommendations(student.id)
+        timings['recommendations'].append(time.perf_counter() - start)
+
+        db.session.expunge_all()
+    return timings
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return statistics.median(samples) * 1000, p95 * 1000
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+
+    temp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        temp_dir = tempfile.mkdtemp(prefix='benchmark_indexes_')
+        database_url = f"sqlite:///{os.path.join(temp_dir, 'benchmark.db')}"
+
+    print("📊 Benchmark de índices")
+    print("=" * 70)
+    print(f"Base de datos: {database_url}")
+
+    app = create_benchmark_app(database_url)
+
+    from flask_migrate import downgrade, stamp, upgrade
+    from app import db
+    from app.models.student import Student
+
+    with app.app_context():
+        db.create_all()
+        if db.session.query(Student.id).first() is not None:
+            print("❌ La base de datos ya tiene estudiantes; usa una base vacía")
+            return False
+
+        # Esquema actual (con índices) → revisión anterior (sin índices)
+        stamp(directory=MIGRATIONS_DIR, revision='head')
+        downgrade(directory=MIGRATIONS_DIR, revision=REVISION_WITHOUT_INDEXES)
+        add_missing_columns()
+
+        print("\n1️⃣ Cargando datos...")
+        start = time.perf_counter()
+        seed(args.students, args.recommendations, rng)
+        print(f"   ⏱️ {time.perf_counter() - start:.1f}s")
+
+        user_ids = rng.sample(range(1, args.students + 1), min(args.queries, args.students))
+
+        print("\n2️⃣ Midiendo sin índices...")
+        before = measure(user_ids)
+
+        print("\n3️⃣ Aplicando migración (creación de índices)...")
+        start = time.perf_counter()
+        upgrade(directory=MIGRATIONS_DIR)
+        print(f"   ⏱️ {time.perf_counter() - start:.1f}s")
+
+        print("\n4️⃣ Midiendo con índices...")
+        after = measure(user_ids)
+
+    labels = {
+        'student': 'Estudiante por user_id',
+        'test_answer': 'Último test del estudiante',
+        'recommendations': 'Mejores recomendaciones'
+    }
+    print("\n" + "=" * 70)
+    print(f"{'Consulta':<28} {'Sin índices p50/p95':>20} {'Con índices p50/p95':>20}")
+    print("-" * 70)
+    for key, label in labels.items():
+        before_p50, before_p95 = summarize(before[key])
+        after_p50, after_p95 = summarize(after[key])
+        print(f"{label:<28} {before_p50:>9.2f}/{before_p95:>7.2f} ms {after_p50:>9.2f}/{after_p95:>7.2f} ms"
+              f"   x{before_p50 / after_p50:.0f}")
+
+    if temp_dir:
+        print(f"\n💡 Base de datos temporal en {temp_dir} (se puede borrar)")
+    return True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark de recomendaciones: llamadas individuales vs. API por lotes
+
+Genera estudiantes sintéticos (no se guardan en la base de datos) y mide
+cuántos estudiantes por segundo procesa CareerMatcher con
+generate_recommendations (uno por uno) y con generate_recommendations_batch
+para distintos tamaños de lote.
+
+Uso:
+    python benchmark_recommendations.py [tamaño_lote ...]
+"""
+
+import contextlib
+import io
+import sys
+import time
+import warnings
+
+import numpy as np
+
+# Silenciar advertencias de sklearn que ensucian la tabla
+warnings.filterwarnings('ignore', category=UserWarning)
+
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000]
+
+
+def make_synthetic_pairs(count, seed=42):
+    """Crea pares (Student, TestAnswer) en memoria con puntajes aleatorios"""
+    from app.models.student import Student
+    from app.models.test_answer import TestAnswer
+
+    rng = np.random.default_rng(seed)
+    academic_fields = [
+        'matematicas_score', 'fisica_score', 'quimica_score', 'biologia_score',
+        'lenguaje_score', 'ingles_score', 'ciencias_sociales_score', 'filosofia_score',
+        'valores_score', 'artes_plasticas_score', 'educacion_musical_score',
+        'educacion_fisica_score'
+    ]
+    score_fields = ['score_c', 'score_h', 'score_a', 'score_s', 'score_i', 'score_d', 'score_e']
+
+    pairs = []
+    for i in range(count):
+        student = Student(
+            id=i + 1,
+            first_name='Estudiante',
+            last_name=str(i + 1),
+            **{field: int(value) for field, value in zip(academic_fields, rng.integers(51, 101, len(academic_fields)))}
+        )
+        test_answer = TestAnswer(
+            student_id=student.id,
+            **{field: int(value) for field, value in zip(score_fields, rng.integers(0, 15, len(score_fields)))}
+        )
+        pairs.append((student, test_answer))
+
+    return pairs
+
+
+def time_call(function):
+    """Ejecuta la función sin imprimir su salida y devuelve (resultado, segundos)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def main():
+    batch_sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_BATCH_SIZES
+
+    from app import create_app
+    from app.utils.career_matcher import CareerMatcher
+    from app.utils.career_catalog import career_catalog
+
+    app = create_app()
+
+    with app.app_context():
+        catalog = career_catalog.get()
+        if len(catalog) == 0:
+            print("❌ No hay carreras en la base de datos")
+            print("💡 Ejecuta primero: python init_db.py")
+            return False
+
+        matcher = CareerMatcher()
+        print("⏱️ Benchmark de recomendaciones")
+        print("=" * 60)
+        print(f"📚 Carreras: {len(catalog)} | 🤖 ML: {'sí' if matcher.models_loaded else 'no (reglas)'}")
+
+        # Calentamiento (carga de catálogo, modelos, imports)
+        warmup = make_synthetic_pairs(2)
+        time_call(lambda: matcher.generate_recommendations_batch(warmup, top_n=5))
+        time_call(lambda: matcher.generate_recommendations(*warmup[0], top_n=5))
+
+        print(f"\n{'Lote':>8} | {'Individual (est/s)':>18} | {'Lotes (est/s)':>14} | {'Aceleración':>11}")
+        print("-" * 60)
+
+        for batch_size in batch_sizes:
+            pairs = make_synthetic_pairs(batch_size)
+
+            _, sequential_time = time_call(
+                lambda: [matcher.generate_recommendations(student, test_answer, top_n=5)
+                         for student, test_answer in pairs]
+            )
+            _, batch_time = time_call(
+                lambda: matcher.generate_recommendations_batch(pairs, top_n=5)
+            )
+
+            sequential_rate = batch_size / sequential_time if sequential_time > 0 else float('inf')
+            batch_rate = batch_size / batch_time if batch_time > 0 else float('inf')
+            speedup = sequential_time / batch_time if batch_time > 0 else float('inf')
+
+            print(f"{batch_size:>8} | {sequential_rate:>18.1f} | {batch_rate:>14.1f} | {speedup:>10.1f}x")
+
+        return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -113,7 +113,15 @@ def init_database():
             # Crear todas las tablas
             db.create_all()
             print("✓ Tablas creadas exitosamente")
-            
+
+            # Marcar el esquema como actualizado para Flask-Migrate
+            try:
+                from flask_migrate import stamp
+                stamp()
+                print("✓ Migraciones marcadas como aplicadas")
+            except Exception as e:
+                print(f"⚠ No se pudo marcar la versión de migraciones: {e}")
+
             # Verificar que las tablas se crearon
             if is_sqlalchemy_2x:
                 # SQLAlchemy 2.x
@@ -0,0 +1,36 @@
+"""Respuestas del test en formato de bits (test_answers.answers_bits)
+
+Revision ID: a1c3e5f70001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _has_column(table, column):
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return None
+    return column in {col['name'] for col in inspector.get_columns(table)}
+
+
+def upgrade():
+    # Bases creadas con init_db.py (db.create_all) ya tienen la columna
+    if _has_column('test_answers', 'answers_bits') is False:
+        with op.batch_alter_table('test_answers', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('answers_bits', sa.LargeBinary(length=13), nullable=True))
+
+
+def downgrade():
+    if _has_column('test_answers', 'answers_bits'):
+        with op.batch_alter_table('test_answers', schema=None) as batch_op:
+            batch_op.drop_column('answers_bits')
@@ -0,0 +1,47 @@
+"""Avance del test en curso (tabla test_progress)
+
+Revision ID: a1c3e5f70002
+Revises: a1c3e5f70001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70002'
+down_revision = 'a1c3e5f70001'
+branch_labels = None
+depends_on = None
+
+
+def _has_table(table):
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade():
+    if _has_table('test_progress'):
+        return
+
+    op.create_table(
+        'test_progress',
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('answered_bits', sa.LargeBinary(length=13), nullable=False),
+        sa.Column('yes_bits', sa.LargeBinary(length=13), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id']),
+        sa.PrimaryKeyConstraint('student_id')
+    )
+    with op.batch_alter_table('test_progress', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_test_progress_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    if not _has_table('test_progress'):
+        return
+
+    with op.batch_alter_table('test_progress', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_test_progress_updated_at'))
+
+    op.drop_table('test_progress')
@@ -0,0 +1,59 @@
+"""Índices para las consultas frecuentes (estudiante por usuario, último test, mejores recomendaciones)
+
+Revision ID: a1c3e5f70003
+Revises: a1c3e5f70002
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70003'
+down_revision = 'a1c3e5f70002'
+branch_labels = None
+depends_on = None
+
+
+# (nombre, tabla, columnas, único)
+INDEXES = (
+    ('ix_students_user_id', 'students', ['user_id'], True),
+    ('ix_test_answers_student_id_test_date', 'test_answers', ['student_id', sa.text('test_date DESC')], False),
+    ('ix_recommendations_student_id_score', 'recommendations', ['student_id', sa.text('score DESC')], False),
+)
+
+
+def _has_index(table, name):
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return None
+    return name in {index['name'] for index in inspector.get_indexes(table)}
+
+
+def _check_unique_students():
+    duplicated = op.get_bind().execute(sa.text(
+        'SELECT user_id, COUNT(*) FROM students GROUP BY user_id HAVING COUNT(*) > 1'
+    )).fetchall()
+    if duplicated:
+        user_ids = ', '.join(str(row[0]) for row in duplicated[:10])
+        raise RuntimeError(
+            f"Hay usuarios con más de un perfil de estudiante ({len(duplicated)}; user_id: {user_ids}). "
+            "Elimina los duplicados antes de crear el índice único ix_students_user_id."
+        )
+
+
+def upgrade():
+    for name, table, columns, unique in INDEXES:
+        # Bases creadas con init_db.py (db.create_all) ya tienen los índices
+        if _has_index(table, name) is not False:
+            continue
+        if unique and table == 'students':
+            _check_unique_students()
+        op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for name, table, columns, unique in reversed(INDEXES):
+        if _has_index(table, name):
+            op.drop_index(name, table_name=table)
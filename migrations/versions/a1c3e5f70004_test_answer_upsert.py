@@ -0,0 +1,71 @@
+"""Un test vigente por estudiante (índice único para el upsert) y clave de idempotencia
+
+Revision ID: a1c3e5f70004
+Revises: a1c3e5f70003
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70004'
+down_revision = 'a1c3e5f70003'
+branch_labels = None
+depends_on = None
+
+
+def _has_column(table, column):
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return None
+    return column in {col['name'] for col in inspector.get_columns(table)}
+
+
+def _has_index(table, name):
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return None
+    return name in {index['name'] for index in inspector.get_indexes(table)}
+
+
+def _delete_superseded_tests():
+    # Envíos dobles pudieron dejar más de un test por estudiante; la aplicación
+    # solo muestra el más reciente (mismo orden que results_repository)
+    result = op.get_bind().execute(sa.text(
+        'DELETE FROM test_answers WHERE id <> ('
+        ' SELECT latest.id FROM test_answers latest'
+        ' WHERE latest.student_id = test_answers.student_id'
+        ' ORDER BY latest.test_date DESC, latest.id DESC LIMIT 1)'
+    ))
+    if result.rowcount:
+        print(f"🧹 {result.rowcount} tests anteriores eliminados (se conserva el más reciente por estudiante)")
+
+
+def upgrade():
+    # Bases creadas con init_db.py (db.create_all) ya tienen columna e índice
+    if _has_column('test_answers', 'idempotency_key') is False:
+        with op.batch_alter_table('test_answers', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+
+    if _has_index('test_answers', 'ix_test_answers_student_id') is False:
+        _delete_superseded_tests()
+        op.create_index('ix_test_answers_student_id', 'test_answers', ['student_id'], unique=True)
+
+    # Con un test por estudiante, el índice (student_id, test_date) ya no aporta
+    if _has_index('test_answers', 'ix_test_answers_student_id_test_date'):
+        op.drop_index('ix_test_answers_student_id_test_date', table_name='test_answers')
+
+
+def downgrade():
+    if _has_index('test_answers', 'ix_test_answers_student_id_test_date') is False:
+        op.create_index('ix_test_answers_student_id_test_date', 'test_answers',
+                        ['student_id', sa.text('test_date DESC')], unique=False)
+
+    if _has_index('test_answers', 'ix_test_answers_student_id'):
+        op.drop_index('ix_test_answers_student_id', table_name='test_answers')
+
+    if _has_column('test_answers', 'idempotency_key'):
+        with op.batch_alter_table('test_answers', schema=None) as batch_op:
+            batch_op.drop_column('idempotency_key')
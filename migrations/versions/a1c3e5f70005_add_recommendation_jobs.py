@@ -0,0 +1,56 @@
+"""Cola de trabajos de recomendaciones (tabla recommendation_jobs)
+
+Revision ID: a1c3e5f70005
+Revises: a1c3e5f70004
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70005'
+down_revision = 'a1c3e5f70004'
+branch_labels = None
+depends_on = None
+
+
+def _has_table(table):
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade():
+    if _has_table('recommendation_jobs'):
+        return
+
+    op.create_table(
+        'recommendation_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('test_answer_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('worker_id', sa.String(length=64), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id']),
+        sa.ForeignKeyConstraint(['test_answer_id'], ['test_answers.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('recommendation_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_recommendation_jobs_status_id', ['status', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_recommendation_jobs_student_id'), ['student_id'], unique=False)
+
+
+def downgrade():
+    if not _has_table('recommendation_jobs'):
+        return
+
+    with op.batch_alter_table('recommendation_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_recommendation_jobs_student_id'))
+        batch_op.drop_index('ix_recommendation_jobs_status_id')
+
+    op.drop_table('recommendation_jobs')
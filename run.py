@@ -1,4 +1,5 @@
-from app import create_app, db
+from app import create_app as create_base_app, db
+from config import Config
 from app.models.user import User
 from app.models.student import Student
 from app.models.faculty import Faculty
@@ -6,9 +7,6 @@ from app.models.career import Career, Aptitude
 from app.models.test_answer import TestAnswer
 from app.models.recommendation import Recommendation
 
-app = create_app()
-
-@app.shell_context_processor
 def make_shell_context():
     return {
         'db': db, 
@@ -21,5 +19,18 @@ def make_shell_context():
         'Aptitude': Aptitude
     }
 
+def create_app(config_class=Config):
+    """
+    Aplicación con el contexto de `flask shell` (FLASK_APP=run.py la encuentra)
+
+    La aplicación no se crea al importar este archivo: los procesos spawn
+    (gráficos en segundo plano, `flask worker`, `flask rescore`) importan el
+    módulo principal como __mp_main__ y volverían a ejecutar create_app.
+    """
+    app = create_base_app(config_class)
+    app.shell_context_processor(make_shell_context)
+    return app
+
 if __name__ == '__main__':
+    app = create_app()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -1,12 +1,24 @@
 #!/usr/bin/env python3
 """
 Script CORREGIDO para entrenar modelos ML - Sistema de Recomendación
+
+Uso:
+    python train_models_improved.py [--samples N] [--seed N] [--workers N] [--jobs N]
+
+Los datos sintéticos se generan en forma vectorizada (un millón de perfiles
+en segundos); con --workers > 1 la generación se reparte entre procesos.
+Los modelos se entrenan en paralelo con --jobs núcleos (por defecto,
+ML_TRAINING_JOBS); ver app/ml_models/training.py.
 """
 
+import argparse
+import multiprocessing
 import os
 import sys
 import numpy as np
 import pandas as pd
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import warnings
 import json
@@ -15,11 +27,16 @@ import json
 warnings.filterwarnings('ignore', category=FutureWarning)
 warnings.filterwarnings('ignore', category=UserWarning)
 
-# CONFIGURAR JOBLIB PARA WINDOWS
-os.environ['LOKY_MAX_CPU_COUNT'] = '2'  # Limitar cores para evitar errores
-os.environ['OMP_NUM_THREADS'] = '1'
+def parse_args():
+    parser = argparse.ArgumentParser(description='Entrena los modelos ML con datos sintéticos')
+    parser.add_argument('--samples', type=int, default=5000, help='Perfiles sintéticos a generar')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla (por defecto, aleatoria)')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos para generar los datos')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Núcleos para entrenar los modelos (por defecto, ML_TRAINING_JOBS; -1 = todos)')
+    return parser.parse_args()
 
-def main():
+def main(args):
     print("🤖 Entrenamiento de Modelos ML - Sistema de Recomendación")
     print("=" * 60)
     
@@ -53,7 +70,7 @@ def main():
             
             # Entrenar con datos sintéticos (más confiable)
             print("\n🔄 Generando datos sintéticos para entrenamiento...")
-            success = train_with_synthetic_data(app)
+            success = train_with_synthetic_data(app, args.samples, args.seed, args.workers, args.jobs)
             
             if success:
                 print("✅ ¡Modelos entrenados con datos sintéticos!")
@@ -75,8 +92,17 @@ def main():
         traceback.print_exc()
         return False
 
-def train_with_synthetic_data(app):
-    """Entrenar con datos sintéticos - MEJORADO Y CORREGIDO"""
+def train_with_synthetic_data(app, num_samples=5000, seed=None, workers=1, n_jobs=None):
+    """
+    Entrenar con datos sintéticos - MEJORADO Y CORREGIDO
+
+    Args:
+        app: Aplicación Flask
+        num_samples: Perfiles sintéticos a generar
+        seed: Semilla de la generación (None = aleatoria)
+        workers: Procesos para generar los datos
+        n_jobs: Núcleos para entrenar los modelos (None = ML_TRAINING_JOBS)
+    """
     try:
         print("🔄 Importando módulos ML...")
         
@@ -88,49 +114,50 @@ def train_with_synthetic_data(app):
             print(f"❌ Error importando módulos ML: {e}")
             return False
         
-        from app.models.career import Career
+        from app.utils.career_catalog import career_catalog
         
         with app.app_context():
-            # Obtener carreras disponibles
-            careers = Career.query.all()
+            # Obtener carreras disponibles (catálogo en caché)
+            catalog = career_catalog.get()
             
-            if len(careers) == 0:
+            if len(catalog) == 0:
                 print("❌ No hay carreras disponibles")
                 return False
             
-            print(f"🔄 Generando datos sintéticos para {len(careers)} carreras...")
+            print(f"🔄 Generando datos sintéticos para {len(catalog)} carreras...")
             
             # Generar datos sintéticos MEJORADOS
-            synthetic_data = generate_improved_synthetic_students(careers, num_samples=50)  # Reducir muestras
+            synthetic_data = generate_improved_synthetic_students(
+                catalog, num_samples=num_samples, seed=seed, workers=workers
+            )
             
-            if len(synthetic_data) < 10:
+            if len(synthetic_data.career_ids) < 10:
                 print("❌ No se pudieron generar suficientes datos sintéticos")
                 return False
             
             # Preparar para entrenamiento
-            X = np.array([data['features'] for data in synthetic_data])
-            y = np.array([data['career_id'] for data in synthetic_data])
+            X = synthetic_data.features
+            y = synthetic_data.career_ids
             
             print(f"📊 Datos de entrenamiento: {X.shape[0]} muestras, {X.shape[1]} características")
             
             # Preparar student_profiles sintéticos para KNN
-            student_profiles = pd.DataFrame([
-                {
-                    'student_id': 1000 + i,
-                    'career_id': data['career_id'],
-                    'student_type': data['student_type']
-                } for i, data in enumerate(synthetic_data)
-            ])
+            student_profiles = pd.DataFrame({
+                'student_id': 1000 + np.arange(len(y)),
+                'career_id': y,
+                'student_type': synthetic_data.student_types
+            })
             
             # Entrenar modelos individuales (más seguro)
             print("🧠 Entrenando modelos individuales...")
             
             try:
-                success = train_individual_models_safe(X, y, student_profiles)
+                # Misma carpeta de la que ModelRegistry carga los modelos
+                models_dir = app.config.get('ML_MODELS_DIR') or os.path.join('app', 'ml_models', 'saved_models')
+                results = train_individual_models_safe(X, y, student_profiles, models_dir, n_jobs)
                 
-                if success:
+                if results:
                     # Guardar indicador de modelos entrenados
-                    models_dir = os.path.join('app', 'ml_models', 'saved_models')
                     os.makedirs(models_dir, exist_ok=True)
                     
                     # Crear archivo de estado
@@ -138,8 +165,16 @@ def train_with_synthetic_data(app):
                         json.dump({
                             'trained': True,
                             'date': datetime.now().isoformat(),
-                            'samples': len(synthetic_data),
-                            'features': X.shape[1]
+                            'samples': len(y),
+                            'features': X.shape[1],
+                            'models': {
+                                name: {
+                                    'accuracy': result.accuracy,
+                                    'wall_time_s': round(result.wall_time, 3),
+                                    'peak_rss_mb': round(result.peak_rss_mb, 1) if result.peak_rss_mb is not None else None,
+                                    'error': result.error
+                                } for name, result in results.items()
+                            }
                         }, f)
                     
                     print(f"💾 Estado de entrenamiento guardado en: {models_dir}")
@@ -160,264 +195,169 @@ def train_with_synthetic_data(app):
         traceback.print_exc()
         return False
 
-def train_individual_models_safe(X, y, student_profiles):
-    """Entrenamiento seguro de modelos individuales"""
+def train_individual_models_safe(X, y, student_profiles, models_dir, n_jobs=None):
+    """
+    Entrenamiento seguro de modelos individuales (en paralelo, un proceso por modelo)
+
+    Returns:
+        dict: nombre -> TrainingResult, o None si no se pudo entrenar
+    """
     try:
-        from app.ml_models.logistic_regression import CareerLogisticRegression
-        from app.ml_models.decision_tree import CareerDecisionTree
-        from app.ml_models.knn import CareerKNN
-        
-        models_dir = os.path.join('app', 'ml_models', 'saved_models')
-        os.makedirs(models_dir, exist_ok=True)
+        from app.ml_models.training import train_models
         
-        # 1. Entrenar Regresión Logística
-        print("   📈 Entrenando Regresión Logística...")
-        try:
-            logistic_model = CareerLogisticRegression()
-            acc_logistic = logistic_model.train(X, y)
-            logistic_model.save_model(os.path.join(models_dir, 'logistic_model.pkl'))
-            print(f"   ✅ Regresión Logística: {acc_logistic:.2%}")
-        except Exception as e:
-            print(f"   ⚠️ Error en Regresión Logística: {e}")
+        results = train_models(X, y, student_profiles, models_dir, n_jobs=n_jobs)
         
-        # 2. Entrenar Árbol de Decisión
-        print("   🌳 Entrenando Árbol de Decisión...")
-        try:
-            tree_model = CareerDecisionTree()
-            acc_tree = tree_model.train(X, y)
-            tree_model.save_model(os.path.join(models_dir, 'tree_model.pkl'))
-            print(f"   ✅ Árbol de Decisión: {acc_tree:.2%}")
-        except Exception as e:
-            print(f"   ⚠️ Error en Árbol de Decisión: {e}")
-        
-        # 3. Entrenar KNN (más simple)
-        print("   🔍 Entrenando KNN...")
-        try:
-            knn_model = CareerKNN(n_neighbors=3)  # Reducir vecinos
-            acc_knn = knn_model.train(X, y, student_profiles)
-            knn_model.save_model(os.path.join(models_dir, 'knn_model.pkl'))
-            print(f"   ✅ KNN: {acc_knn:.2%}")
-        except Exception as e:
-            print(f"   ⚠️ Error en KNN: {e}")
-        
-        print("✅ Modelos individuales entrenados")
-        return True
+        trained = [name for name, result in results.items() if result.error is None]
+        print(f"✅ Modelos individuales entrenados: {len(trained)}/{len(results)}")
+        return results if trained else None
         
     except Exception as e:
         print(f"Error en entrenamiento individual: {e}")
-        return False
+        return None
 
-def generate_improved_synthetic_students(careers, num_samples=50):
-    """Genera estudiantes sintéticos MEJORADOS"""
-    synthetic_data = []
-    
-    # Tipos de estudiantes más variados
-    student_types = [
-        'matematico_fuerte', 'humanistico_puro', 'artistico_creativo', 
-        'cientifico_investigador', 'equilibrado_versatil', 'tecnologico_innovador'
-    ]
-    
-    print(f"🎲 Generando {num_samples} perfiles de estudiantes variados...")
-    
-    for i in range(num_samples):
-        try:
-            # Elegir tipo de estudiante
-            student_type = np.random.choice(student_types)
-            
-            # Generar perfil específico por tipo
-            academic_scores, chaside_scores = generate_student_profile(student_type)
-            
-            # Normalizar scores académicos (0-1)
-            norm_academic = {k: v/100.0 for k, v in academic_scores.items()}
-            norm_chaside = {k: v/14.0 for k, v in chaside_scores.items()}
-            
-            # Calcular características adicionales
-            dominant_area = max(chaside_scores, key=chaside_scores.get)
-            area_mapping = {'c': 0, 'h': 1, 'a': 2, 's': 3, 'i': 4, 'd': 5, 'e': 6}
-            dominant_numeric = area_mapping.get(dominant_area, 0)
-            
-            academic_avg = np.mean(list(academic_scores.values()))
-            academic_level = 2 if academic_avg >= 80 else 1 if academic_avg >= 65 else 0
-            
-            chaside_variance = np.var(list(chaside_scores.values()))
-            max_variance = np.var([14, 0, 0, 0, 0, 0, 0])
-            consistency = 1 - (chaside_variance / max_variance) if max_variance > 0 else 1
-            
-            # Crear vector de características
-            features = [
-                norm_academic['matematicas_exactas'],
-                norm_academic['ciencias_naturales'],
-                norm_academic['comunicacion_lenguaje'],
-                norm_academic['ciencias_sociales'],
-                norm_academic['artes_expresion'],
-                norm_academic['educacion_fisica'],
-                norm_chaside['c'], norm_chaside['h'], norm_chaside['a'],
-                norm_chaside['s'], norm_chaside['i'], norm_chaside['d'], norm_chaside['e'],
-                dominant_numeric,
-                academic_level,
-                consistency
-            ]
-            
-            # Encontrar mejor carrera para este perfil
-            best_career = find_best_career_for_profile_improved(chaside_scores, careers, academic_scores)
-            
-            if best_career:
-                synthetic_data.append({
-                    'features': features,
-                    'career_id': best_career.id,
-                    'student_type': student_type
-                })
-                
-        except Exception as e:
-            print(f"⚠️ Error generando muestra {i}: {e}")
-            continue
-    
-    print(f"✅ Generadas {len(synthetic_data)} muestras sintéticas válidas")
-    return synthetic_data
+# Tipos de estudiantes sintéticos (el índice es el código usado en los arreglos)
+STUDENT_TYPES = (
+    'matematico_fuerte', 'humanistico_puro', 'artistico_creativo',
+    'cientifico_investigador', 'equilibrado_versatil', 'tecnologico_innovador'
+)
+BALANCED_TYPE = STUDENT_TYPES.index('equilibrado_versatil')
 
-def generate_student_profile(student_type):
-    """Genera perfil académico y CHASIDE según tipo de estudiante"""
-    
-    if student_type == 'matematico_fuerte':
-        academic_scores = {
-            'matematicas_exactas': np.random.uniform(80, 95),
-            'ciencias_naturales': np.random.uniform(70, 90),
-            'comunicacion_lenguaje': np.random.uniform(55, 75),
-            'ciencias_sociales': np.random.uniform(60, 80),
-            'artes_expresion': np.random.uniform(50, 70),
-            'educacion_fisica': np.random.uniform(55, 75)
-        }
-        chaside_scores = {
-            'c': np.random.randint(5, 9), 'h': np.random.randint(2, 5),
-            'a': np.random.randint(1, 4), 's': np.random.randint(4, 7),
-            'i': np.random.randint(9, 14), 'd': np.random.randint(2, 5),
-            'e': np.random.randint(8, 12)
-        }
-    
-    elif student_type == 'humanistico_puro':
-        academic_scores = {
-            'matematicas_exactas': np.random.uniform(55, 75),
-            'ciencias_naturales': np.random.uniform(55, 75),
-            'comunicacion_lenguaje': np.random.uniform(80, 95),
-            'ciencias_sociales': np.random.uniform(85, 95),
-            'artes_expresion': np.random.uniform(65, 85),
-            'educacion_fisica': np.random.uniform(55, 75)
-        }
-        chaside_scores = {
-            'c': np.random.randint(6, 10), 'h': np.random.randint(10, 14),
-            'a': np.random.randint(5, 9), 's': np.random.randint(3, 6),
-            'i': np.random.randint(1, 4), 'd': np.random.randint(4, 7),
-            'e': np.random.randint(2, 5)
-        }
-    
-    elif student_type == 'artistico_creativo':
-        academic_scores = {
-            'matematicas_exactas': np.random.uniform(50, 70),
-            'ciencias_naturales': np.random.uniform(55, 75),
-            'comunicacion_lenguaje': np.random.uniform(70, 90),
-            'ciencias_sociales': np.random.uniform(65, 80),
-            'artes_expresion': np.random.uniform(85, 95),
-            'educacion_fisica': np.random.uniform(60, 80)
-        }
-        chaside_scores = {
-            'c': np.random.randint(3, 6), 'h': np.random.randint(6, 10),
-            'a': np.random.randint(10, 14), 's': np.random.randint(2, 5),
-            'i': np.random.randint(3, 7), 'd': np.random.randint(1, 4),
-            'e': np.random.randint(2, 5)
-        }
-    
-    elif student_type == 'cientifico_investigador':
-        academic_scores = {
-            'matematicas_exactas': np.random.uniform(75, 90),
-            'ciencias_naturales': np.random.uniform(85, 95),
-            'comunicacion_lenguaje': np.random.uniform(60, 80),
-            'ciencias_sociales': np.random.uniform(55, 75),
-            'artes_expresion': np.random.uniform(50, 70),
-            'educacion_fisica': np.random.uniform(55, 75)
-        }
-        chaside_scores = {
-            'c': np.random.randint(4, 7), 'h': np.random.randint(3, 6),
-            'a': np.random.randint(1, 4), 's': np.random.randint(7, 11),
-            'i': np.random.randint(6, 9), 'd': np.random.randint(2, 5),
-            'e': np.random.randint(10, 14)
-        }
-    
-    elif student_type == 'tecnologico_innovador':
-        academic_scores = {
-            'matematicas_exactas': np.random.uniform(78, 92),
-            'ciencias_naturales': np.random.uniform(70, 85),
-            'comunicacion_lenguaje': np.random.uniform(60, 75),
-            'ciencias_sociales': np.random.uniform(55, 70),
-            'artes_expresion': np.random.uniform(55, 75),
-            'educacion_fisica': np.random.uniform(55, 75)
-        }
-        chaside_scores = {
-            'c': np.random.randint(6, 9), 'h': np.random.randint(2, 5),
-            'a': np.random.randint(3, 6), 's': np.random.randint(3, 6),
-            'i': np.random.randint(10, 14), 'd': np.random.randint(2, 5),
-            'e': np.random.randint(7, 10)
-        }
-    
-    else:  # equilibrado_versatil
-        base_score = np.random.uniform(65, 80)
-        variation = 10
-        academic_scores = {
-            'matematicas_exactas': max(51, min(100, base_score + np.random.uniform(-variation, variation))),
-            'ciencias_naturales': max(51, min(100, base_score + np.random.uniform(-variation, variation))),
-            'comunicacion_lenguaje': max(51, min(100, base_score + np.random.uniform(-variation, variation))),
-            'ciencias_sociales': max(51, min(100, base_score + np.random.uniform(-variation, variation))),
-            'artes_expresion': max(51, min(100, base_score + np.random.uniform(-variation, variation))),
-            'educacion_fisica': max(51, min(100, base_score + np.random.uniform(-variation, variation)))
-        }
-        chaside_scores = {
-            'c': np.random.randint(5, 9), 'h': np.random.randint(5, 9),
-            'a': np.random.randint(5, 9), 's': np.random.randint(5, 9),
-            'i': np.random.randint(5, 9), 'd': np.random.randint(5, 9),
-            'e': np.random.randint(5, 9)
-        }
-    
-    return academic_scores, chaside_scores
+# Rangos de notas por tipo (uniforme [bajo, alto)) en el orden: matemáticas
+# exactas, ciencias naturales, comunicación y lenguaje, ciencias sociales,
+# artes y expresión, educación física. El tipo equilibrado usa una nota base
+# en [65, 80) y una variación de ±10 por área (ver _generate_shard).
+ACADEMIC_RANGES = np.array([
+    [(80, 95), (70, 90), (55, 75), (60, 80), (50, 70), (55, 75)],
+    [(55, 75), (55, 75), (80, 95), (85, 95), (65, 85), (55, 75)],
+    [(50, 70), (55, 75), (70, 90), (65, 80), (85, 95), (60, 80)],
+    [(75, 90), (85, 95), (60, 80), (55, 75), (50, 70), (55, 75)],
+    [(65, 80)] * 6,
+    [(78, 92), (70, 85), (60, 75), (55, 70), (55, 75), (55, 75)],
+], dtype=np.float64)
 
-def find_best_career_for_profile_improved(chaside_scores, careers, academic_scores):
-    """Encuentra la mejor carrera considerando CHASIDE y rendimiento académico"""
-    best_career = None
-    best_score = 0
-    
-    for career in careers:
-        try:
-            # Score CHASIDE
-            chaside_score = (
-                chaside_scores['c'] * (career.area_c or 0) +
-                chaside_scores['h'] * (career.area_h or 0) +
-                chaside_scores['a'] * (career.area_a or 0) +
-                chaside_scores['s'] * (career.area_s or 0) +
-                chaside_scores['i'] * (career.area_i or 0) +
-                chaside_scores['d'] * (career.area_d or 0) +
-                chaside_scores['e'] * (career.area_e or 0)
-            )
-            
-            # Bonus académico
-            academic_avg = np.mean(list(academic_scores.values()))
-            academic_bonus = 0
-            
-            if academic_avg >= 80:
-                academic_bonus = chaside_score * 0.2  # 20% bonus
-            elif academic_avg >= 70:
-                academic_bonus = chaside_score * 0.1  # 10% bonus
-            
-            final_score = chaside_score + academic_bonus
-            
-            if final_score > best_score:
-                best_score = final_score
-                best_career = career
-        except Exception as e:
-            # Si hay error con una carrera, continuar con la siguiente
-            continue
-    
-    return best_career
+# Rangos de puntajes CHASIDE por tipo (enteros [bajo, alto)) en el orden C, H, A, S, I, D, E
+CHASIDE_RANGES = np.array([
+    [(5, 9), (2, 5), (1, 4), (4, 7), (9, 14), (2, 5), (8, 12)],
+    [(6, 10), (10, 14), (5, 9), (3, 6), (1, 4), (4, 7), (2, 5)],
+    [(3, 6), (6, 10), (10, 14), (2, 5), (3, 7), (1, 4), (2, 5)],
+    [(4, 7), (3, 6), (1, 4), (7, 11), (6, 9), (2, 5), (10, 14)],
+    [(5, 9)] * 7,
+    [(6, 9), (2, 5), (3, 6), (3, 6), (10, 14), (2, 5), (7, 10)],
+], dtype=np.int64)
+
+# Varianza de un perfil CHASIDE concentrado en un área (consistencia = 0)
+MAX_CHASIDE_VARIANCE = np.var([14, 0, 0, 0, 0, 0, 0])
+
+# Filas por bloque al etiquetar (limita la matriz muestras × carreras en memoria)
+LABEL_CHUNK_SIZE = 65536
+
+SyntheticData = namedtuple('SyntheticData', ['features', 'career_ids', 'student_types'])
+
+
+def generate_improved_synthetic_students(catalog, num_samples=5000, seed=None, workers=1):
+    """
+    Genera estudiantes sintéticos en forma vectorizada
+
+    Cada proceso genera su parte con un np.random.Generator propio, creado
+    con SeedSequence.spawn: las secuencias son independientes y, con la misma
+    semilla y el mismo número de procesos, los datos son idénticos.
+
+    Args:
+        catalog: Catálogo de carreras (CareerCatalogSnapshot)
+        num_samples: Número de perfiles a generar
+        seed: Semilla (None = aleatoria)
+        workers: Procesos entre los que se reparte la generación
+
+    Returns:
+        SyntheticData: features (n, 16), career_ids (n,) y student_types (n,);
+        se descartan los perfiles sin ninguna carrera con puntaje > 0
+    """
+    if len(catalog) == 0 or num_samples <= 0:
+        return SyntheticData(np.empty((0, 16)), np.empty(0, dtype=np.int64), np.empty(0, dtype=object))
+
+    workers = max(1, min(int(workers), num_samples))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    # Reparto de las muestras en partes casi iguales
+    counts = [len(part) for part in np.array_split(np.arange(num_samples), workers)]
+
+    print(f"🎲 Generando {num_samples} perfiles de estudiantes variados ({workers} proceso(s))...")
+
+    weights = np.asarray(catalog.weights)
+    career_ids = np.asarray(catalog.ids)
+    if workers == 1:
+        shards = [_generate_shard(weights, career_ids, counts[0], seeds[0])]
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            shards = list(executor.map(
+                _generate_shard, [weights] * workers, [career_ids] * workers, counts, seeds
+            ))
+
+    features = np.concatenate([shard[0] for shard in shards])
+    labels = np.concatenate([shard[1] for shard in shards])
+    types = np.concatenate([shard[2] for shard in shards])
+
+    print(f"✅ Generadas {len(labels)} muestras sintéticas válidas")
+    return SyntheticData(features, labels, np.array(STUDENT_TYPES, dtype=object)[types])
+
+
+def _generate_shard(weights, career_ids, num_samples, seed_sequence):
+    """
+    Genera una parte de los datos sintéticos (se ejecuta en un proceso aparte)
+
+    Returns:
+        tuple: (features, career_ids, códigos de tipo de estudiante)
+    """
+    rng = np.random.default_rng(seed_sequence)
+    types = rng.integers(0, len(STUDENT_TYPES), size=num_samples)
+
+    # Notas (0-100) y puntajes CHASIDE (0-14) según los rangos de cada tipo
+    academic_ranges = ACADEMIC_RANGES[types]
+    academic = rng.uniform(academic_ranges[..., 0], academic_ranges[..., 1])
+    balanced = np.flatnonzero(types == BALANCED_TYPE)
+    academic[balanced] = np.clip(
+        academic[balanced, :1] + rng.uniform(-10, 10, size=(len(balanced), academic.shape[1])),
+        51, 100
+    )
+    chaside_ranges = CHASIDE_RANGES[types]
+    chaside = rng.integers(chaside_ranges[..., 0], chaside_ranges[..., 1])
+
+    # Vector de características (mismo orden que DataProcessor)
+    features = np.empty((num_samples, 16), dtype=np.float64)
+    features[:, :6] = academic / 100.0
+    features[:, 6:13] = chaside / 14.0
+    features[:, 13] = np.argmax(chaside, axis=1)
+    academic_avg = academic.mean(axis=1)
+    features[:, 14] = np.where(academic_avg >= 80, 2, np.where(academic_avg >= 65, 1, 0))
+    features[:, 15] = 1 - chaside.var(axis=1) / MAX_CHASIDE_VARIANCE
+
+    best_rows, valid = _best_career_rows(chaside, weights)
+    return features[valid], career_ids[best_rows[valid]], types[valid]
+
+
+def _best_career_rows(chaside, weights):
+    """
+    Mejor carrera de cada perfil: producto de matrices CHASIDE × pesos y argmax
+
+    El bonus académico (×1.1 o ×1.2) multiplica todos los puntajes de un
+    perfil por el mismo factor positivo, así que no cambia la carrera elegida
+    y no se aplica.
+
+    Returns:
+        tuple: (fila del catálogo por perfil, máscara de perfiles con puntaje > 0)
+    """
+    best_rows = np.empty(len(chaside), dtype=np.int64)
+    valid = np.empty(len(chaside), dtype=bool)
+    weights_t = np.ascontiguousarray(weights.T)
+    for start in range(0, len(chaside), LABEL_CHUNK_SIZE):
+        block = slice(start, start + LABEL_CHUNK_SIZE)
+        scores = chaside[block] @ weights_t
+        best_rows[block] = np.argmax(scores, axis=1)
+        valid[block] = scores[np.arange(len(scores)), best_rows[block]] > 0
+    return best_rows, valid
 
 if __name__ == "__main__":
-    success = main()
+    success = main(parse_args())
     
     if success:
         print("\n🎉 ¡ENTRENAMIENTO COMPLETADO!")
@@ -60,6 +60,33 @@ def main():
     else:
         print("   ❌ Error en flujo completo")
     
+    # Test 6: Verificar consultas de la página de resultados
+    total_tests += 1
+    print("\n6️⃣ Verificando consultas de resultados...")
+    if test_results_queries():
+        tests_passed += 1
+        print("   ✅ Consultas de resultados OK")
+    else:
+        print("   ❌ Error en consultas de resultados")
+    
+    # Test 7: Verificar que la versión por lotes coincida con la individual
+    total_tests += 1
+    print("\n7️⃣ Verificando recomendaciones por lotes...")
+    if test_batch_matches_single():
+        tests_passed += 1
+        print("   ✅ Lotes e individual coinciden")
+    else:
+        print("   ❌ Lotes e individual no coinciden")
+    
+    # Test 8: Verificar `flask rescore --workers 0` con varios bloques
+    total_tests += 1
+    print("\n8️⃣ Verificando recálculo en el proceso actual...")
+    if test_rescore_in_process():
+        tests_passed += 1
+        print("   ✅ Recálculo por bloques OK")
+    else:
+        print("   ❌ Error en el recálculo por bloques")
+    
     # Resumen
     print("\n" + "=" * 50)
     print("📋 RESUMEN DE VALIDACIÓN")
@@ -267,6 +294,166 @@ def test_complete_flow():
         print(f"   Error en flujo completo: {e}")
         return False
 
+def test_results_queries():
+    """Verifica que los resultados se carguen en 2 consultas (sin N+1)"""
+    try:
+        from sqlalchemy import event
+        from app import create_app, db
+        from app.models.user import User
+        from app.models.student import Student
+        from app.models.career import Career
+        from app.models.test_answer import TestAnswer
+        from app.models.recommendation import Recommendation
+        from app.utils.results_repository import get_latest_results
+        
+        app = create_app()
+        with app.app_context():
+            careers = Career.query.limit(5).all()
+            if not careers:
+                print("   ⚠️ No hay carreras - ejecuta: python init_db.py")
+                return False
+            
+            # Datos temporales: se descartan con rollback al final
+            user = User(username='validacion_consultas', email='validacion_consultas@example.invalid')
+            user.set_password('validacion')
+            db.session.add(user)
+            db.session.flush()
+            student = Student(user_id=user.id, first_name='Validación', last_name='Consultas')
+            db.session.add(student)
+            db.session.flush()
+            db.session.add(TestAnswer(student_id=student.id, score_c=5, score_h=4, score_a=3,
+                                      score_s=6, score_i=7, score_d=2, score_e=5))
+            for rank, career in enumerate(careers, 1):
+                db.session.add(Recommendation(student_id=student.id, career_id=career.id,
+                                              score=1.0 - rank / 10, rank=rank))
+            db.session.flush()
+            student_id = student.id
+            db.session.expire_all()
+            
+            statements = []
+            count_statement = lambda *args: statements.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', count_statement)
+            try:
+                test_answer, recommendations = get_latest_results(student_id)
+                # Lo que usa la plantilla no debe generar más consultas
+                names = [(rec.career.name, rec.career.faculty.name) for rec in recommendations]
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', count_statement)
+                db.session.rollback()
+            
+            if test_answer is None or len(names) != len(careers):
+                print(f"   ❌ Resultados incompletos: {len(names)}/{len(careers)} recomendaciones")
+                return False
+            if len(statements) > 2:
+                print(f"   ❌ {len(statements)} consultas (máximo 2)")
+                return False
+            
+            print(f"   📊 Test + {len(names)} recomendaciones en {len(statements)} consultas")
+            return True
+            
+    except Exception as e:
+        print(f"   Error en consultas de resultados: {e}")
+        return False
+
+def test_batch_matches_single():
+    """Verifica que generate_recommendations_batch dé lo mismo que generate_recommendations"""
+    try:
+        import random
+        from app.utils.career_matcher import CareerMatcher
+        from app.utils.recommendation_cache import recommendation_cache
+        from app import create_app
+        
+        app = create_app()
+        with app.app_context():
+            # Perfiles variados (semilla fija)
+            rng = random.Random(42)
+            pairs = []
+            for i in range(20):
+                mock_student, mock_test = create_mock_data()
+                mock_student.id = mock_test.student_id = 1000 + i
+                for area in ['c', 'h', 'a', 's', 'i', 'd', 'e']:
+                    setattr(mock_test, f'score_{area}', rng.randint(0, 14))
+                pairs.append((mock_student, mock_test))
+            
+            matcher = CareerMatcher()
+            summary = lambda recs: [(rec.career_id, round(rec.score, 9), rec.rank, rec.model_used) for rec in recs]
+            
+            # Sin caché entre ambos cálculos (comparten las entradas)
+            recommendation_cache.clear()
+            batch = [summary(recs) for recs in matcher.generate_recommendations_batch(pairs, top_n=5)]
+            recommendation_cache.clear()
+            single = [summary(matcher.generate_recommendations(student, test, top_n=5)) for student, test in pairs]
+            recommendation_cache.clear()
+            
+            different = [i for i, (a, b) in enumerate(zip(single, batch)) if a != b]
+            if different:
+                i = different[0]
+                print(f"   ❌ {len(different)}/{len(pairs)} perfiles distintos; ej.: {single[i]} vs {batch[i]}")
+                return False
+            
+            print(f"   📊 {len(pairs)} perfiles con el mismo resultado")
+            return True
+            
+    except Exception as e:
+        print(f"   Error comparando lotes: {e}")
+        return False
+
+def test_rescore_in_process():
+    """
+    Recorre varios bloques como `flask rescore --workers 0`: cada bloque hace
+    commit y cierra la sesión, y el recorrido de IDs debe seguir
+    """
+    try:
+        from app import create_app, db
+        from app.commands import _iter_student_id_chunks, _rescore_chunk
+        from app.models.user import User
+        from app.models.student import Student
+        from app.models.test_answer import TestAnswer
+        from app.models.recommendation import Recommendation
+        
+        app = create_app()
+        with app.app_context():
+            # Estudiantes temporales (los bloques hacen commit; se borran al final)
+            student_ids = []
+            for i in range(5):
+                user = User(username=f'validacion_rescore_{i}', email=f'validacion_rescore_{i}@example.invalid')
+                user.set_password('validacion')
+                db.session.add(user)
+                db.session.flush()
+                student = Student(user_id=user.id, first_name='Validación', last_name=f'Recálculo {i}')
+                db.session.add(student)
+                db.session.flush()
+                db.session.add(TestAnswer(student_id=student.id, score_c=5 + i, score_h=4, score_a=3,
+                                          score_s=6, score_i=7 - i, score_d=2, score_e=5))
+                student_ids.append(student.id)
+            db.session.commit()
+            
+            try:
+                seen, processed = [], 0
+                query = db.select(Student.id).where(Student.id.in_(student_ids))
+                for chunk in _iter_student_id_chunks(query, 2):
+                    seen.extend(chunk)
+                    processed += _rescore_chunk(chunk, 3)[0]
+                
+                if seen != sorted(student_ids) or processed != len(student_ids):
+                    print(f"   ❌ {len(seen)}/{len(student_ids)} estudiantes recorridos, {processed} procesados")
+                    return False
+                
+                print(f"   📊 {processed} estudiantes en {(len(student_ids) + 1) // 2} bloques")
+                return True
+            finally:
+                db.session.rollback()
+                user_ids = db.session.scalars(db.select(Student.user_id).where(Student.id.in_(student_ids))).all()
+                for model in (Recommendation, TestAnswer):
+                    db.session.execute(db.delete(model).where(model.student_id.in_(student_ids)))
+                db.session.execute(db.delete(Student).where(Student.id.in_(student_ids)))
+                db.session.execute(db.delete(User).where(User.id.in_(user_ids)))
+                db.session.commit()
+            
+    except Exception as e:
+        print(f"   Error en el recálculo por bloques: {e}")
+        return False
+
 def create_mock_data():
     """Crea datos de prueba"""
     